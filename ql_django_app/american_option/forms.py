@@ -19,3 +19,8 @@ class AmericanOptionForm(forms.Form):
     volatility = forms.FloatField(label='Volatility (%)', initial=20)
     dividend_rate = forms.FloatField(label='Dividend Rate (%)', initial=1.63)
     risk_free_rate = forms.FloatField(label='Risk-Free Rate (%)', initial=0.1)
+
+    show_benchmark = forms.BooleanField(
+        label='Compare latency and accuracy of the tree methods',
+        required=False
+    )
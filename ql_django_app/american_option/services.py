@@ -0,0 +1,191 @@
+import QuantLib as ql
+import numpy as np
+import time
+from datetime import date
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
+
+# Fixed evaluation date (the same one used by the European option pricer)
+CALCULATION_DATE = ql.Date(8, 5, 2015)
+
+# The two trees of a Richardson pair must agree within this fraction of the spot; otherwise
+# the extrapolation, which doubles any error of the fine tree, is dropped for the fine tree
+LR_PAIR_TOLERANCE = 2.0e-4
+
+
+def _build_american_option(
+    option_type_str: str,
+    maturity_dt: date,
+    spot_price: float,
+    strike_price: float,
+    volatility_pct: float,
+    dividend_rate_pct: float,
+    risk_free_rate_pct: float
+):
+    """
+    Builds the American option instrument and its Black-Scholes-Merton process.
+    Sets the evaluation date for the calling (isolated) service.
+    """
+    set_evaluation_date(CALCULATION_DATE)
+    day_count = ql.Actual365Fixed()
+
+    option_type = ql.Option.Call if option_type_str == 'Call' else ql.Option.Put
+    maturity_date = ql.Date(maturity_dt.day, maturity_dt.month, maturity_dt.year)
+    payoff = ql.PlainVanillaPayoff(option_type, strike_price)
+    exercise = ql.AmericanExercise(CALCULATION_DATE, maturity_date)
+    american_option = ql.VanillaOption(payoff, exercise)
+
+    spot_handle = ql.QuoteHandle(ql.SimpleQuote(spot_price))
+    flat_ts = ql.YieldTermStructureHandle(ql.FlatForward(CALCULATION_DATE, risk_free_rate_pct / 100, day_count))
+    dividend_yield = ql.YieldTermStructureHandle(ql.FlatForward(CALCULATION_DATE, dividend_rate_pct / 100, day_count))
+    vol_handle = ql.BlackVolTermStructureHandle(ql.BlackConstantVol(CALCULATION_DATE, ql.NullCalendar(), volatility_pct / 100, day_count))
+    bsm_process = ql.BlackScholesMertonProcess(spot_handle, dividend_yield, flat_ts, vol_handle)
+
+    return american_option, bsm_process
+
+
+def _tree_price(option, bsm_process, tree: str, steps: int) -> float:
+    option.setPricingEngine(ql.BinomialVanillaEngine(bsm_process, tree, steps))
+    return option.NPV()
+
+
+def _exact_grid_steps(maturity_time: float, steps: int) -> int:
+    """
+    First odd step count from steps on whose time grid the last node falls exactly on the
+    maturity. QuantLib places it at (T / N) * N: when rounding leaves it just below T, the
+    American tree misses the exercise at expiry and loses an O(1/N) amount (several cents
+    at 200 steps), for about one odd N in eight.
+    """
+    steps += 1 - steps % 2
+    while (maturity_time / steps) * steps < maturity_time:
+        steps += 2
+    return steps
+
+
+def _richardson_leisen_reimer_price(option, bsm_process, steps: int, tolerance: float):
+    """
+    Leisen-Reimer tree with Richardson extrapolation on N and 2N+1 steps.
+
+    LR trees converge smoothly (no CRR odd/even oscillation), so the leading error term
+    can be cancelled with a single extra tree instead of averaging hundreds of them. Both
+    step counts are moved to the next ones with an exact time grid (_exact_grid_steps), and
+    when the two trees still differ by more than tolerance the fine tree is returned alone.
+
+    Returns:
+        tuple: The price, the steps of the coarse and fine trees, and whether the
+        extrapolation was applied.
+    """
+    maturity_time = bsm_process.riskFreeRate().timeFromReference(option.exercise().lastDate())
+    coarse_steps = _exact_grid_steps(maturity_time, steps)
+    fine_steps = _exact_grid_steps(maturity_time, 2 * coarse_steps + 1)
+    coarse = _tree_price(option, bsm_process, 'lr', coarse_steps)
+    fine = _tree_price(option, bsm_process, 'lr', fine_steps)
+    if abs(fine - coarse) > tolerance:
+        return fine, coarse_steps, fine_steps, False
+    return 2 * fine - coarse, coarse_steps, fine_steps, True
+
+
+def _averaged_crr_price(option, bsm_process) -> float:
+    """
+    The original approach of the lab: average 198 CRR trees with 2..199 steps.
+    Kept only as a baseline for benchmark_american_pricers.
+    """
+    return np.mean([_tree_price(option, bsm_process, 'crr', steps) for steps in range(2, 200)])
+
+
+@isolated_evaluation_date
+def price_american_option(
+    option_type_str: str,
+    maturity_dt: date,
+    spot_price: float,
+    strike_price: float,
+    volatility_pct: float,
+    dividend_rate_pct: float,
+    risk_free_rate_pct: float,
+    steps: int = 101
+) -> dict:
+    """
+    Prices an American option with a Richardson-extrapolated Leisen-Reimer tree.
+
+    Args:
+        option_type_str (str): 'Call' or 'Put'.
+        maturity_dt (date): The maturity date of the option.
+        spot_price (float): The current price of the underlying asset.
+        strike_price (float): The strike price of the option.
+        volatility_pct (float): The volatility in percent (e.g., 20 for 20%).
+        dividend_rate_pct (float): The dividend rate in percent (e.g., 1.63 for 1.63%).
+        risk_free_rate_pct (float): The risk-free rate in percent (e.g., 0.1 for 0.1%).
+        steps (int): Steps of the coarse tree (the next odd count with an exact time grid);
+            the fine tree uses about 2 * steps + 1.
+
+    On the default put of the lab the error against a fine finite-difference grid is about
+    1e-5; elsewhere it depends on the inputs (up to about 5e-3 on random inputs, spot 100).
+
+    Returns:
+        dict: A dictionary containing the price and the name of the method used.
+    """
+    american_option, bsm_process = _build_american_option(
+        option_type_str, maturity_dt, spot_price, strike_price,
+        volatility_pct, dividend_rate_pct, risk_free_rate_pct
+    )
+    price, coarse_steps, fine_steps, extrapolated = _richardson_leisen_reimer_price(
+        american_option, bsm_process, steps, LR_PAIR_TOLERANCE * spot_price
+    )
+    if extrapolated:
+        engine_used = f"Leisen-Reimer + Richardson ({coarse_steps}/{fine_steps} steps)"
+    else:
+        engine_used = f"Leisen-Reimer ({fine_steps} steps, the {coarse_steps}-step tree disagreed)"
+
+    return {
+        'price': np.round(price, 4),
+        'engine_used': engine_used
+    }
+
+
+@isolated_evaluation_date
+def benchmark_american_pricers(
+    option_type_str: str,
+    maturity_dt: date,
+    spot_price: float,
+    strike_price: float,
+    volatility_pct: float,
+    dividend_rate_pct: float,
+    risk_free_rate_pct: float
+) -> list:
+    """
+    Compares latency and accuracy of the American pricers against a fine finite-difference
+    reference (2000 x 2000 grid).
+
+    Returns:
+        list: One dict per method with its price, absolute error and time in milliseconds.
+    """
+    american_option, bsm_process = _build_american_option(
+        option_type_str, maturity_dt, spot_price, strike_price,
+        volatility_pct, dividend_rate_pct, risk_free_rate_pct
+    )
+    american_option.setPricingEngine(ql.FdBlackScholesVanillaEngine(bsm_process, 2000, 2000))
+    reference = american_option.NPV()
+    tolerance = LR_PAIR_TOLERANCE * spot_price
+
+    methods = [
+        ('Average of 198 CRR trees (2..199 steps)', lambda: _averaged_crr_price(american_option, bsm_process)),
+        ('CRR tree (801 steps)', lambda: _tree_price(american_option, bsm_process, 'crr', 801)),
+        ('Leisen-Reimer tree (201 steps)', lambda: _tree_price(american_option, bsm_process, 'lr', 201)),
+        ('Leisen-Reimer + Richardson (N=51, 2N+1)', lambda: _richardson_leisen_reimer_price(american_option, bsm_process, 51, tolerance)[0]),
+        ('Leisen-Reimer + Richardson (N=101, 2N+1)', lambda: _richardson_leisen_reimer_price(american_option, bsm_process, 101, tolerance)[0]),
+        ('Leisen-Reimer + Richardson (N=201, 2N+1)', lambda: _richardson_leisen_reimer_price(american_option, bsm_process, 201, tolerance)[0]),
+    ]
+
+    rows = []
+    for name, pricer in methods:
+        start = time.perf_counter()
+        price = pricer()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        rows.append({
+            'method': name,
+            'price': np.round(price, 6),
+            'abs_error': f"{abs(price - reference):.2e}",
+            'time_ms': np.round(elapsed_ms, 2),
+        })
+
+    rows.append({'method': 'Reference (FD 2000 x 2000)', 'price': np.round(reference, 6), 'abs_error': '-', 'time_ms': '-'})
+    return rows
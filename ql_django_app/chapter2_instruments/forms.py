@@ -10,7 +10,11 @@ class EngineChoiceForm(forms.Form):
     ENGINE_CHOICES = [
         ('analytic', 'Analytic Black-Scholes Formula'),
         ('binomial_crr', 'Binomial Tree (Cox-Ross-Rubinstein, 200 steps)'),
+        ('numpy_lattice', 'Vectorized NumPy Lattice (CRR, 200 steps)'),
         ('monte_carlo', 'Monte Carlo Simulation (10k paths)'),
+        ('numpy_mc', 'Vectorized NumPy Monte Carlo'),
+        ('numpy_mc_antithetic', 'Vectorized NumPy Monte Carlo (Antithetic Variates)'),
+        ('numpy_mc_control_variate', 'Vectorized NumPy Monte Carlo (BS Control Variate)'),
     ]
 
     # The key field for this demonstration: a dropdown menu (ChoiceField)
@@ -52,4 +56,20 @@ class EngineChoiceForm(forms.Form):
         label='Risk-Free Rate (%)', 
         initial=0.1,
         help_text="The risk-free interest rate. E.g., 0.1 for 0.1%."
+    )
+
+    mc_samples = forms.IntegerField(
+        label='Monte Carlo Samples',
+        initial=2000,
+        min_value=2,
+        max_value=1000000,
+        required=False,
+        help_text="Number of samples for the vectorized NumPy Monte Carlo engines."
+    )
+
+    mc_target_std_error = forms.FloatField(
+        label='Target Standard Error (optional)',
+        min_value=0.0,
+        required=False,
+        help_text="If set, the NumPy Monte Carlo engines simulate in batches until this standard error is reached (the sample count above becomes a cap)."
     )
\ No newline at end of file
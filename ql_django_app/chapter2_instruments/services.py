@@ -1,7 +1,19 @@
 import QuantLib as ql
 import numpy as np
+import time
 from datetime import date
+from compute.statistics import simulate_until_converged
+from european_option.services import calculate_european_option_metrics_batch, price_vanilla_lattice_batch
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
 
+# NumPy Monte Carlo engine choices and the variance reduction each one uses
+NUMPY_MC_ENGINES = {
+    'numpy_mc': ('none', "Vectorized NumPy Monte Carlo"),
+    'numpy_mc_antithetic': ('antithetic', "Vectorized NumPy Monte Carlo (Antithetic Variates)"),
+    'numpy_mc_control_variate': ('control_variate', "Vectorized NumPy Monte Carlo (BS Control Variate)"),
+}
+
+@isolated_evaluation_date
 def price_option_with_selected_engine(engine_choice: str, option_params: dict) -> dict:
     """
     Creates a European option and prices it using a user-selected pricing engine.
@@ -12,11 +24,14 @@ def price_option_with_selected_engine(engine_choice: str, option_params: dict) -
     It has no knowledge of Django.
 
     Args:
-        engine_choice (str): The identifier for the chosen engine ('analytic', 'binomial_crr', 'monte_carlo').
-        option_params (dict): A dictionary containing all the necessary parameters for the option.
+        engine_choice (str): The identifier for the chosen engine ('analytic', 'binomial_crr', 'numpy_lattice',
+            'monte_carlo' or one of NUMPY_MC_ENGINES).
+        option_params (dict): A dictionary containing all the necessary parameters for the option
+            (plus optional 'mc_samples' and 'mc_target_std_error' for the NumPy Monte Carlo engines).
 
     Returns:
         dict: A dictionary containing the calculated price and the name of the engine used.
+              Monte Carlo engines also report 'std_error' and 'elapsed_ms'.
     """
     
     # 1. Prepare parameters from the input dictionary
@@ -35,7 +50,7 @@ def price_option_with_selected_engine(engine_choice: str, option_params: dict) -
     day_count = ql.Actual365Fixed()
     calendar = ql.UnitedStates(ql.UnitedStates.GovernmentBond)
     calculation_date = ql.Date(8, 5, 2015)  # Using a fixed date for consistency
-    ql.Settings.instance().evaluationDate = calculation_date
+    set_evaluation_date(calculation_date)
 
     # 3. Create the financial INSTRUMENT (the contract)
     # This part remains the same regardless of the engine used.
@@ -61,6 +76,44 @@ def price_option_with_selected_engine(engine_choice: str, option_params: dict) -
         steps = 200  # Number of steps for the binomial tree
         engine = ql.BinomialVanillaEngine(bsm_process, "crr", steps)
         engine_name = "Binomial Tree (Cox-Ross-Rubinstein)"
+    elif engine_choice == 'numpy_lattice':
+        # The vectorized lattice is not a QuantLib engine: price directly and return
+        steps = 200
+        lattice_price = price_vanilla_lattice_batch(
+            'Call', spot_price, strike_price,
+            day_count.yearFraction(calculation_date, maturity_date),
+            volatility * 100, dividend_rate * 100, risk_free_rate * 100,
+            lattice='crr', steps=steps
+        )['price']
+        return {
+            'price': np.round(float(lattice_price), 4),
+            'engine_used': "Vectorized NumPy Lattice (Cox-Ross-Rubinstein)"
+        }
+    elif engine_choice in NUMPY_MC_ENGINES:
+        variance_reduction, engine_name = NUMPY_MC_ENGINES[engine_choice]
+        mc_args = (
+            'Call', spot_price, strike_price,
+            day_count.yearFraction(calculation_date, maturity_date),
+            volatility, dividend_rate, risk_free_rate,
+        )
+        num_samples = option_params.get('mc_samples') or 2000
+        target_std_error = option_params.get('mc_target_std_error')
+        if target_std_error:
+            # Adaptive mode: mc_samples becomes the cap on the number of samples
+            mc_results = price_european_option_mc_adaptive(
+                *mc_args, target_std_error=target_std_error, max_samples=num_samples,
+                variance_reduction=variance_reduction
+            )
+        else:
+            mc_results = price_european_option_mc(*mc_args, num_samples=num_samples, variance_reduction=variance_reduction)
+        return {
+            'price': np.round(mc_results['price'], 4),
+            'std_error': np.round(mc_results['std_error'], 4),
+            'elapsed_ms': np.round(mc_results['elapsed_ms'], 2),
+            'num_samples': mc_results['num_samples'],
+            'stop_reason': mc_results.get('stop_reason'),
+            'engine_used': engine_name
+        }
     elif engine_choice == 'monte_carlo':
         steps = 100
         required_samples = 10000
@@ -74,7 +127,154 @@ def price_option_with_selected_engine(engine_choice: str, option_params: dict) -
     european_option.setPricingEngine(engine)
 
     # 7. Calculate and return the results in a clean dictionary
-    return {
+    start = time.perf_counter()
+    results = {
         'price': np.round(european_option.NPV(), 4),
         'engine_used': engine_name
+    }
+    if engine_choice == 'monte_carlo':
+        results['std_error'] = np.round(european_option.errorEstimate(), 4)
+        results['elapsed_ms'] = np.round((time.perf_counter() - start) * 1000, 2)
+        results['num_samples'] = required_samples
+    return results
+
+
+def _mc_sampler(option_type_str, spot_price, strike_price, maturity_years, volatility,
+                dividend_rate, risk_free_rate, variance_reduction, rng):
+    """
+    Returns a function drawing n independent Monte Carlo samples of the discounted payoff
+    under geometric Brownian motion (terminal spot drawn from its exact lognormal law).
+
+    With 'antithetic', every sample is the average of a +Z/-Z pair. With 'control_variate',
+    the control is an at-the-money-forward option of the same type whose Black-Scholes price
+    is known in closed form; its regression coefficient is estimated on the first batch and
+    then kept fixed, so later batches remain independent.
+    """
+    if variance_reduction not in ('none', 'antithetic', 'control_variate'):
+        raise ValueError(f"Unknown variance reduction: {variance_reduction}")
+
+    w = 1.0 if option_type_str == 'Call' else -1.0
+    discount = np.exp(-risk_free_rate * maturity_years)
+    forward = spot_price * np.exp((risk_free_rate - dividend_rate) * maturity_years)
+    std_dev = volatility * np.sqrt(maturity_years)
+
+    def discounted_payoffs(z, strike):
+        terminal = forward * np.exp(-0.5 * std_dev**2 + std_dev * z)
+        return discount * np.maximum(w * (terminal - strike), 0.0)
+
+    control_mean = calculate_european_option_metrics_batch(
+        option_type_str, spot_price, forward, maturity_years,
+        volatility * 100, dividend_rate * 100, risk_free_rate * 100
+    )['price']
+    beta = None
+
+    def draw(n):
+        nonlocal beta
+        if variance_reduction == 'antithetic':
+            z = rng.standard_normal(n)
+            return 0.5 * (discounted_payoffs(z, strike_price) + discounted_payoffs(-z, strike_price))
+
+        z = rng.standard_normal(n)
+        payoffs = discounted_payoffs(z, strike_price)
+        if variance_reduction == 'none':
+            return payoffs
+
+        control = discounted_payoffs(z, forward)
+        if beta is None:
+            covariance = np.cov(payoffs, control)
+            beta = covariance[0, 1] / covariance[1, 1] if covariance[1, 1] > 0 else 0.0
+        return payoffs - beta * (control - control_mean)
+
+    return draw
+
+
+def price_european_option_mc(
+    option_type_str: str,
+    spot_price: float,
+    strike_price: float,
+    maturity_years: float,
+    volatility: float,
+    dividend_rate: float,
+    risk_free_rate: float,
+    num_samples: int = 2000,
+    variance_reduction: str = 'none',
+    seed: int = 42
+) -> dict:
+    """
+    Prices a European option by Monte Carlo under geometric Brownian motion, simulating all
+    samples as a single NumPy array. The terminal spot is drawn from its exact lognormal
+    distribution, so no time stepping is needed for a European payoff.
+
+    Args:
+        option_type_str (str): 'Call' or 'Put'.
+        spot_price, strike_price (float): Spot and strike prices.
+        maturity_years (float): Time to maturity in years.
+        volatility, dividend_rate, risk_free_rate (float): Market data as decimals.
+        num_samples (int): Number of simulated terminal spots.
+        variance_reduction (str): 'none', 'antithetic' (paired +Z/-Z draws) or
+            'control_variate' (an at-the-money-forward option of the same type, whose
+            Black-Scholes closed-form price is known).
+        seed (int): Seed of the NumPy random generator.
+
+    Returns:
+        dict: 'price', 'std_error', 'elapsed_ms' and 'num_samples'.
+    """
+    start = time.perf_counter()
+    draw = _mc_sampler(
+        option_type_str, spot_price, strike_price, maturity_years, volatility,
+        dividend_rate, risk_free_rate, variance_reduction, np.random.default_rng(seed)
+    )
+    # Antithetic samples are pairs, so half as many draws give the same number of paths
+    samples = draw(max(num_samples // 2, 2) if variance_reduction == 'antithetic' else num_samples)
+
+    return {
+        'price': float(np.mean(samples)),
+        'std_error': float(np.std(samples, ddof=1) / np.sqrt(len(samples))),
+        'elapsed_ms': (time.perf_counter() - start) * 1000,
+        'num_samples': len(samples) * (2 if variance_reduction == 'antithetic' else 1),
+    }
+
+
+def price_european_option_mc_adaptive(
+    option_type_str: str,
+    spot_price: float,
+    strike_price: float,
+    maturity_years: float,
+    volatility: float,
+    dividend_rate: float,
+    risk_free_rate: float,
+    target_std_error: float,
+    time_budget_ms: float = 2000,
+    max_samples: int = 1000000,
+    batch_size: int = 1000,
+    variance_reduction: str = 'none',
+    seed: int = 42
+) -> dict:
+    """
+    Same engine as price_european_option_mc, but simulates in batches and stops as soon as
+    the standard error reaches target_std_error, time_budget_ms is spent or max_samples
+    paths have been simulated.
+
+    Returns:
+        dict: 'price', 'std_error' (achieved), 'elapsed_ms', 'num_samples' (paths used)
+              and 'stop_reason'.
+    """
+    draw = _mc_sampler(
+        option_type_str, spot_price, strike_price, maturity_years, volatility,
+        dividend_rate, risk_free_rate, variance_reduction, np.random.default_rng(seed)
+    )
+    paths_per_sample = 2 if variance_reduction == 'antithetic' else 1
+    run = simulate_until_converged(
+        draw, max(batch_size // paths_per_sample, 2),
+        target_std_error=target_std_error,
+        time_budget_ms=time_budget_ms,
+        max_samples=max(max_samples // paths_per_sample, 2)
+    )
+
+    return {
+        'price': float(run['stats'].mean),
+        'std_error': run['std_error'],
+        'elapsed_ms': run['elapsed_ms'],
+        'num_samples': run['num_samples'] * paths_per_sample,
+        'stop_reason': run['stop_reason'],
     }
\ No newline at end of file
@@ -2,6 +2,7 @@ from django.shortcuts import render
 from django.contrib import messages
 from .forms import EngineChoiceForm
 from . import services
+from compute.pool import ComputePoolBusy, ComputeTimeout, run_in_pool
 
 def pricer_lab_view(request):
     """
@@ -28,14 +29,19 @@ def pricer_lab_view(request):
                     'strike_price': form.cleaned_data['strike_price'],
                     'volatility_pct': form.cleaned_data['volatility_pct'],
                     'risk_free_rate_pct': form.cleaned_data['risk_free_rate_pct'],
+                    'mc_samples': form.cleaned_data['mc_samples'],
+                    'mc_target_std_error': form.cleaned_data['mc_target_std_error'],
                 }
                 
                 # Get the user's choice for the pricing engine
                 engine_choice = form.cleaned_data['engine_choice']
                 
                 # Call our clean service function to perform the calculation
-                results = services.price_option_with_selected_engine(engine_choice, option_params)
+                results = run_in_pool('fast', services.price_option_with_selected_engine, engine_choice, option_params)
 
+            except (ComputePoolBusy, ComputeTimeout):
+                # Left to ComputePoolErrorMiddleware (503 / 504)
+                raise
             except Exception as e:
                 # If any error occurs during the QuantLib calculation, display a friendly message
                 messages.error(request, f"An error occurred during calculation: {e}")
@@ -1,6 +1,8 @@
 import QuantLib as ql
 import numpy as np
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
 
+@isolated_evaluation_date
 def calculate_numerical_greeks(option_params: dict, bump_size: float, evaluation_dt):
     """
     Demonstrates the numerical calculation of Delta using a user-defined evaluation date.
@@ -8,7 +10,7 @@ def calculate_numerical_greeks(option_params: dict, bump_size: float, evaluation
     
     # 1. Use the evaluation date provided by the user
     calculation_date = ql.Date(evaluation_dt.day, evaluation_dt.month, evaluation_dt.year)
-    ql.Settings.instance().evaluationDate = calculation_date
+    set_evaluation_date(calculation_date)
     
     def get_option_price(spot_price: float) -> float:
         """Helper function to price the option for a given spot price."""
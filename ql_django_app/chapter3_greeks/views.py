@@ -1,6 +1,7 @@
 from django.shortcuts import render
 from .forms import NumericalGreeksForm
 from . import services
+from compute.pool import run_in_pool
 
 def greeks_lab_view(request):
     form = NumericalGreeksForm(request.POST or None)
@@ -15,7 +16,7 @@ def greeks_lab_view(request):
             'risk_free_rate_pct': form.cleaned_data['risk_free_rate_pct'],
         }
         
-        results = services.calculate_numerical_greeks(
+        results = run_in_pool('fast', services.calculate_numerical_greeks,
             option_params=option_params, 
             bump_size=form.cleaned_data['bump_size'],
             evaluation_dt=form.cleaned_data['evaluation_dt']
@@ -1,9 +1,14 @@
 import QuantLib as ql
 import numpy as np
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
 
 bond_instrument = None
 rate_quote = None
 
+# The bond is priced as of this date, both at setup and on every market update
+CALCULATION_DATE = ql.Date(15, 1, 2016)
+
+@isolated_evaluation_date
 def setup_bond_and_market(coupon_rate_pct, maturity_years):
     """
     Creates and stores a bond and its underlying market rate quote.
@@ -12,8 +17,8 @@ def setup_bond_and_market(coupon_rate_pct, maturity_years):
     global bond_instrument, rate_quote
     
     # 1. Market and Calculation Setup
-    calculation_date = ql.Date(15, 1, 2016)
-    ql.Settings.instance().evaluationDate = calculation_date
+    calculation_date = CALCULATION_DATE
+    set_evaluation_date(calculation_date)
     calendar = ql.UnitedStates(ql.UnitedStates.GovernmentBond)
     day_count = ql.Actual365Fixed()
 
@@ -56,6 +61,7 @@ def setup_bond_and_market(coupon_rate_pct, maturity_years):
         'initial_rate': initial_rate * 100
     }
 
+@isolated_evaluation_date
 def update_market_and_reprice(new_rate_pct):
     """
     Updates the market quote and returns the new bond price.
@@ -66,6 +72,9 @@ def update_market_and_reprice(new_rate_pct):
     if rate_quote is None or bond_instrument is None:
         return {'error': 'Bond and market not set up yet.'}
         
+    # The bond outlives the request that built it, so restore its evaluation date
+    set_evaluation_date(CALCULATION_DATE)
+
     # 1. UPDATE THE MARKET: This is the only action needed.
     rate_quote.setValue(new_rate_pct / 100)
     
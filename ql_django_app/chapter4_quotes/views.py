@@ -4,6 +4,8 @@ from .forms import BondSetupForm, MarketUpdateForm
 from . import services
 
 def market_lab_view(request):
+    # Ce lab garde l'obligation et sa quote en mémoire entre deux requêtes : il reste dans le
+    # processus web au lieu de passer par le pool de calcul partagé (compute.pool).
     # On initialise toujours les deux formulaires
     setup_form = BondSetupForm(prefix='setup')
     update_form = MarketUpdateForm(prefix='update')
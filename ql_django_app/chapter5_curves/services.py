@@ -1,10 +1,12 @@
 import QuantLib as ql
 from datetime import date
 import numpy as np
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
 
+@isolated_evaluation_date
 def build_and_analyze_curves(evaluation_dt: date, interpolation_str: str):
     eval_date = ql.Date(evaluation_dt.day, evaluation_dt.month, evaluation_dt.year)
-    ql.Settings.instance().evaluationDate = eval_date
+    set_evaluation_date(eval_date)
     
     # 1. Données de marché (du premier notebook)
     depo_rates = [5.25, 5.5]
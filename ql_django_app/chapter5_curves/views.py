@@ -1,6 +1,7 @@
 from django.shortcuts import render
 from .forms import CurveLabForm
 from . import services
+from compute.pool import run_in_pool
 
 def curve_lab_view(request):
     form = CurveLabForm(request.POST or None)
@@ -14,7 +15,7 @@ def curve_lab_view(request):
         eval_dt = form.fields['evaluation_dt'].initial
         interpolation = form.fields['interpolation_type'].initial
             
-    plot_points = services.build_and_analyze_curves(
+    plot_points = run_in_pool('fast', services.build_and_analyze_curves,
         evaluation_dt=eval_dt,
         interpolation_str=interpolation
     )
@@ -1,7 +1,9 @@
 import QuantLib as ql
 from datetime import date, timedelta
 import numpy as np
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
 
+@isolated_evaluation_date
 def calculate_price_history(bond_params: dict, date_range: dict):
     
     start_date_py = date_range['start_date']
@@ -44,7 +46,7 @@ def calculate_price_history(bond_params: dict, date_range: dict):
         
         # On ne calcule que si l'évaluation est avant la maturité
         if eval_date_ql < bond.maturityDate():
-            ql.Settings.instance().evaluationDate = eval_date_ql
+            set_evaluation_date(eval_date_ql)
             nodes = [eval_date_ql + ql.Period(i, ql.Years) for i in range(11)]
             simulated_rates = base_rates * np.random.normal(1.0, 0.005, base_rates.shape)
             daily_curve = ql.ZeroCurve(nodes, list(simulated_rates), ql.Actual360())
@@ -1,6 +1,7 @@
 from django.shortcuts import render
 from .forms import PriceHistoryForm
 from . import services
+from compute.pool import run_in_pool
 
 def price_history_lab_view(request):
     results = None
@@ -22,7 +23,7 @@ def price_history_lab_view(request):
             }
             
             # On appelle le service avec les données validées
-            results = services.calculate_price_history(bond_params, date_range)
+            results = run_in_pool('fast', services.calculate_price_history, bond_params, date_range)
     
     # Si la requête est un GET (premier chargement), on crée un formulaire vide
     else:
@@ -1,6 +1,7 @@
 from django.shortcuts import render
 from .forms import RandomGeneratorForm
 from . import services
+from compute.pool import ComputePoolBusy, ComputeTimeout, run_in_pool
 
 def random_lab_view(request):
     """
@@ -17,12 +18,15 @@ def random_lab_view(request):
     if request.method == 'POST' and form.is_valid():
         try:
             # Call the service with the cleaned data from the form
-            results = services.generate_random_sequence(
+            results = run_in_pool('fast', services.generate_random_sequence,
                 generator_type=form.cleaned_data['generator_type'],
                 num_points=form.cleaned_data['num_points'],
                 seed=form.cleaned_data['seed'],
                 dimensionality=form.cleaned_data['dimensionality']
             )
+        except (ComputePoolBusy, ComputeTimeout):
+            # Left to ComputePoolErrorMiddleware (503 / 504)
+            raise
         except Exception as e:
             # Handle potential errors from the service, although it's robust
             print(f"Error in random number generation service: {e}")
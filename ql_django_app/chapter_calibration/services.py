@@ -1,7 +1,20 @@
 import QuantLib as ql
 from collections import namedtuple
 import math
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
 
+# Durée indicative d'une calibration (ms, mesurée sur un cœur) : Jamshidian est analytique,
+# BK utilise un arbre trinomial à 100 pas et G2 un arbre 2D à 25 pas.
+ESTIMATED_CALIBRATION_MS = {'HullWhite': 5, 'BlackKarasinski': 800, 'G2': 15000}
+
+
+def estimate_calibration_cost_ms(model_name: str) -> float:
+    """
+    Estime la durée de calibrate_short_rate_model pour ce modèle (en millisecondes).
+    """
+    return ESTIMATED_CALIBRATION_MS.get(model_name, 0)
+
+@isolated_evaluation_date
 def calibrate_short_rate_model(model_name: str):
     """
     Calibre un modèle de taux d'intérêt choisi par l'utilisateur sur un jeu de swaptions.
@@ -9,7 +22,7 @@ def calibrate_short_rate_model(model_name: str):
     # --- 1. Setup commun (date, courbe, données de marché) ---
     today = ql.Date(15, ql.February, 2002)
     settlement = ql.Date(19, ql.February, 2002)
-    ql.Settings.instance().evaluationDate = today
+    set_evaluation_date(today)
     term_structure = ql.YieldTermStructureHandle(
         ql.FlatForward(settlement, 0.04875825, ql.Actual365Fixed())
     )
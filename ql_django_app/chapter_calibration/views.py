@@ -1,19 +1,36 @@
-from django.shortcuts import render
+from django.shortcuts import render, redirect
 from .forms import ModelChoiceForm
 from . import services
+from compute.pool import ComputePoolBusy, ComputeTimeout, run_in_pool
+from compute.jobs import get_job, should_run_as_job, submit_job
 
 def calibration_lab_view(request):
     form = ModelChoiceForm(request.POST or None)
     results = None
+    job = None
     
     if request.method == 'POST' and form.is_valid():
         model_name = form.cleaned_data['model_name']
+        # Les calibrations sur arbre (BK, G2) partent en tâche de fond au-delà du seuil de coût
+        estimated_cost_ms = services.estimate_calibration_cost_ms(model_name)
+        if should_run_as_job(estimated_cost_ms):
+            job = submit_job(services.calibrate_short_rate_model, {'model_name': model_name}, estimated_cost_ms)
+            return redirect(f"{request.path}?job={job.pk}")
         try:
-            results = services.calibrate_short_rate_model(model_name)
+            results = run_in_pool('slow', services.calibrate_short_rate_model, model_name)
+        except (ComputePoolBusy, ComputeTimeout):
+            # Left to ComputePoolErrorMiddleware (503 / 504)
+            raise
         except Exception as e:
         
             print(f"ERROR during calibration: {e}")
+
+    elif request.method == 'GET':
+        job = get_job(request.GET.get('job'))
+        if job is not None:
+            form = ModelChoiceForm(initial=job.params)
+            results = job.result
         
     
-    context = {'form': form, 'results': results}
-    return render(request, 'chapter_calibration/calibration_lab.html', context)
\ No newline at end of file
+    context = {'form': form, 'results': results, 'job': job}
+    return render(request, 'chapter_calibration/calibration_lab.html', context)
@@ -1,9 +1,11 @@
 import QuantLib as ql
 from datetime import date
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
 
+@isolated_evaluation_date
 def analyze_cap_floor_parity(length_years, strike_pct, vol_pct, rate_pct, nominal):
     today = ql.Date(6, 8, 2025)
-    ql.Settings.instance().evaluationDate = today
+    set_evaluation_date(today)
     
     strike = strike_pct / 100.0
     vol = vol_pct / 100.0
@@ -1,12 +1,13 @@
 from django.shortcuts import render
 from .forms import CapFloorForm
 from . import services
+from compute.pool import run_in_pool
 
 def parity_lab_view(request):
     form = CapFloorForm(request.POST or None)
     results = None
     if form.is_valid():
-        results = services.analyze_cap_floor_parity(
+        results = run_in_pool('fast', services.analyze_cap_floor_parity,
             length_years=form.cleaned_data['length_years'],
             strike_pct=form.cleaned_data['strike_pct'],
             vol_pct=form.cleaned_data['vol_pct'],
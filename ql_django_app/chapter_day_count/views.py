@@ -1,6 +1,7 @@
 from django.shortcuts import render
 from .forms import DayCountForm
 from . import services
+from compute.pool import run_in_pool
 
 def day_count_lab_view(request):
     results = None
@@ -13,7 +14,7 @@ def day_count_lab_view(request):
         if form.is_valid():
             # Si oui, on appelle le service avec les NOUVELLES données du formulaire.
             # Le service va retourner TOUS les résultats (year_fraction ET plot_points).
-            results = services.analyze_day_count_convention(
+            results = run_in_pool('fast', services.analyze_day_count_convention,
                 convention_str=form.cleaned_data['convention'],
                 d1_py=form.cleaned_data['start_date'],
                 d2_py=form.cleaned_data['end_date']
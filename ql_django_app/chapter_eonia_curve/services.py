@@ -1,14 +1,16 @@
 import QuantLib as ql
 from datetime import date
 import numpy as np
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
 
+@isolated_evaluation_date
 def build_eonia_curve(interpolation_type: str, include_jump: bool, evaluation_dt, simulation_duration_years):
     """
     Builds an EONIA yield curve using different interpolations and potentially
     including a turn-of-year jump, handling potential numerical errors gracefully.
     """
     eval_date = ql.Date(evaluation_dt.day, evaluation_dt.month, evaluation_dt.year)
-    ql.Settings.instance().evaluationDate = eval_date
+    set_evaluation_date(eval_date)
     
     # --- Market Data (from the Cookbook example) ---
     deposits = {
@@ -1,6 +1,7 @@
 from django.shortcuts import render
 from .forms import EoniaCurveForm
 from . import services
+from compute.pool import run_in_pool
 
 def eonia_lab_view(request):
     plot_points = None
@@ -12,7 +13,7 @@ def eonia_lab_view(request):
         # On vérifie si le formulaire est valide
         if form.is_valid():
             # Si oui, on utilise les données "nettoyées" qui sont dans les bons types
-            plot_points = services.build_eonia_curve(
+            plot_points = run_in_pool('fast', services.build_eonia_curve,
                 interpolation_type=form.cleaned_data['interpolation_type'],
                 include_jump=form.cleaned_data['include_jump'],
                 evaluation_dt=form.cleaned_data['evaluation_dt'], # Sera un objet date
@@ -23,7 +24,7 @@ def eonia_lab_view(request):
     else:
         form = EoniaCurveForm()
         # Et on calcule la courbe avec les valeurs initiales du formulaire
-        plot_points = services.build_eonia_curve(
+        plot_points = run_in_pool('fast', services.build_eonia_curve,
             interpolation_type=form.fields['interpolation_type'].initial,
             include_jump=form.fields['include_jump'].initial,
             evaluation_dt=form.fields['evaluation_dt'].initial, # Est un objet date
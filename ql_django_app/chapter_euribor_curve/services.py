@@ -1,7 +1,9 @@
 import QuantLib as ql
 from datetime import date
 import numpy as np
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
 
+@isolated_evaluation_date
 def build_euribor_curves(base_spread_bps: float, evaluation_dt: date, simulation_duration_years: int):
     """
     Construit deux courbes Euribor 6M (naïve et améliorée) pour une date d'évaluation
@@ -10,7 +12,7 @@ def build_euribor_curves(base_spread_bps: float, evaluation_dt: date, simulation
     
     # On utilise la date choisie par l'utilisateur comme point de départ
     today = ql.Date(evaluation_dt.day, evaluation_dt.month, evaluation_dt.year)
-    ql.Settings.instance().evaluationDate = today
+    set_evaluation_date(today)
     
     # --- 1. Construction de la courbe de discount Eonia (robuste) ---
     # Les données de marché sont fixes, mais la courbe est construite "aujourd'hui"
@@ -2,13 +2,14 @@ from django.shortcuts import render
 from django.http import JsonResponse
 from .forms import EuriborCurveForm
 from . import services
+from compute.pool import run_in_pool
 
 def euribor_lab_view(request):
     # Gère la requête POST (AJAX) pour la mise à jour
     if request.method == 'POST' and request.headers.get('x-requested-with') == 'XMLHttpRequest':
         form = EuriborCurveForm(request.POST)
         if form.is_valid():
-            curve_data = services.build_euribor_curves(
+            curve_data = run_in_pool('fast', services.build_euribor_curves,
                 base_spread_bps=form.cleaned_data['base_spread_bps'],
                 evaluation_dt=form.cleaned_data['evaluation_dt'],
                 simulation_duration_years=form.cleaned_data['simulation_duration_years']
@@ -33,7 +34,7 @@ def euribor_lab_view(request):
         sim_duration = form.fields['simulation_duration_years'].initial
         base_spread = form.fields['base_spread_bps'].initial
             
-    curve_data = services.build_euribor_curves(
+    curve_data = run_in_pool('fast', services.build_euribor_curves,
         base_spread_bps=base_spread,
         evaluation_dt=eval_dt,
         simulation_duration_years=sim_duration
@@ -1,13 +1,15 @@
 import QuantLib as ql
 import numpy as np
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
 
+@isolated_evaluation_date
 def analyze_forward_curve_glitch(interpolation_str: str):
     """
     Builds a forward rate curve using a user-selected interpolation method
     and analyzes the "glitch" at the nodes. Returns data with ISO dates for plotting.
     """
     today = ql.Date(24, ql.August, 2015)
-    ql.Settings.instance().evaluationDate = today
+    set_evaluation_date(today)
     
     # Market data from the notebook
     dates_ql = [today] + [today + ql.Period(i, ql.Years) for i in [1, 2, 3, 5, 10, 20]]
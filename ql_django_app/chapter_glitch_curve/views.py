@@ -1,6 +1,7 @@
 from django.shortcuts import render
 from .forms import InterpolationChoiceForm
 from . import services
+from compute.pool import run_in_pool
 
 def glitch_lab_view(request):
     form = InterpolationChoiceForm(request.POST or None)
@@ -11,7 +12,7 @@ def glitch_lab_view(request):
         form = InterpolationChoiceForm()
         interpolation = form.fields['interpolation_type'].initial
         
-    analysis_data = services.analyze_forward_curve_glitch(interpolation_str=interpolation)
+    analysis_data = run_in_pool('fast', services.analyze_forward_curve_glitch, interpolation_str=interpolation)
     
     context = {'form': form, 'analysis_data': analysis_data}
     return render(request, 'chapter_glitch_curve/glitch_lab.html', context)
\ No newline at end of file
@@ -1,4 +1,6 @@
 from django import forms
+from datetime import date
+from .services import CALIBRATION_BACKENDS, SAMPLE_SURFACE
 
 class SmileControlForm(forms.Form):
     atm_vol_pct = forms.FloatField(
@@ -10,4 +12,117 @@ class SmileControlForm(forms.Form):
         label="Smile Skew", 
         initial=-0.1,
         help_text="Controls the steepness of the smile. Try values from -0.5 to 0.5."
-    )
\ No newline at end of file
+    )
+    backend = forms.ChoiceField(
+        label="Calibration Backend",
+        choices=list(CALIBRATION_BACKENDS.items()),
+        initial='quantlib'
+    )
+    compare_backends = forms.BooleanField(
+        label="Compare backends (timing)",
+        required=False,
+        help_text="Runs every backend from the same initial guess and reports their timings."
+    )
+    global_search = forms.BooleanField(
+        label="Global search (multi-start)",
+        required=False,
+        help_text="Starts the calibration from many points of a Sobol-sampled parameter box, in parallel, and keeps the best fit."
+    )
+
+
+def surface_to_text(expiries, strikes, vols_pct) -> str:
+    """Writes a volatility surface in the text format read by SurfaceCalibrationForm."""
+    lines = ["expiry, " + ", ".join(f"{k:g}" for k in strikes)]
+    for expiry, row in zip(expiries, vols_pct):
+        lines.append(expiry.isoformat() + ", " + ", ".join(f"{v:g}" for v in row))
+    return "\n".join(lines)
+
+
+class SurfaceCalibrationForm(forms.Form):
+    INITIAL_GUESSES = {
+        'auto': None,
+        'notebook_1': (0.02, 0.2, 0.5, 0.1, 0.01),
+        'notebook_2': (0.07, 0.5, 0.1, 0.1, 0.1),
+    }
+
+    evaluation_dt = forms.DateField(
+        label='Evaluation Date',
+        initial=SAMPLE_SURFACE['evaluation_dt'],
+        widget=forms.DateInput(attrs={'type': 'date'})
+    )
+    spot = forms.FloatField(label='Spot Price', initial=SAMPLE_SURFACE['spot'])
+    risk_free_rate_pct = forms.FloatField(label='Risk-Free Rate (%)', initial=SAMPLE_SURFACE['risk_free_rate_pct'])
+    dividend_rate_pct = forms.FloatField(label='Dividend Rate (%)', initial=SAMPLE_SURFACE['dividend_rate_pct'])
+    vol_surface = forms.CharField(
+        label='Volatility Surface (%)',
+        initial=surface_to_text(SAMPLE_SURFACE['expiries'], SAMPLE_SURFACE['strikes'], SAMPLE_SURFACE['vols_pct']),
+        widget=forms.Textarea(attrs={'rows': 10, 'style': 'font-family: monospace; font-size: 0.8em;'}),
+        help_text="First line: 'expiry' then the strikes. Then one line per expiry (YYYY-MM-DD) with its vols; leave a cell empty for a missing quote."
+    )
+    initial_guess = forms.ChoiceField(
+        label='Initial Guess (θ, κ, σ, ρ, v₀)',
+        choices=[
+            ('auto', 'From the surface (mean variance, 1.0, 0.5, -0.5, mean variance)'),
+            ('notebook_1', '(0.02, 0.2, 0.5, 0.1, 0.01)'),
+            ('notebook_2', '(0.07, 0.5, 0.1, 0.1, 0.1)'),
+        ],
+        initial='auto'
+    )
+    num_chunks = forms.IntegerField(
+        label='Parallel Chunks', required=False, min_value=1, max_value=64,
+        help_text="Expiry chunks priced in parallel threads; empty = automatic."
+    )
+    compare_quantlib = forms.BooleanField(
+        label='Also run the QuantLib backend (timing)', required=False,
+        help_text="One HestonModelHelper per quote, calibrated serially by Levenberg-Marquardt."
+    )
+
+    def clean_vol_surface(self):
+        lines = [line for line in self.cleaned_data['vol_surface'].splitlines() if line.strip()]
+        if len(lines) < 2:
+            raise forms.ValidationError("Enter a header line of strikes and at least one expiry line.")
+        try:
+            strikes = [float(x) for x in lines[0].split(',')[1:]]
+            expiries, vols_pct = [], []
+            for line in lines[1:]:
+                cells = [cell.strip() for cell in line.split(',')]
+                expiries.append(date.fromisoformat(cells[0]))
+                vols_pct.append([float(cell) if cell else None for cell in cells[1:]])
+        except ValueError as e:
+            raise forms.ValidationError(f"Cannot read the surface: {e}")
+
+        if not strikes or any(len(row) != len(strikes) for row in vols_pct):
+            raise forms.ValidationError("Every expiry line must have one cell per strike.")
+        if len(set(expiries)) != len(expiries):
+            raise forms.ValidationError("Each expiry must appear only once.")
+        return {'expiries': expiries, 'strikes': strikes, 'vols_pct': vols_pct}
+
+    def clean(self):
+        cleaned_data = super().clean()
+        surface, evaluation_dt = cleaned_data.get('vol_surface'), cleaned_data.get('evaluation_dt')
+        if surface and evaluation_dt and min(surface['expiries']) <= evaluation_dt:
+            self.add_error('vol_surface', "Every expiry must be after the evaluation date.")
+        return cleaned_data
+
+
+class HistoryCalibrationForm(forms.Form):
+    end_dt = forms.DateField(
+        label='Last Date of the History',
+        initial=date(2015, 11, 6),
+        widget=forms.DateInput(attrs={'type': 'date'})
+    )
+    num_days = forms.IntegerField(label='Business Days', initial=252, min_value=2, max_value=1000)
+    atm_vol_pct = forms.FloatField(
+        label='Mean ATM Volatility (%)', initial=28.0,
+        help_text="The daily ATM vol and skew mean-revert around these values."
+    )
+    smile_skew = forms.FloatField(label='Mean Smile Skew', initial=-0.1)
+    seed = forms.IntegerField(label='Random Seed', initial=42)
+    num_segments = forms.IntegerField(
+        label='Parallel Segments', required=False, min_value=1, max_value=16,
+        help_text="Consecutive blocks of days calibrated in parallel; empty = one per worker process."
+    )
+    compare_cold = forms.BooleanField(
+        label='Also calibrate every day from the fixed guess', initial=True, required=False,
+        help_text="Needed to measure the evaluations saved; it makes the run several times longer."
+    )
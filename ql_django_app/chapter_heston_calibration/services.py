@@ -1,88 +1,887 @@
 import QuantLib as ql
 import numpy as np
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from urllib.parse import urlencode
+from scipy.optimize import least_squares
+from scipy.stats import qmc
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
+from compute.pool import ComputePoolBusy, ComputeTimeout, lane_workers, map_in_pool
+from european_option.services import implied_volatility_batch, bsm_closed_form
+from chapter_heston_option.services import HESTON_PARAM_NAMES, heston_call_prices_batch
 
-def calibrate_heston_and_get_smile(atm_vol_pct: float, smile_skew: float):
+CALIBRATION_BACKENDS = {
+    'quantlib': 'QuantLib Levenberg-Marquardt (HestonModelHelper)',
+    'numpy': 'NumPy pricer + SciPy least_squares (analytic Jacobian)',
+}
+
+# Bounds of (theta, kappa, sigma, rho, v0) for the SciPy backend
+HESTON_LOWER_BOUNDS = [1.0e-4, 1.0e-3, 1.0e-3, -0.999, 1.0e-4]
+HESTON_UPPER_BOUNDS = [4.0, 20.0, 5.0, 0.999, 4.0]
+
+
+def heston_otm_prices_batch(spot, strikes, maturities, risk_free_rate, dividend_rate, params, gradient=False):
+    """
+    Prices the out-of-the-money option of each (strike, maturity) pair under Heston, like
+    HestonModelHelper does (call when K e^{-rT} >= S e^{-qT}, put otherwise).
+    Puts are obtained by put-call parity, so they share the call Jacobian.
+    """
+    strikes = np.asarray(strikes, dtype=float)
+    maturities = np.broadcast_to(np.asarray(maturities, dtype=float), strikes.shape)
+    is_call = strikes * np.exp(-risk_free_rate * maturities) >= spot * np.exp(-dividend_rate * maturities)
+    parity = np.where(is_call, 0.0, strikes * np.exp(-risk_free_rate * maturities) - spot * np.exp(-dividend_rate * maturities))
+
+    if gradient:
+        calls, jacobian = heston_call_prices_batch(spot, strikes, maturities, risk_free_rate, dividend_rate, params, gradient=True)
+        return calls + parity, jacobian
+    return heston_call_prices_batch(spot, strikes, maturities, risk_free_rate, dividend_rate, params) + parity
+
+
+# The surface view runs calibrate_heston_surface on this lane of the compute pool
+SURFACE_LANE = 'slow'
+# Below this many quotes per chunk, the thread hand-off costs more than the pricing it splits
+SURFACE_MIN_QUOTES_PER_CHUNK = 256
+
+_surface_executor = None
+_surface_executor_lock = threading.Lock()
+
+
+def surface_calibration_threads() -> int:
+    """
+    Threads used to price the chunks of a surface: NumPy releases the GIL in the pricer, and a
+    residual evaluation lasts a few milliseconds, far too little to pay for process round trips.
+    Every worker of SURFACE_LANE has its own threads, so the cores are shared between them.
+    """
+    return max(1, (os.cpu_count() or 1) // max(1, lane_workers(SURFACE_LANE)))
+
+
+def _get_surface_executor() -> ThreadPoolExecutor:
+    global _surface_executor
+    with _surface_executor_lock:
+        if _surface_executor is None:
+            _surface_executor = ThreadPoolExecutor(max_workers=surface_calibration_threads(), thread_name_prefix='heston-surface')
+        return _surface_executor
+
+
+def maturity_chunks(maturities, num_chunks: int) -> list:
+    """
+    Splits the quotes into at most num_chunks groups of whole maturities with similar numbers
+    of quotes, so each chunk evaluates the characteristic function of its maturities once.
+
+    Returns:
+        list: Arrays of quote indices.
+    """
+    maturities = np.asarray(maturities, dtype=float)
+    unique_maturities, inverse, counts = np.unique(maturities, return_inverse=True, return_counts=True)
+    num_chunks = max(1, min(num_chunks, len(unique_maturities)))
+    # Cut the cumulated quote count in equal parts
+    cumulated = np.cumsum(counts)
+    chunk_of_maturity = np.minimum((cumulated - 1) * num_chunks // cumulated[-1], num_chunks - 1)
+    chunk_of_quote = chunk_of_maturity[inverse]
+    return [np.flatnonzero(chunk_of_quote == c) for c in np.unique(chunk_of_quote)]
+
+
+def heston_otm_prices_chunked(spot, strikes, maturities, risk_free_rate, dividend_rate, params, chunks, gradient=False):
+    """heston_otm_prices_batch evaluated chunk by chunk on the surface thread pool."""
+    def price(index):
+        return heston_otm_prices_batch(spot, strikes[index], maturities[index], risk_free_rate, dividend_rate, params, gradient)
+
+    results = list(_get_surface_executor().map(price, chunks)) if len(chunks) > 1 else [price(chunks[0])]
+    prices = np.empty(len(strikes))
+    jacobian = np.empty((len(strikes), 5)) if gradient else None
+    for index, result in zip(chunks, results):
+        if gradient:
+            prices[index], jacobian[index] = result
+        else:
+            prices[index] = result
+    return (prices, jacobian) if gradient else prices
+
+
+def calibrate_heston_least_squares(spot, strikes, maturities, market_vols, risk_free_rate, dividend_rate, initial_params,
+                                   max_evaluations: int = 100, num_chunks: int = 1, tolerance: float = 1.0e-8):
+    """
+    Calibrates Heston to Black volatilities with scipy.optimize.least_squares.
+
+    The residuals are the relative price errors of the out-of-the-money options (the default
+    calibration error of HestonModelHelper), priced for every quote at once by
+    heston_call_prices_batch, whose analytic derivatives give the Jacobian.
+
+    Args:
+        strikes, maturities, market_vols: Arrays of quotes (maturities in years, vols as decimals).
+        initial_params: (theta, kappa, sigma, rho, v0).
+        max_evaluations (int): Cap on residual evaluations; with the 1e-8 tolerances it
+            mirrors the EndCriteria of the QuantLib backend.
+        num_chunks (int): Number of maturity chunks priced in parallel (see maturity_chunks).
+        tolerance (float): xtol and ftol of least_squares.
+
+    Returns:
+        dict: 'params', 'market_prices', 'model_prices', 'nfev', 'njev', 'status', 'message',
+        and 'pricing_ms' / 'jacobian_ms', the time spent in residual and Jacobian evaluations.
+    """
+    strikes = np.asarray(strikes, dtype=float)
+    maturities = np.broadcast_to(np.asarray(maturities, dtype=float), strikes.shape)
+    is_call = strikes * np.exp(-risk_free_rate * maturities) >= spot * np.exp(-dividend_rate * maturities)
+    market_prices = bsm_closed_form(
+        is_call, spot, strikes, maturities, np.asarray(market_vols, dtype=float), dividend_rate, risk_free_rate
+    )[0]
+    chunks = maturity_chunks(maturities, num_chunks)
+    timers = {'pricing_ms': 0.0, 'jacobian_ms': 0.0}
+
+    def residuals(params):
+        start = time.perf_counter()
+        prices = heston_otm_prices_chunked(spot, strikes, maturities, risk_free_rate, dividend_rate, params, chunks)
+        timers['pricing_ms'] += (time.perf_counter() - start) * 1000
+        return prices / market_prices - 1.0
+
+    def jacobian(params):
+        start = time.perf_counter()
+        _, jac = heston_otm_prices_chunked(spot, strikes, maturities, risk_free_rate, dividend_rate, params, chunks, gradient=True)
+        timers['jacobian_ms'] += (time.perf_counter() - start) * 1000
+        return jac / market_prices[:, None]
+
+    x0 = np.clip(initial_params, HESTON_LOWER_BOUNDS, HESTON_UPPER_BOUNDS)
+    solution = least_squares(
+        residuals, x0, jac=jacobian, bounds=(HESTON_LOWER_BOUNDS, HESTON_UPPER_BOUNDS),
+        method='trf', xtol=tolerance, ftol=tolerance, gtol=1.0e-8, max_nfev=max_evaluations
+    )
+    return {
+        'params': tuple(solution.x),
+        'market_prices': market_prices,
+        'model_prices': heston_otm_prices_chunked(spot, strikes, maturities, risk_free_rate, dividend_rate, solution.x, chunks),
+        'nfev': solution.nfev,
+        'njev': solution.njev,
+        'status': solution.status,
+        'message': solution.message,
+        **timers,
+    }
+
+
+def _calibrate_with_quantlib(market, initial_params):
+    """QuantLib backend: LevenbergMarquardt over HestonModelHelpers priced by AnalyticHestonEngine."""
+    theta, kappa, sigma, rho, v0 = initial_params
+    process = ql.HestonProcess(market['flat_ts'], market['dividend_ts'], ql.QuoteHandle(ql.SimpleQuote(market['spot'])), v0, kappa, theta, sigma, rho)
+    model = ql.HestonModel(process)
+    engine = ql.AnalyticHestonEngine(model)
+
+    helpers = []
+    for s, vol in zip(market['strikes'], market['market_vols']):
+        helper = ql.HestonModelHelper(market['helper_period'], market['calendar'], market['spot'], s, ql.QuoteHandle(ql.SimpleQuote(vol)), market['flat_ts'], market['dividend_ts'])
+        helper.setPricingEngine(engine)
+        helpers.append(helper)
+
+    start = time.perf_counter()
+    lm = ql.LevenbergMarquardt()
+    model.calibrate(helpers, lm, ql.EndCriteria(100, 10, 1.0e-8, 1.0e-8, 1.0e-8))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    smile_prices = []
+    for s_grid in market['strikes_grid']:
+        payoff = ql.PlainVanillaPayoff(ql.Option.Call, s_grid)
+        exercise = ql.EuropeanExercise(market['maturity_date'])
+        option = ql.VanillaOption(payoff, exercise)
+        option.setPricingEngine(engine)
+        smile_prices.append(option.NPV())
+
+    return {
+        'params': tuple(model.params()),
+        'market_prices': [h.marketValue() for h in helpers],
+        'model_prices': [h.modelValue() for h in helpers],
+        'smile_prices': smile_prices,
+        'calibration_ms': elapsed_ms,
+        'iterations': '-',
+    }
+
+
+def _calibrate_with_numpy(market, initial_params):
+    """NumPy/SciPy backend: least_squares on the vectorized characteristic-function pricer."""
+    start = time.perf_counter()
+    fit = calibrate_heston_least_squares(
+        market['spot'], market['strikes'], market['helper_maturity'], market['market_vols'],
+        market['risk_free_rate'], market['dividend_rate'], initial_params
+    )
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    smile_prices = heston_call_prices_batch(
+        market['spot'], market['strikes_grid'], market['maturity'], market['risk_free_rate'], market['dividend_rate'], fit['params']
+    )
+    return {
+        'params': fit['params'],
+        'market_prices': fit['market_prices'],
+        'model_prices': fit['model_prices'],
+        'smile_prices': smile_prices,
+        'calibration_ms': elapsed_ms,
+        'iterations': f"{fit['nfev']} evaluations / {fit['njev']} Jacobians",
+    }
+
+
+_BACKEND_FUNCTIONS = {'quantlib': _calibrate_with_quantlib, 'numpy': _calibrate_with_numpy}
+
+
+# Market of the smile lab: 1-year smile on 5 strikes from 90% to 110% of spot
+SMILE_SPOT = 659.37
+SMILE_MONEYNESS = (0.90, 0.95, 1.00, 1.05, 1.10)
+
+
+def build_smile_market(today, atm_vol: float, smile_skew: float, spot: float = SMILE_SPOT,
+                       risk_free_rate: float = 0.01, dividend_rate: float = 0.0) -> dict:
+    """
+    Market data of the smile lab on a given evaluation date: a 1-year smile
+    atm_vol + skew * (K/S - 1) + 0.8 * (K/S - 1)^2 on the SMILE_MONEYNESS strikes.
+    """
+    calendar = ql.TARGET()
+    day_count = ql.Actual365Fixed()
+    flat_ts = ql.YieldTermStructureHandle(ql.FlatForward(today, risk_free_rate, day_count))
+    dividend_ts = ql.YieldTermStructureHandle(ql.FlatForward(today, dividend_rate, day_count))
+
+    maturity_date = today + ql.Period("1Y")
+    strikes = [round(spot * m, 2) for m in SMILE_MONEYNESS]
+
+    # Simple quadratic formula to create a smile/skew
+    market_vols = [
+        atm_vol + smile_skew * (s/spot - 1) + 0.8 * (s/spot - 1)**2
+        for s in strikes
+    ]
+
+    # The helpers expire where HestonModelHelper puts them: the period is advanced on the calendar
+    helper_period = ql.Period(maturity_date - today, ql.Days)
+    return {
+        'spot': spot, 'risk_free_rate': risk_free_rate, 'dividend_rate': dividend_rate,
+        'flat_ts': flat_ts, 'dividend_ts': dividend_ts, 'calendar': calendar,
+        'strikes': strikes, 'market_vols': market_vols,
+        'helper_period': helper_period,
+        'helper_maturity': day_count.yearFraction(today, calendar.advance(today, helper_period)),
+        'maturity_date': maturity_date,
+        'maturity': day_count.yearFraction(today, maturity_date),
+        'strikes_grid': np.linspace(550, 750, 25) * (spot / SMILE_SPOT),
+    }
+
+
+def _cold_start_params(atm_vol: float):
+    """The fixed initial guess of the smile lab: (theta, kappa, sigma, rho, v0)."""
+    return (atm_vol**2, 3.0, 0.5, -0.5, atm_vol**2)
+
+
+def _smile_results(today, market, backend: str, runs: dict, compare_backends: bool = False) -> dict:
+    """Builds the display data of the smile lab (errors, smiles, timings) from backend runs."""
+    spot, strikes, market_vols = market['spot'], market['strikes'], market['market_vols']
+    risk_free_rate, dividend_rate = market['risk_free_rate'], market['dividend_rate']
+    flat_ts, dividend_ts, maturity_date = market['flat_ts'], market['dividend_ts'], market['maturity_date']
+
+    run = runs[backend]
+    theta_cal, kappa_cal, sigma_cal, rho_cal, v0_cal = run['params']
+
+    # --- 3. Prepare data for the IHM display ---
+    errors_table = []
+    for i, (market_price, model_price) in enumerate(zip(run['market_prices'], run['model_prices'])):
+        err = (model_price/market_price - 1.0)
+        errors_table.append({'strike': strikes[i], 'market_price': f"{market_price:.4f}", 'model_price': f"{model_price:.4f}", 'rel_error_pct': f"{err*100:.2f}%"})
+
+    # The whole smile is inverted at once by the vectorized Black solver
+    forward = spot * dividend_ts.discount(maturity_date) / flat_ts.discount(maturity_date)
+    model_vols = implied_volatility_batch(run['smile_prices'], forward, market['strikes_grid'], market['maturity'], flat_ts.discount(maturity_date))
+    
+    market_smile = [{'x': s, 'y': v*100} for s, v in zip(strikes, market_vols)]
+    model_smile = [{'x': s, 'y': v*100} for s, v in zip(market['strikes_grid'], model_vols) if not np.isnan(v)]
+
+    timings = []
+    if compare_backends:
+        for name, other in runs.items():
+            rel_errors = np.array(other['model_prices']) / np.array(other['market_prices']) - 1.0
+            timings.append({
+                'backend': CALIBRATION_BACKENDS[name],
+                'calibration_ms': np.round(other['calibration_ms'], 2),
+                'iterations': other['iterations'],
+                'rmse_pct': f"{np.sqrt(np.mean(rel_errors**2)) * 100:.4f}%",
+                'params': "θ={:.4f}, κ={:.4f}, σ={:.4f}, ρ={:.4f}, v₀={:.4f}".format(*other['params']),
+            })
+    
+    return {
+        'params': f"θ={theta_cal:.3f}, κ={kappa_cal:.3f}, σ={sigma_cal:.3f}, ρ={rho_cal:.3f}, v₀={v0_cal:.3f}",
+        'backend': CALIBRATION_BACKENDS[backend],
+        'calibration_ms': np.round(run['calibration_ms'], 2),
+        'errors_table': errors_table,
+        'market_smile': market_smile,
+        'model_smile': model_smile,
+        'timings': timings,
+        # Pre-fills the Heston Monte Carlo lab with the calibrated model (exotics pricing)
+        'monte_carlo_query': urlencode({
+            'evaluation_dt': today.to_date().isoformat(), 'maturity_dt': maturity_date.to_date().isoformat(),
+            'spot_price': spot, 'strike_price': spot,
+            'dividend_rate_pct': dividend_rate * 100, 'risk_free_rate_pct': risk_free_rate * 100,
+            'v0': f"{v0_cal:.6g}", 'kappa': f"{kappa_cal:.6g}", 'theta': f"{theta_cal:.6g}",
+            'sigma': f"{sigma_cal:.6g}", 'rho': f"{rho_cal:.6g}", 'barrier': round(1.25 * spot, 2),
+        }),
+    }
+
+
+@isolated_evaluation_date
+def calibrate_heston_and_get_smile(atm_vol_pct: float, smile_skew: float, backend: str = 'quantlib', compare_backends: bool = False):
     """
     Dynamically generates a market volatility smile based on user input,
     calibrates the Heston model to it, and returns the results for plotting.
+
+    backend selects the calibration engine (see CALIBRATION_BACKENDS); with compare_backends,
+    every backend is run from the same initial guess and a timing table is returned.
     """
     try:
         # --- 1. Setup ---
         today = ql.Date(6, 11, 2015)
-        ql.Settings.instance().evaluationDate = today
-        calendar = ql.TARGET()
-        day_count = ql.Actual365Fixed()
-        spot = 659.37
-        risk_free_rate = 0.01
-        dividend_rate = 0.0
-
-        flat_ts = ql.YieldTermStructureHandle(ql.FlatForward(today, risk_free_rate, day_count))
-        dividend_ts = ql.YieldTermStructureHandle(ql.FlatForward(today, dividend_rate, day_count))
-        
-        maturity_date = today + ql.Period("1Y")
-        strikes = [593.43, 626.40, 659.37, 692.34, 725.31]
-
-        # --- Dynamically generate the market smile based on user parameters ---
+        set_evaluation_date(today)
         atm_vol = atm_vol_pct / 100.0
-        # Simple quadratic formula to create a smile/skew
-        market_vols = [
-            atm_vol + smile_skew * (s/spot - 1) + 0.8 * (s/spot - 1)**2 
-            for s in strikes
-        ]
-        
+        market = build_smile_market(today, atm_vol, smile_skew)
+
         # --- 2. Heston Model Calibration ---
-        # We use a fixed, stable initial guess for the optimizer
-        initial_params = {'v0': atm_vol**2, 'kappa': 3.0, 'theta': atm_vol**2, 'rho': -0.5, 'sigma': 0.5}
-        
-        # Ensure we are using a list, not a set or other unserializable type
-        v0, kappa, theta, rho, sigma = list(initial_params.values())
-        
-        process = ql.HestonProcess(flat_ts, dividend_ts, ql.QuoteHandle(ql.SimpleQuote(spot)), v0, kappa, theta, sigma, rho)
-        model = ql.HestonModel(process)
-        engine = ql.AnalyticHestonEngine(model)
-        
-        helpers = []
-        for s, vol in zip(strikes, market_vols):
-            period = ql.Period(maturity_date - today, ql.Days)
-            helper = ql.HestonModelHelper(period, calendar, spot, s, ql.QuoteHandle(ql.SimpleQuote(vol)), flat_ts, dividend_ts)
-            helper.setPricingEngine(engine)
-            helpers.append(helper)
-
-        lm = ql.LevenbergMarquardt()
-        model.calibrate(helpers, lm, ql.EndCriteria(100, 10, 1.0e-8, 1.0e-8, 1.0e-8))
-        theta_cal, kappa_cal, sigma_cal, rho_cal, v0_cal = model.params()
-
-        # --- 3. Prepare data for the IHM display ---
-        bsm_process = ql.BlackScholesMertonProcess(ql.QuoteHandle(ql.SimpleQuote(spot)), dividend_ts, flat_ts, ql.BlackVolTermStructureHandle(ql.BlackConstantVol(today, calendar, 0.20, day_count)))
-
-        errors_table = []
-        for i, opt in enumerate(helpers):
-            err = (opt.modelValue()/opt.marketValue() - 1.0)
-            errors_table.append({'strike': strikes[i], 'market_price': f"{opt.marketValue():.4f}", 'model_price': f"{opt.modelValue():.4f}", 'rel_error_pct': f"{err*100:.2f}%"})
-
-        strikes_grid = np.linspace(550, 750, 25)
-        model_vols = []
-        for s_grid in strikes_grid:
-            payoff = ql.PlainVanillaPayoff(ql.Option.Call, s_grid)
-            exercise = ql.EuropeanExercise(maturity_date)
-            option = ql.VanillaOption(payoff, exercise)
-            option.setPricingEngine(engine)
-            price = option.NPV()
-            try:
-                implied_vol = option.impliedVolatility(price, bsm_process, 1.0e-4)
-                model_vols.append(implied_vol)
-            except RuntimeError:
-                model_vols.append(np.nan)
-        
-        market_smile = [{'x': s, 'y': v*100} for s, v in zip(strikes, market_vols)]
-        model_smile = [{'x': s, 'y': v*100} for s, v in zip(strikes_grid, model_vols) if not np.isnan(v)]
-        
-        return {
-            'params': f"θ={theta_cal:.3f}, κ={kappa_cal:.3f}, σ={sigma_cal:.3f}, ρ={rho_cal:.3f}, v₀={v0_cal:.3f}",
-            'errors_table': errors_table,
-            'market_smile': market_smile,
-            'model_smile': model_smile
+        # We use a fixed, stable initial guess for the optimizer: (theta, kappa, sigma, rho, v0)
+        initial_params = _cold_start_params(atm_vol)
+
+        backends = list(CALIBRATION_BACKENDS) if compare_backends else [backend]
+        runs = {name: _BACKEND_FUNCTIONS[name](market, initial_params) for name in backends}
+        return _smile_results(today, market, backend, runs, compare_backends)
+    except Exception as e:
+        print(f"ERROR IN HESTON CALIBRATION SERVICE: {e}")
+        return {'error': str(e)}
+
+
+# --- Global calibration: parallel multi-start from a Sobol box ---
+
+# Rounds of starts are sent to this lane; each task runs MULTISTART_STARTS_PER_TASK starts
+MULTISTART_LANE = 'slow'
+MULTISTART_MAX_STARTS = 32
+MULTISTART_STARTS_PER_TASK = 4
+# Box of the starting points of (theta, kappa, sigma, rho, v0)
+MULTISTART_LOWER = [0.005, 0.1, 0.05, -0.95, 0.005]
+MULTISTART_UPPER = [0.5, 10.0, 2.0, 0.5, 0.5]
+# Stop as soon as a start fits the smile within 0.01% RMSE (relative price errors), or
+# when a whole round has not improved the best fit by more than 1%
+MULTISTART_TARGET_RMSE = 1.0e-4
+MULTISTART_MIN_IMPROVEMENT = 0.01
+# A parameter within this fraction of the width of the HESTON bounds from one of them (or
+# beyond it: the QuantLib backend is not bounded) is pinned: on the flat valleys of a
+# 5-quote smile such minima fit as well as interior ones but are degenerate models
+MULTISTART_BOUND_TOLERANCE = 1.0e-3
+
+
+def _relative_rmse(run) -> float:
+    rel_errors = np.asarray(run['model_prices']) / np.asarray(run['market_prices']) - 1.0
+    return float(np.sqrt(np.mean(rel_errors**2)))
+
+
+def pinned_parameters(params) -> list:
+    """Names of the parameters (theta, kappa, sigma, rho, v0) that sit on HESTON_LOWER/UPPER_BOUNDS."""
+    lower, upper = np.asarray(HESTON_LOWER_BOUNDS), np.asarray(HESTON_UPPER_BOUNDS)
+    margin = MULTISTART_BOUND_TOLERANCE * (upper - lower)
+    params = np.asarray(params, dtype=float)
+    pinned = (params <= lower + margin) | (params >= upper - margin)
+    return [name for name, flag in zip(HESTON_PARAM_NAMES, pinned) if flag]
+
+
+def _multistart_rank(run):
+    # Interior minima first, then by RMSE
+    return (bool(run['pinned']), run['rmse'])
+
+
+@isolated_evaluation_date
+def multistart_batch(atm_vol_pct: float, smile_skew: float, backend: str, starts: list, target_rmse: float) -> list:
+    """
+    Runs the calibration of the smile lab from each start in turn (a task of the worker
+    processes); the batch stops at the first start whose fit reaches target_rmse without
+    a pinned parameter.
+
+    Returns:
+        list: One dict per start run: 'start', 'params', 'rmse', 'pinned' (see
+        pinned_parameters) and 'ms'. The best run of the batch (interior minima first)
+        also carries 'run', the full backend run needed by the display.
+    """
+    today = ql.Date(6, 11, 2015)
+    set_evaluation_date(today)
+    market = build_smile_market(today, atm_vol_pct / 100.0, smile_skew)
+    runs, full_runs = [], []
+    for initial_params in starts:
+        run = _BACKEND_FUNCTIONS[backend](market, tuple(initial_params))
+        params = [float(x) for x in run['params']]
+        runs.append({
+            'start': [float(x) for x in initial_params],
+            'params': params,
+            'rmse': _relative_rmse(run),
+            'pinned': pinned_parameters(params),
+            'ms': run['calibration_ms'],
+        })
+        full_runs.append(run)
+        if runs[-1]['rmse'] <= target_rmse and not runs[-1]['pinned']:
+            break
+    best = min(range(len(runs)), key=lambda i: _multistart_rank(runs[i]))
+    run = full_runs[best]
+    runs[best]['run'] = {
+        'params': tuple(runs[best]['params']),
+        'market_prices': [float(x) for x in run['market_prices']],
+        'model_prices': [float(x) for x in run['model_prices']],
+        'smile_prices': [float(x) for x in run['smile_prices']],
+        'calibration_ms': run['calibration_ms'],
+        'iterations': run['iterations'],
+    }
+    return runs
+
+
+@isolated_evaluation_date
+def _global_smile_results(atm_vol_pct: float, smile_skew: float, backend: str, run: dict) -> dict:
+    today = ql.Date(6, 11, 2015)
+    set_evaluation_date(today)
+    market = build_smile_market(today, atm_vol_pct / 100.0, smile_skew)
+    return _smile_results(today, market, backend, {backend: run})
+
+
+def calibrate_heston_global(atm_vol_pct: float, smile_skew: float, backend: str = 'quantlib',
+                            max_starts: int = MULTISTART_MAX_STARTS, seed: int = 42) -> dict:
+    """
+    Global version of calibrate_heston_and_get_smile: Levenberg-Marquardt is started from
+    the lab's fixed guess and from scrambled Sobol points of the MULTISTART box, in parallel
+    on the worker processes of MULTISTART_LANE, and the best fit is kept. Minima with a
+    parameter pinned on the HESTON bounds only win when no start found an interior one.
+
+    Starts are sent in rounds (one task of MULTISTART_STARTS_PER_TASK starts per worker);
+    no new round is started once an interior fit reaches MULTISTART_TARGET_RMSE or a round
+    improves the best fit by less than MULTISTART_MIN_IMPROVEMENT. This function dispatches
+    the rounds itself, so it is called from the view, not sent to the pool.
+
+    Returns:
+        dict: The same display data as calibrate_heston_and_get_smile for the best fit, plus
+        'multistart' (starts run, rounds, stop reason, distinct minima found, timings).
+    """
+    try:
+        start = time.perf_counter()
+        sobol = qmc.Sobol(d=5, scramble=True, seed=seed)
+        # Sobol points come in powers of 2 (balance properties); the extra ones are dropped
+        num_points = max(max_starts - 1, 1)
+        box_points = qmc.scale(sobol.random_base2(int(np.ceil(np.log2(num_points)))), MULTISTART_LOWER, MULTISTART_UPPER)[:num_points]
+        starts = [list(_cold_start_params(atm_vol_pct / 100.0))] + box_points.tolist()
+        starts = starts[:max_starts]
+
+        tasks_per_round = max(1, lane_workers(MULTISTART_LANE))
+        round_size = tasks_per_round * MULTISTART_STARTS_PER_TASK
+        runs, rounds, stop_reason = [], 0, 'All starts run'
+        best = None
+        for first in range(0, len(starts), round_size):
+            round_starts = starts[first:first + round_size]
+            batches = [round_starts[i:i + MULTISTART_STARTS_PER_TASK] for i in range(0, len(round_starts), MULTISTART_STARTS_PER_TASK)]
+            round_runs = [
+                run
+                for batch_runs in map_in_pool(
+                    MULTISTART_LANE, multistart_batch,
+                    [(atm_vol_pct, smile_skew, backend, batch, MULTISTART_TARGET_RMSE) for batch in batches]
+                )
+                for run in batch_runs
+            ]
+            runs += round_runs
+            rounds += 1
+            round_best = min(round_runs, key=_multistart_rank)
+            # Finding a first interior minimum counts as an improvement
+            improved = best is None or (bool(best['pinned']) and not round_best['pinned']) or (
+                bool(best['pinned']) == bool(round_best['pinned'])
+                and round_best['rmse'] < best['rmse'] * (1.0 - MULTISTART_MIN_IMPROVEMENT)
+            )
+            if best is None or _multistart_rank(round_best) < _multistart_rank(best):
+                best = round_best
+            if best['rmse'] <= MULTISTART_TARGET_RMSE and not best['pinned']:
+                stop_reason = f"Target RMSE {MULTISTART_TARGET_RMSE * 100:.2f}% reached"
+                break
+            if rounds > 1 and not improved:
+                stop_reason = f"Last round improved the best fit by less than {MULTISTART_MIN_IMPROVEMENT:.0%}"
+                break
+        search_ms = (time.perf_counter() - start) * 1000
+
+        results = _global_smile_results(atm_vol_pct, smile_skew, backend, best['run'])
+
+        # Distinct local minima, identified by their RMSE (to 3 significant digits) and pinned parameters
+        minima = {}
+        for run in sorted(runs, key=_multistart_rank):
+            minima.setdefault((f"{run['rmse']:.3g}", tuple(run['pinned'])), []).append(run)
+        results['calibration_ms'] = np.round(search_ms, 2)
+        results['multistart'] = {
+            'starts_run': len(runs),
+            'starts_available': len(starts),
+            'rounds': rounds,
+            'stop_reason': stop_reason,
+            'single_start_rmse_pct': f"{runs[0]['rmse'] * 100:.4f}%",
+            'best_rmse_pct': f"{best['rmse'] * 100:.4f}%",
+            # Every start ended on the bounds: the best fit is not a robust (interior) minimum
+            'best_pinned': ', '.join(best['pinned']),
+            'serial_ms': np.round(sum(run['ms'] for run in runs), 1),
+            'wall_ms': np.round(search_ms, 1),
+            'minima': [
+                {'rmse_pct': f"{group[0]['rmse'] * 100:.4f}%", 'count': len(group), 'params': _format_params(group[0]['params']),
+                 'pinned': ', '.join(group[0]['pinned'])}
+                for group in list(minima.values())[:8]
+            ],
         }
+        return results
+    except (ComputePoolBusy, ComputeTimeout):
+        # Left to ComputePoolErrorMiddleware (503 / 504)
+        raise
     except Exception as e:
         print(f"ERROR IN HESTON CALIBRATION SERVICE: {e}")
-        return {'error': str(e)}
\ No newline at end of file
+        return {'error': str(e)}
+
+
+# --- Historical calibration: a series of daily smiles, each day warm-started ---
+
+# Segments of the history are calibrated in parallel on this lane of the compute pool
+HISTORY_LANE = 'slow'
+# Daily recalibration stops when an iteration improves the cost by less than 0.01%: the
+# 5-quote smile leaves a flat valley in which tighter tolerances only wander (same RMSE)
+HISTORY_TOLERANCE = 1.0e-4
+# Indicative calibration time of one day (ms, measured on one core): warm start / cold start
+ESTIMATED_WARM_DAY_MS = 12
+ESTIMATED_COLD_DAY_MS = 80
+
+
+def synthetic_smile_history(end_dt: date, num_days: int, atm_vol_pct: float, smile_skew: float, seed: int = 42) -> list:
+    """
+    A year-like series of daily smile markets for the history lab: num_days TARGET business
+    days ending on end_dt. The spot follows a lognormal walk (1.5% daily), the ATM vol and
+    the skew mean-revert around atm_vol_pct and smile_skew, with vol shocks negatively
+    correlated to the spot (-0.7).
+
+    Returns:
+        list: One dict per day, oldest first: 'date', 'spot', 'atm_vol' (decimal), 'skew'.
+    """
+    calendar = ql.TARGET()
+    dates = []
+    day = ql.Date(end_dt.day, end_dt.month, end_dt.year)
+    while len(dates) < num_days:
+        if calendar.isBusinessDay(day):
+            dates.append(day.to_date())
+        day = day - 1
+    dates.reverse()
+
+    rng = np.random.default_rng(seed)
+    spot, atm_vol, skew = SMILE_SPOT, atm_vol_pct / 100.0, smile_skew
+    history = []
+    for d in dates:
+        history.append({'date': d, 'spot': round(spot, 2), 'atm_vol': atm_vol, 'skew': skew})
+        z_spot, z_vol, z_skew = rng.standard_normal(3)
+        spot *= np.exp(0.015 * z_spot - 0.5 * 0.015**2)
+        atm_vol = max(0.05, atm_vol_pct / 100.0 + 0.97 * (atm_vol - atm_vol_pct / 100.0) + 0.008 * (-0.7 * z_spot + 0.714 * z_vol))
+        skew = smile_skew + 0.97 * (skew - smile_skew) + 0.02 * z_skew
+    return history
+
+
+def estimate_history_cost_ms(num_days: int, compare_cold: bool = True) -> float:
+    """Estimated duration of calibrate_heston_history on one core (in milliseconds)."""
+    return num_days * (ESTIMATED_WARM_DAY_MS + (ESTIMATED_COLD_DAY_MS if compare_cold else 0))
+
+
+@isolated_evaluation_date
+def calibrate_history_segment(days: list, compare_cold: bool = True) -> list:
+    """
+    Calibrates consecutive days of a smile history with the NumPy backend. The first day
+    starts from the fixed guess of the lab, every other day from the previous day's
+    solution. With compare_cold, each day is also calibrated from the fixed guess.
+
+    Returns:
+        list: One dict per day with the warm (and cold) parameters, evaluations, time and RMSE.
+    """
+    results = []
+    previous = None
+    for day in days:
+        today = ql.Date(day['date'].day, day['date'].month, day['date'].year)
+        set_evaluation_date(today)
+        market = build_smile_market(today, day['atm_vol'], day['skew'], spot=day['spot'])
+        cold_guess = _cold_start_params(day['atm_vol'])
+
+        runs = {}
+        starts = {'warm': previous if previous is not None else cold_guess}
+        if compare_cold:
+            starts['cold'] = cold_guess
+        for name, initial_params in starts.items():
+            if name == 'cold' and previous is None:
+                runs['cold'] = runs['warm']  # Same starting point on the first day of a segment
+                continue
+            start = time.perf_counter()
+            fit = calibrate_heston_least_squares(
+                market['spot'], market['strikes'], market['helper_maturity'], market['market_vols'],
+                market['risk_free_rate'], market['dividend_rate'], initial_params, tolerance=HISTORY_TOLERANCE
+            )
+            rel_errors = np.asarray(fit['model_prices']) / fit['market_prices'] - 1.0
+            runs[name] = {
+                'params': [float(x) for x in fit['params']],
+                'nfev': int(fit['nfev']),
+                'njev': int(fit['njev'] or 0),
+                'ms': (time.perf_counter() - start) * 1000,
+                'rmse': float(np.sqrt(np.mean(rel_errors**2))),
+            }
+        previous = runs['warm']['params']
+        results.append({'date': day['date'], **runs})
+    return results
+
+
+def calibrate_heston_history(end_dt: date = date(2015, 11, 6), num_days: int = 252, atm_vol_pct: float = 28.0,
+                             smile_skew: float = -0.1, seed: int = 42, num_segments: int = None,
+                             compare_cold: bool = True) -> dict:
+    """
+    Recalibrates Heston on every day of a smile history (see synthetic_smile_history),
+    seeding each day with the previous day's solution.
+
+    The history is cut into num_segments consecutive segments (default: one per worker of
+    the HISTORY_LANE lane) calibrated in parallel by calibrate_history_segment; only the first
+    day of each segment starts cold. This function dispatches the segments itself, so it is
+    called from the view, not sent to the pool.
+
+    Returns:
+        dict: Summary (evaluations and time, warm vs cold), the parameter series for the
+        charts and the wall-clock time.
+    """
+    history = synthetic_smile_history(end_dt, num_days, atm_vol_pct, smile_skew, seed)
+    num_segments = max(1, min(num_segments or lane_workers(HISTORY_LANE), len(history)))
+    segments = [[history[i] for i in index] for index in np.array_split(np.arange(len(history)), num_segments)]
+
+    start = time.perf_counter()
+    days = [day for segment in map_in_pool(HISTORY_LANE, calibrate_history_segment, [(seg, compare_cold) for seg in segments]) for day in segment]
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    def total(run, key):
+        return sum(day[run][key] for day in days)
+
+    def mean_daily_change(run, i):
+        series = np.array([day[run]['params'][i] for day in days])
+        return float(np.mean(np.abs(np.diff(series)))) if len(series) > 1 else 0.0
+
+    summary = []
+    for run, label in [('warm', 'Warm start (previous day)'), ('cold', 'Cold start (fixed guess)')]:
+        if run not in days[0]:
+            continue
+        summary.append({
+            'run': label,
+            'evaluations': total(run, 'nfev'),
+            'jacobians': total(run, 'njev'),
+            'time_ms': np.round(total(run, 'ms'), 1),
+            'mean_rmse_pct': f"{np.mean([day[run]['rmse'] for day in days]) * 100:.4f}%",
+            'kappa_daily_change': np.round(mean_daily_change(run, 1), 4),
+        })
+
+    saved = None
+    if compare_cold:
+        cold_evaluations = total('cold', 'nfev') + total('cold', 'njev')
+        warm_evaluations = total('warm', 'nfev') + total('warm', 'njev')
+        saved = {
+            'evaluations': cold_evaluations - warm_evaluations,
+            'pct': np.round(100.0 * (1.0 - warm_evaluations / cold_evaluations), 1),
+            'time_ms': np.round(total('cold', 'ms') - total('warm', 'ms'), 1),
+        }
+
+    labels = [day['date'].isoformat() for day in days]
+    series = {
+        name: {run: [day[run]['params'][i] for day in days] for run in ('warm', 'cold') if run in days[0]}
+        for i, name in enumerate(HESTON_PARAM_NAMES)
+    }
+    return {
+        'num_days': len(days),
+        'num_segments': len(segments),
+        'first_date': labels[0],
+        'last_date': labels[-1],
+        'summary': summary,
+        'saved': saved,
+        'wall_ms': np.round(wall_ms, 1),
+        'labels': labels,
+        'series': series,
+    }
+
+
+# --- Full-surface calibration (expiry x strike volatility matrix) ---
+
+# Sample surface of the notebook 'Heston model parameter calibration in QuantLib Python & SciPy'
+SAMPLE_SURFACE = {
+    'evaluation_dt': date(2015, 11, 6),
+    'spot': 659.37,
+    'risk_free_rate_pct': 1.0,
+    'dividend_rate_pct': 0.0,
+    'expiries': [
+        date(2015, 12, 6), date(2016, 1, 6), date(2016, 2, 6), date(2016, 3, 6),
+        date(2016, 4, 6), date(2016, 5, 6), date(2016, 6, 6), date(2016, 7, 6),
+        date(2016, 8, 6), date(2016, 9, 6), date(2016, 10, 6), date(2016, 11, 6),
+        date(2016, 12, 6), date(2017, 1, 6), date(2017, 2, 6), date(2017, 3, 6),
+        date(2017, 4, 6), date(2017, 5, 6), date(2017, 6, 6), date(2017, 7, 6),
+        date(2017, 8, 6), date(2017, 9, 6), date(2017, 10, 6), date(2017, 11, 6),
+    ],
+    'strikes': [527.50, 560.46, 593.43, 626.40, 659.37, 692.34, 725.31, 758.28],
+    # Black volatilities in percent, one row per expiry
+    'vols_pct': [
+        [37.819, 34.177, 30.394, 27.832, 26.453, 25.916, 25.941, 26.127],
+        [34.45, 31.769, 29.33, 27.614, 26.575, 25.729, 25.228, 25.202],
+        [37.419, 35.372, 33.729, 32.492, 31.601, 30.883, 30.036, 29.568],
+        [37.498, 35.847, 34.475, 33.399, 32.715, 31.943, 31.098, 30.506],
+        [35.941, 34.516, 33.296, 32.275, 31.867, 30.969, 30.239, 29.631],
+        [35.521, 34.242, 33.154, 32.19, 31.948, 31.096, 30.424, 29.84],
+        [35.442, 34.267, 33.288, 32.374, 32.245, 31.474, 30.838, 30.283],
+        [35.384, 34.286, 33.386, 32.507, 32.46, 31.745, 31.135, 30.6],
+        [35.338, 34.3, 33.464, 32.614, 32.63, 31.961, 31.371, 30.852],
+        [35.301, 34.312, 33.526, 32.698, 32.766, 32.132, 31.558, 31.052],
+        [35.272, 34.322, 33.574, 32.765, 32.873, 32.267, 31.705, 31.209],
+        [35.246, 34.33, 33.617, 32.822, 32.965, 32.383, 31.831, 31.344],
+        [35.226, 34.336, 33.651, 32.869, 33.04, 32.477, 31.934, 31.453],
+        [35.207, 34.342, 33.681, 32.911, 33.106, 32.561, 32.025, 31.55],
+        [35.171, 34.327, 33.679, 32.931, 33.19, 32.665, 32.139, 31.675],
+        [35.128, 34.3, 33.658, 32.937, 33.276, 32.769, 32.255, 31.802],
+        [35.086, 34.274, 33.637, 32.943, 33.36, 32.872, 32.368, 31.927],
+        [35.049, 34.252, 33.618, 32.948, 33.432, 32.959, 32.465, 32.034],
+        [35.016, 34.231, 33.602, 32.953, 33.498, 33.04, 32.554, 32.132],
+        [34.986, 34.213, 33.587, 32.957, 33.556, 33.11, 32.631, 32.217],
+        [34.959, 34.196, 33.573, 32.961, 33.61, 33.176, 32.704, 32.296],
+        [34.934, 34.181, 33.561, 32.964, 33.658, 33.235, 32.769, 32.368],
+        [34.912, 34.167, 33.55, 32.967, 33.701, 33.288, 32.827, 32.432],
+        [34.891, 34.154, 33.539, 32.97, 33.742, 33.337, 32.881, 32.492],
+    ],
+}
+
+
+def _format_params(params) -> str:
+    return "θ={:.4f}, κ={:.4f}, σ={:.4f}, ρ={:.4f}, v₀={:.4f}".format(*params)
+
+
+@isolated_evaluation_date
+def calibrate_heston_surface(evaluation_dt: date, spot: float, risk_free_rate_pct: float, dividend_rate_pct: float,
+                             expiries: list, strikes: list, vols_pct: list, initial_params=None,
+                             num_chunks: int = None, compare_quantlib: bool = False) -> dict:
+    """
+    Calibrates Heston to a whole expiry x strike volatility surface with the NumPy backend.
+
+    The quotes are split into chunks of whole expiries that are priced in parallel threads at
+    every residual and Jacobian evaluation (see maturity_chunks). As the characteristic
+    function is computed once per expiry, extra strikes cost little and extra expiries are
+    spread over the chunks. Missing quotes (None or NaN in vols_pct) are skipped.
+
+    Args:
+        evaluation_dt (date): The evaluation date.
+        spot (float): Spot price.
+        risk_free_rate_pct, dividend_rate_pct (float): Flat rates in percent.
+        expiries (list of date), strikes (list of float): The axes of the surface.
+        vols_pct (list of lists): Black volatilities in percent, one row per expiry.
+        initial_params: (theta, kappa, sigma, rho, v0); by default v0 = theta = the mean
+            variance of the surface, kappa = 1, sigma = 0.5, rho = -0.5.
+        num_chunks (int): Parallel chunks; by default one per SURFACE_MIN_QUOTES_PER_CHUNK
+            quotes, up to surface_calibration_threads().
+        compare_quantlib (bool): Also run the QuantLib backend (serial HestonModelHelpers).
+
+    Returns:
+        dict: Calibrated parameters, the volatility error matrix (bp), the worst quotes,
+        the timing breakdown and, optionally, the QuantLib comparison.
+    """
+    start = time.perf_counter()
+    today = ql.Date(evaluation_dt.day, evaluation_dt.month, evaluation_dt.year)
+    set_evaluation_date(today)
+    calendar = ql.UnitedStates(ql.UnitedStates.GovernmentBond)
+    day_count = ql.Actual365Fixed()
+    risk_free_rate = risk_free_rate_pct / 100.0
+    dividend_rate = dividend_rate_pct / 100.0
+
+    vol_matrix = np.array(vols_pct, dtype=float) / 100.0
+    # Helpers expire where HestonModelHelper puts them: the period in days is advanced on the calendar
+    periods = [ql.Period(ql.Date(e.day, e.month, e.year) - today, ql.Days) for e in expiries]
+    expiry_times = np.array([day_count.yearFraction(today, calendar.advance(today, period)) for period in periods])
+    quoted = np.isfinite(vol_matrix) & (vol_matrix > 0)
+    expiry_index, strike_index = np.nonzero(quoted)
+    quote_strikes = np.asarray(strikes, dtype=float)[strike_index]
+    quote_times = expiry_times[expiry_index]
+    quote_vols = vol_matrix[quoted]
+
+    if initial_params is None:
+        mean_variance = float(np.mean(quote_vols**2))
+        initial_params = (mean_variance, 1.0, 0.5, -0.5, mean_variance)
+    if not num_chunks:
+        num_chunks = min(surface_calibration_threads(), max(1, len(quote_vols) // SURFACE_MIN_QUOTES_PER_CHUNK))
+    setup_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    fit = calibrate_heston_least_squares(
+        spot, quote_strikes, quote_times, quote_vols, risk_free_rate, dividend_rate, initial_params,
+        num_chunks=num_chunks
+    )
+    calibration_ms = (time.perf_counter() - start) * 1000
+
+    # --- Per-quote errors, in volatility (bp) and in price ---
+    start = time.perf_counter()
+    forwards = spot * np.exp((risk_free_rate - dividend_rate) * quote_times)
+    discounts = np.exp(-risk_free_rate * quote_times)
+    is_call = quote_strikes * discounts >= spot * np.exp(-dividend_rate * quote_times)
+    model_vols = implied_volatility_batch(fit['model_prices'], forwards, quote_strikes, quote_times, discounts, is_call)
+    vol_errors_bp = (model_vols - quote_vols) * 1.0e4
+    price_errors = fit['model_prices'] / fit['market_prices'] - 1.0
+
+    error_matrix = np.full(vol_matrix.shape, np.nan)
+    error_matrix[quoted] = vol_errors_bp
+    error_rows = [
+        {'expiry': e, 'cells': ['-' if np.isnan(v) else f"{v:+.0f}" for v in row]}
+        for e, row in zip(expiries, error_matrix)
+    ]
+    worst = np.argsort(-np.nan_to_num(np.abs(vol_errors_bp), nan=np.inf))[:10]
+    worst_quotes = [
+        {
+            'expiry': expiries[expiry_index[i]],
+            'strike': quote_strikes[i],
+            'market_vol': f"{quote_vols[i] * 100:.2f}%",
+            'model_vol': 'N/A' if np.isnan(model_vols[i]) else f"{model_vols[i] * 100:.2f}%",
+            'vol_error_bp': 'N/A' if np.isnan(vol_errors_bp[i]) else f"{vol_errors_bp[i]:+.1f}",
+            'price_error_pct': f"{price_errors[i] * 100:+.3f}%",
+        }
+        for i in worst
+    ]
+    report_ms = (time.perf_counter() - start) * 1000
+
+    timings = [
+        {'step': 'Market data and quotes', 'ms': np.round(setup_ms, 2)},
+        {'step': f"Residuals ({fit['nfev']} evaluations)", 'ms': np.round(fit['pricing_ms'], 2)},
+        {'step': f"Jacobians ({fit['njev']} evaluations)", 'ms': np.round(fit['jacobian_ms'], 2)},
+        {'step': 'Optimizer (least_squares itself)', 'ms': np.round(calibration_ms - fit['pricing_ms'] - fit['jacobian_ms'], 2)},
+        {'step': 'Error report (implied vols)', 'ms': np.round(report_ms, 2)},
+    ]
+
+    comparison = None
+    if compare_quantlib:
+        comparison = _calibrate_surface_with_quantlib(
+            today, calendar, spot, risk_free_rate, dividend_rate, periods,
+            quote_strikes, expiry_index, quote_vols, initial_params
+        )
+
+    return {
+        'params': _format_params(fit['params']),
+        'num_quotes': len(quote_vols),
+        'num_expiries': len(expiries),
+        'num_chunks': len(maturity_chunks(quote_times, num_chunks)),
+        'strikes': list(strikes),
+        'error_rows': error_rows,
+        'worst_quotes': worst_quotes,
+        'rmse_vol_bp': np.round(np.sqrt(np.nanmean(vol_errors_bp**2)), 1),
+        'mean_abs_price_error_pct': f"{np.mean(np.abs(price_errors)) * 100:.3f}%",
+        'timings': timings,
+        'total_ms': np.round(setup_ms + calibration_ms + report_ms, 2),
+        'quantlib': comparison,
+    }
+
+
+def _calibrate_surface_with_quantlib(today, calendar, spot, risk_free_rate, dividend_rate, periods,
+                                     quote_strikes, expiry_index, quote_vols, initial_params):
+    """Reference run: QuantLib LevenbergMarquardt over one HestonModelHelper per quote."""
+    day_count = ql.Actual365Fixed()
+    flat_ts = ql.YieldTermStructureHandle(ql.FlatForward(today, risk_free_rate, day_count))
+    dividend_ts = ql.YieldTermStructureHandle(ql.FlatForward(today, dividend_rate, day_count))
+    theta, kappa, sigma, rho, v0 = initial_params
+    process = ql.HestonProcess(flat_ts, dividend_ts, ql.QuoteHandle(ql.SimpleQuote(spot)), v0, kappa, theta, sigma, rho)
+    model = ql.HestonModel(process)
+    engine = ql.AnalyticHestonEngine(model)
+    helpers = []
+    for strike, i, vol in zip(quote_strikes, expiry_index, quote_vols):
+        helper = ql.HestonModelHelper(periods[i], calendar, spot, float(strike), ql.QuoteHandle(ql.SimpleQuote(float(vol))), flat_ts, dividend_ts)
+        helper.setPricingEngine(engine)
+        helpers.append(helper)
+
+    start = time.perf_counter()
+    model.calibrate(helpers, ql.LevenbergMarquardt(), ql.EndCriteria(100, 10, 1.0e-8, 1.0e-8, 1.0e-8))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    rel_errors = np.array([h.modelValue() / h.marketValue() - 1.0 for h in helpers])
+    return {
+        'params': _format_params(model.params()),
+        'calibration_ms': np.round(elapsed_ms, 2),
+        'mean_abs_price_error_pct': f"{np.mean(np.abs(rel_errors)) * 100:.3f}%",
+    }
@@ -4,4 +4,6 @@ from . import views
 app_name = 'chapter_heston_calibration'
 urlpatterns = [
     path('', views.calibration_lab_view, name='calibration_lab'),
+    path('surface/', views.surface_calibration_view, name='surface_calibration'),
+    path('history/', views.history_calibration_view, name='history_calibration'),
 ]
\ No newline at end of file
@@ -1,6 +1,8 @@
-from django.shortcuts import render
-from .forms import SmileControlForm
+from django.shortcuts import render, redirect
+from .forms import SmileControlForm, SurfaceCalibrationForm, HistoryCalibrationForm
 from . import services
+from compute.pool import ComputePoolBusy, ComputeTimeout, run_in_pool
+from compute.jobs import get_job, should_run_as_job, submit_job
 
 def calibration_lab_view(request):
     form = SmileControlForm(request.POST or None)
@@ -9,17 +11,72 @@ def calibration_lab_view(request):
     if form.is_valid():
         atm_vol = form.cleaned_data['atm_vol_pct']
         skew = form.cleaned_data['smile_skew']
+        backend = form.cleaned_data['backend']
+        compare_backends = form.cleaned_data['compare_backends']
+        global_search = form.cleaned_data['global_search']
     else:
         form = SmileControlForm()
         atm_vol = form.fields['atm_vol_pct'].initial
         skew = form.fields['smile_skew'].initial
+        backend = form.fields['backend'].initial
+        compare_backends = False
+        global_search = False
 
     try:
-        
-        results = services.calibrate_heston_and_get_smile(atm_vol, skew)
+        if global_search:
+            # The multi-start search dispatches its own rounds of starts to the pool
+            results = services.calibrate_heston_global(atm_vol, skew, backend)
+        else:
+            results = run_in_pool('slow', services.calibrate_heston_and_get_smile, atm_vol, skew, backend, compare_backends)
 
+    except (ComputePoolBusy, ComputeTimeout):
+        # Left to ComputePoolErrorMiddleware (503 / 504)
+        raise
     except Exception as e:
         results = {'error': str(e)}
     
     context = {'form': form, 'results': results}
-    return render(request, 'chapter_heston_calibration/heston_calibration_lab.html', context)
\ No newline at end of file
+    return render(request, 'chapter_heston_calibration/heston_calibration_lab.html', context)
+
+
+def surface_calibration_view(request):
+    form = SurfaceCalibrationForm(request.POST or None)
+    results = None
+
+    if request.method == 'POST' and form.is_valid():
+        data = form.cleaned_data
+        surface = data['vol_surface']
+        results = run_in_pool(services.SURFACE_LANE, services.calibrate_heston_surface,
+            data['evaluation_dt'], data['spot'], data['risk_free_rate_pct'], data['dividend_rate_pct'],
+            surface['expiries'], surface['strikes'], surface['vols_pct'],
+            initial_params=SurfaceCalibrationForm.INITIAL_GUESSES[data['initial_guess']],
+            num_chunks=data['num_chunks'],
+            compare_quantlib=data['compare_quantlib']
+        )
+
+    context = {'form': form, 'results': results}
+    return render(request, 'chapter_heston_calibration/heston_surface_calibration.html', context)
+
+
+def history_calibration_view(request):
+    form = HistoryCalibrationForm(request.POST or None)
+    results = None
+    job = None
+
+    if request.method == 'POST' and form.is_valid():
+        params = form.cleaned_data
+        # Les longs historiques partent en tâche de fond au-delà du seuil de coût
+        estimated_cost_ms = services.estimate_history_cost_ms(params['num_days'], params['compare_cold'])
+        if should_run_as_job(estimated_cost_ms):
+            # Le service répartit lui-même les segments sur le pool : la tâche tourne dans le fil de fond
+            job = submit_job(services.calibrate_heston_history, params, estimated_cost_ms, in_thread=True)
+            return redirect(f"{request.path}?job={job.pk}")
+        results = services.calibrate_heston_history(**params)
+    elif request.method == 'GET':
+        job = get_job(request.GET.get('job'))
+        if job is not None:
+            form = HistoryCalibrationForm(initial=job.params)
+            results = job.result
+
+    context = {'form': form, 'results': results, 'job': job}
+    return render(request, 'chapter_heston_calibration/heston_history_calibration.html', context)
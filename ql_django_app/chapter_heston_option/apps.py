@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ChapterHestonOptionConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'chapter_heston_option'
+
+    def ready(self):
+        # Memory-maps the Chebyshev proxy table once, if it has been built
+        from .services import load_heston_proxy
+        load_heston_proxy()
@@ -1,5 +1,6 @@
 from django import forms
 from datetime import date
+from .services import HESTON_MC_PAYOFFS
 
 class HestonComparisonForm(forms.Form):
     """
@@ -31,4 +32,44 @@ class HestonComparisonForm(forms.Form):
     kappa = forms.FloatField(label="Heston: Kappa (Reversion Speed)", initial=0.1)
     theta = forms.FloatField(label="Heston: Theta (Long-term Var)", initial=0.04)
     sigma = forms.FloatField(label="Heston: Sigma (Vol of Vol)", initial=0.1)
-    rho = forms.FloatField(label="Heston: Rho (Correlation)", initial=-0.75, min_value=-1.0, max_value=1.0)
\ No newline at end of file
+    rho = forms.FloatField(label="Heston: Rho (Correlation)", initial=-0.75, min_value=-1.0, max_value=1.0)
+
+class HestonMonteCarloForm(HestonComparisonForm):
+    """
+    Monte Carlo pricer of the Heston lab (QE scheme): same market and Heston inputs,
+    plus the payoff and the simulation settings.
+    """
+    # Bound on num_paths * num_steps (simulated spot values) to keep the lab interactive
+    MAX_SIMULATED_VALUES = 5_000_000
+    # The QE scheme handles kappa -> 0, but ql.HestonModel (analytic validation price) only
+    # accepts strictly positive values
+    POSITIVE_HESTON_PARAMS = ('v0', 'kappa', 'theta', 'sigma')
+
+    volatility_pct = None
+
+    payoff = forms.ChoiceField(
+        label='Payoff',
+        choices=[(key, label) for key, (label, _) in HESTON_MC_PAYOFFS.items()],
+        initial='asian_call'
+    )
+    barrier = forms.FloatField(label='Barrier (Up-and-Out only)', initial=160.0)
+    num_paths = forms.IntegerField(label='Number of Paths', initial=20000, min_value=100, max_value=500000)
+    num_steps = forms.IntegerField(label='Time Steps', initial=50, min_value=1, max_value=1000)
+    seed = forms.IntegerField(label='Random Seed', initial=42)
+    antithetic = forms.BooleanField(label='Antithetic variates', initial=True, required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        for name in self.POSITIVE_HESTON_PARAMS:
+            value = cleaned_data.get(name)
+            if value is not None and value <= 0:
+                self.add_error(name, "Must be strictly positive.")
+        evaluation_dt, maturity_dt = cleaned_data.get('evaluation_dt'), cleaned_data.get('maturity_dt')
+        if evaluation_dt and maturity_dt and maturity_dt <= evaluation_dt:
+            self.add_error('maturity_dt', "Maturity must be after the evaluation date.")
+        num_paths, num_steps = cleaned_data.get('num_paths'), cleaned_data.get('num_steps')
+        if num_paths and num_steps and num_paths * num_steps > self.MAX_SIMULATED_VALUES:
+            raise forms.ValidationError(
+                f"Paths x steps must not exceed {self.MAX_SIMULATED_VALUES:,} (reduce one of them)."
+            )
+        return cleaned_data
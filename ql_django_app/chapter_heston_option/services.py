@@ -1,16 +1,29 @@
 import QuantLib as ql
 import numpy as np
+import functools
+import json
+import time
 from datetime import date
+from pathlib import Path
+from django.conf import settings
+from scipy.special import ndtr
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
 
 # The function now accepts the evaluation_dt from the view
+@isolated_evaluation_date
 def compare_bsm_and_heston(option_params: dict, heston_params: dict, evaluation_dt: date):
     """
     Calculates the price of a European option with both BSM and Heston models,
     using a user-defined evaluation date.
+
+    Also prices both models over a strike grid (50% to 150% of spot) for the option maturity
+    and for a quarter, half and twice of it with the COS engine, and returns the BSM - Heston
+    difference curves with the timings of the grid and of the single analytic Heston price.
+    The Heston price is also given by the fast path (heston_call_prices_fast) with its timing.
     """
     # 1. Use the user-provided evaluation date
     today = ql.Date(evaluation_dt.day, evaluation_dt.month, evaluation_dt.year)
-    ql.Settings.instance().evaluationDate = today
+    set_evaluation_date(today)
     day_count = ql.Actual365Fixed()
     calendar = ql.UnitedStates(ql.UnitedStates.GovernmentBond)
 
@@ -39,7 +52,17 @@ def compare_bsm_and_heston(option_params: dict, heston_params: dict, evaluation_
     heston_model = ql.HestonModel(heston_process)
     heston_engine = ql.AnalyticHestonEngine(heston_model)
     option.setPricingEngine(heston_engine)
+    start = time.perf_counter()
     h_price = option.NPV()
+    analytic_ms = (time.perf_counter() - start) * 1000
+
+    # --- Fast path: Chebyshev proxy, or the vectorized analytic pricer outside its box ---
+    maturity = day_count.yearFraction(today, maturity_date)
+    start = time.perf_counter()
+    fast_prices, fast_engine, fast_bound = heston_call_prices_fast(
+        spot_price, [strike_price], maturity, risk_free_rate, dividend_rate, (theta, kappa, sigma, rho, v0)
+    )
+    fast_us = (time.perf_counter() - start) * 1e6
 
     # --- Black-Scholes-Merton Model Calculation ---
     volatility = option_params['volatility_pct'] / 100.0
@@ -49,8 +72,694 @@ def compare_bsm_and_heston(option_params: dict, heston_params: dict, evaluation_
     option.setPricingEngine(bsm_engine)
     bs_price = option.NPV()
 
+    # --- Whole grid with the COS engine ---
+    maturities = maturity * np.array([0.25, 0.5, 1.0, 2.0])
+    strikes = np.linspace(0.5 * spot_price, 1.5 * spot_price, 101)
+    grid_strikes = np.append(strikes, strike_price)
+    start = time.perf_counter()
+    grid = heston_and_bsm_price_grid(
+        spot_price, grid_strikes, maturities, risk_free_rate, dividend_rate,
+        (theta, kappa, sigma, rho, v0), volatility
+    )
+    grid_ms = (time.perf_counter() - start) * 1000
+
+    difference_curves = [
+        {
+            'label': f"T = {t:.2f}y" + (" (option maturity)" if i == 2 else ""),
+            'points': [{'x': k, 'y': d} for k, d in zip(strikes, grid['bsm'][i, :-1] - grid['heston'][i, :-1])]
+        }
+        for i, t in enumerate(maturities)
+    ]
+
     return {
         'heston_price': round(h_price, 4),
         'bsm_price': round(bs_price, 4),
-        'difference': round(bs_price - h_price, 4)
-    }
\ No newline at end of file
+        'difference': round(bs_price - h_price, 4),
+        'cos_heston_price': round(grid['heston'][2, -1], 4),
+        'cos_bsm_price': round(grid['bsm'][2, -1], 4),
+        'difference_curves': difference_curves,
+        'grid_size': f"{len(maturities)} maturities x {len(strikes)} strikes x 2 models",
+        'grid_ms': round(grid_ms, 2),
+        'analytic_ms': round(analytic_ms, 3),
+        'fast_price': round(fast_prices[0], 4),
+        'fast_engine': fast_engine,
+        'fast_error_bound': f"{fast_bound[0]:.4f}" if fast_bound is not None else 'N/A',
+        'fast_us': round(fast_us, 1),
+    }
+
+# --- Vectorized Heston pricer (characteristic function on a shared quadrature grid) ---
+
+# Order of the Heston parameters in every vector below (same as ql.HestonModel.params())
+HESTON_PARAM_NAMES = ('theta', 'kappa', 'sigma', 'rho', 'v0')
+# Gauss-Laguerre nodes: 128 nodes keep the error below 1e-6 against AnalyticHestonEngine
+# from one-month to multi-year maturities
+HESTON_QUADRATURE_NODES = 128
+
+
+@functools.lru_cache(maxsize=8)
+def heston_quadrature_grid(num_nodes: int = HESTON_QUADRATURE_NODES):
+    """
+    Gauss-Laguerre nodes and weights for integrals over [0, +inf); the weights already
+    include the e^x factor, so sum(w * f(x)) approximates the integral of f.
+    """
+    nodes, weights = np.polynomial.laguerre.laggauss(num_nodes)
+    return nodes, weights * np.exp(nodes)
+
+
+def _heston_char_function(u, maturities, params, gradient: bool):
+    """
+    Characteristic function of ln(S_T / F_T) under Heston ("little trap" form of Albrecher et
+    al.), for complex arguments u (shape (N,)) and maturities (shape (M, 1)).
+
+    With gradient=True, also returns its derivatives with respect to the five parameters,
+    obtained by differentiating the closed form (shape (5, M, N)).
+    """
+    theta, kappa, sigma, rho, v0 = params
+    iu = 1j * u
+    xi = kappa - sigma * rho * iu
+    a = u * u + iu
+    d = np.sqrt(xi * xi + sigma * sigma * a)
+    g = (xi - d) / (xi + d)
+    e = np.exp(-d * maturities)
+    one_minus_ge = 1.0 - g * e
+    log_term = np.log(one_minus_ge / (1.0 - g))
+    b = (xi - d) * maturities - 2.0 * log_term
+    h = (1.0 - e) / one_minus_ge
+    c_term = kappa * theta / sigma**2 * b
+    d_term = (xi - d) / sigma**2 * h
+    phi = np.exp(c_term + d_term * v0)
+    if not gradient:
+        return phi, None
+
+    # d(exponent)/d(parameter) for kappa, sigma and rho go through xi, d, g, e
+    exponent_derivatives = {}
+    xi_derivatives = {'kappa': 1.0, 'sigma': -rho * iu, 'rho': -sigma * iu}
+    for name, xi_p in xi_derivatives.items():
+        d_p = (xi * xi_p + (sigma * a if name == 'sigma' else 0.0)) / d
+        g_p = 2.0 * (d * xi_p - xi * d_p) / (xi + d)**2
+        e_p = -maturities * d_p * e
+        log_term_p = -(g_p * e + g * e_p) / one_minus_ge + g_p / (1.0 - g)
+        b_p = (xi_p - d_p) * maturities - 2.0 * log_term_p
+        h_p = (-e_p * one_minus_ge + (1.0 - e) * (g_p * e + g * e_p)) / one_minus_ge**2
+        c_p = kappa * theta / sigma**2 * b_p
+        d_term_p = (xi_p - d_p) / sigma**2 * h + (xi - d) / sigma**2 * h_p
+        if name == 'kappa':
+            c_p = c_p + theta / sigma**2 * b
+        if name == 'sigma':
+            c_p = c_p - 2.0 * c_term / sigma
+            d_term_p = d_term_p - 2.0 * d_term / sigma
+        exponent_derivatives[name] = c_p + d_term_p * v0
+    exponent_derivatives['theta'] = kappa / sigma**2 * b
+    exponent_derivatives['v0'] = d_term
+
+    grad = np.stack([exponent_derivatives[name] * phi for name in HESTON_PARAM_NAMES])
+    return phi, grad
+
+
+def heston_call_prices_batch(spot: float, strikes, maturities, risk_free_rate: float, dividend_rate: float,
+                             params, gradient: bool = False, num_nodes: int = HESTON_QUADRATURE_NODES):
+    """
+    Prices European calls under Heston for any set of (strike, maturity) pairs at once.
+
+    Uses Lewis' single-integral formula
+        C = S e^{-qT} - sqrt(S K) e^{-(r+q)T/2} / pi * int_0^inf Re[e^{iuk} phi(u - i/2)] / (u^2 + 1/4) du
+    with k = ln(F/K). The characteristic function is evaluated once per distinct maturity on
+    one shared Gauss-Laguerre grid, and all strikes of that maturity reuse it.
+
+    Args:
+        spot (float): Spot price.
+        strikes, maturities: Arrays of the same length (maturities in years).
+        risk_free_rate, dividend_rate (float): Continuously compounded rates as decimals.
+        params: (theta, kappa, sigma, rho, v0), the order of HESTON_PARAM_NAMES.
+        gradient (bool): Also return the derivatives of the prices w.r.t. the parameters.
+
+    Returns:
+        np.ndarray: Call prices; with gradient=True, a tuple (prices, jacobian) where the
+        jacobian has shape (len(strikes), 5).
+    """
+    strikes = np.asarray(strikes, dtype=float)
+    maturities = np.broadcast_to(np.asarray(maturities, dtype=float), strikes.shape)
+    nodes, weights = heston_quadrature_grid(num_nodes)
+
+    unique_maturities, maturity_index = np.unique(maturities, return_inverse=True)
+    phi, grad = _heston_char_function(nodes - 0.5j, unique_maturities[:, None], params, gradient)
+
+    # e^{iuk} = e^{iu ln F} e^{-iu ln K}: the complex exponentials are computed once per distinct
+    # maturity and once per distinct strike, not once per quote
+    unique_strikes, strike_index = np.unique(strikes, return_inverse=True)
+    strike_factors = np.exp(-1j * np.outer(np.log(unique_strikes), nodes))
+    log_forwards = np.log(spot) + (risk_free_rate - dividend_rate) * unique_maturities
+    maturity_factors = np.exp(1j * np.outer(log_forwards, nodes)) * (weights / (nodes * nodes + 0.25))
+    prefactor = np.sqrt(spot * strikes) * np.exp(-0.5 * (risk_free_rate + dividend_rate) * maturities) / np.pi
+
+    # The quadrature is then one complex matrix product per maturity: (strikes x nodes) @ nodes
+    integral = np.empty(len(strikes))
+    jacobian = np.empty((len(strikes), 5)) if gradient else None
+    for m in range(len(unique_maturities)):
+        rows = np.flatnonzero(maturity_index == m)
+        kernel = strike_factors[strike_index[rows]]
+        integral[rows] = np.real(kernel @ (maturity_factors[m] * phi[m]))
+        if gradient:
+            jacobian[rows] = np.real(kernel @ (maturity_factors[m] * grad[:, m]).T)
+
+    prices = spot * np.exp(-dividend_rate * maturities) - prefactor * integral
+    if not gradient:
+        return prices
+    return prices, -prefactor[:, None] * jacobian
+
+
+# --- COS engine: Heston and BSM prices over a strike x maturity grid ---
+
+# Half-width of the truncation range in units of sqrt(c2 + sqrt(c4)) (Fang & Oosterlee)
+COS_TRUNCATION_WIDTH = 10
+# The number of cosine terms is doubled until |phi| at the last frequency is below the tolerance
+COS_MIN_TERMS = 128
+COS_MAX_TERMS = 4096
+COS_CHAR_FUNCTION_TOLERANCE = 1.0e-8
+
+
+def _bsm_char_function(u, maturity: float, volatility: float):
+    """Characteristic function of ln(S_T / F_T) under Black-Scholes."""
+    return np.exp(-0.5 * volatility**2 * maturity * (u * u + 1j * u))
+
+
+def _cumulants(char_function, step: float = 0.05):
+    """c1, c2 and c4 of ln(S_T / F_T) by finite differences of the cumulant generating function."""
+    s = np.array([-2, -1, 0, 1, 2]) * step
+    k = np.real(np.log(char_function(-1j * s)))
+    c1 = (k[3] - k[1]) / (2 * step)
+    c2 = (k[3] - 2 * k[2] + k[1]) / step**2
+    c4 = (k[4] - 4 * k[3] + 6 * k[2] - 4 * k[1] + k[0]) / step**4
+    return c1, c2, c4
+
+
+def _cos_call_prices(char_functions, spot, strikes, maturity, risk_free_rate, dividend_rate):
+    """
+    COS method of Fang & Oosterlee for one maturity: every strike is priced from the same
+    cosine expansion of the density of ln(S_T / F_T). Puts are expanded (their payoff is
+    bounded) and calls follow by put-call parity.
+
+    Several models can be priced together: they share the truncation range, the number of
+    terms and the matrix of Fourier factors, so each extra model only costs one
+    matrix-vector product.
+
+    Returns:
+        tuple: (list of call price arrays, one per characteristic function; number of cosine terms).
+    """
+    forward = spot * np.exp((risk_free_rate - dividend_rate) * maturity)
+    log_moneyness = np.log(forward / strikes)
+    # One range [a, b] for ln(S_T / K) that covers every strike of the grid and every model
+    a, b = np.inf, -np.inf
+    for char_function in char_functions:
+        c1, c2, c4 = _cumulants(char_function)
+        half_width = COS_TRUNCATION_WIDTH * np.sqrt(abs(c2) + np.sqrt(abs(c4)))
+        a = min(a, log_moneyness.min() + c1 - half_width)
+        b = max(b, log_moneyness.max() + c1 + half_width)
+
+    num_terms = COS_MIN_TERMS
+    while num_terms < COS_MAX_TERMS and max(
+        abs(char_function(np.array([num_terms * np.pi / (b - a)]))[0]) for char_function in char_functions
+    ) > COS_CHAR_FUNCTION_TOLERANCE:
+        num_terms *= 2
+
+    k = np.arange(num_terms)
+    u = k * np.pi / (b - a)
+    # Put payoff coefficients on [a, 0]: (2 / (b - a)) * (psi_k(a, 0) - chi_k(a, 0)), per unit of strike
+    chi = (np.cos(-u * a) - np.exp(a) + u * np.sin(-u * a)) / (1.0 + u * u)
+    psi = np.empty(num_terms)
+    psi[0] = -a
+    psi[1:] = np.sin(-u[1:] * a) / u[1:]
+    coefficients = 2.0 / (b - a) * (psi - chi)
+    coefficients[0] *= 0.5
+
+    fourier_factors = np.exp(1j * np.outer(log_moneyness - a, u))
+    discounted_strikes = strikes * np.exp(-risk_free_rate * maturity)
+    parity = spot * np.exp(-dividend_rate * maturity) - discounted_strikes
+    calls = [
+        discounted_strikes * np.real(fourier_factors @ (char_function(u) * coefficients)) + parity
+        for char_function in char_functions
+    ]
+    return calls, num_terms
+
+
+def heston_and_bsm_price_grid(spot: float, strikes, maturities, risk_free_rate: float, dividend_rate: float,
+                              heston_params, bsm_volatility: float) -> dict:
+    """
+    Prices European calls under Heston and Black-Scholes over a full strike x maturity grid
+    with the COS method: one cosine expansion per maturity prices every strike of both models.
+
+    Args:
+        spot (float): Spot price.
+        strikes: Array of strikes; maturities: array of maturities in years.
+        risk_free_rate, dividend_rate (float): Continuously compounded rates as decimals.
+        heston_params: (theta, kappa, sigma, rho, v0), the order of HESTON_PARAM_NAMES.
+        bsm_volatility (float): Black-Scholes volatility as a decimal.
+
+    Returns:
+        dict: 'heston' and 'bsm' price arrays of shape (len(maturities), len(strikes)) and
+        'num_terms', the number of cosine terms used for each maturity.
+    """
+    strikes = np.asarray(strikes, dtype=float)
+    maturities = np.atleast_1d(np.asarray(maturities, dtype=float))
+    heston = np.empty((len(maturities), len(strikes)))
+    bsm = np.empty_like(heston)
+    num_terms = []
+
+    for i, maturity in enumerate(maturities):
+        heston_cf = lambda u, t=maturity: _heston_char_function(np.atleast_1d(u), np.array([[t]]), heston_params, False)[0][0]
+        bsm_cf = lambda u, t=maturity: _bsm_char_function(u, t, bsm_volatility)
+        (heston[i], bsm[i]), terms = _cos_call_prices([heston_cf, bsm_cf], spot, strikes, maturity, risk_free_rate, dividend_rate)
+        num_terms.append(terms)
+
+    return {'heston': heston, 'bsm': bsm, 'num_terms': num_terms}
+
+
+# --- Monte Carlo: Andersen's quadratic-exponential (QE) scheme ---
+
+# Switching level of Andersen's scheme between the quadratic and exponential variance draws
+QE_PSI_CRITICAL = 1.5
+# Weights of V(t) and V(t + dt) in the integrated variance (central discretization)
+QE_GAMMA_1 = 0.5
+QE_GAMMA_2 = 0.5
+
+
+def simulate_heston_paths(spot: float, risk_free_rate: float, dividend_rate: float, params,
+                          maturity: float, num_steps: int, num_paths: int, seed: int = 42,
+                          antithetic: bool = True):
+    """
+    Simulates Heston spot paths with Andersen's QE scheme, vectorized over the paths.
+
+    The variance is drawn from a moment-matched quadratic (psi <= 1.5) or exponential
+    (psi > 1.5) law, so it never goes negative and stays accurate with few steps. The
+    log-spot step uses Andersen's martingale correction, so E[S_t] = F_t holds exactly in the
+    discretized model; where the correction is not defined (very large steps), the
+    uncorrected drift is used for those paths.
+
+    Args:
+        spot (float): Spot price.
+        risk_free_rate, dividend_rate (float): Continuously compounded rates as decimals.
+        params: (theta, kappa, sigma, rho, v0), the order of HESTON_PARAM_NAMES.
+        maturity (float): Horizon in years, split in num_steps equal steps.
+        num_paths (int): Number of paths (rounded up to an even number with antithetic=True).
+        seed (int): Seed of the NumPy random generator.
+        antithetic (bool): The second half of the paths uses the opposite normal draws.
+
+    Returns:
+        np.ndarray: Spot paths of shape (num_paths, num_steps + 1), the first column being spot.
+    """
+    theta, kappa, sigma, rho, v0 = params
+    dt = maturity / num_steps
+    rng = np.random.default_rng(seed)
+    half = (num_paths + 1) // 2 if antithetic else num_paths
+    num_paths = 2 * half if antithetic else num_paths
+
+    exp_kdt = np.exp(-kappa * dt)
+    # (1 - e^{-kappa dt}) / kappa, which tends to dt when kappa -> 0
+    decay_over_kappa = -np.expm1(-kappa * dt) / kappa if kappa > 0 else dt
+    # Conditional variance of V(t + dt): s2 = V(t) * s2_v + s2_c
+    s2_v = sigma**2 * exp_kdt * decay_over_kappa
+    s2_c = 0.5 * theta * sigma**2 * (1.0 - exp_kdt) * decay_over_kappa
+    k0 = -rho * kappa * theta / sigma * dt
+    k1 = QE_GAMMA_1 * dt * (kappa * rho / sigma - 0.5) - rho / sigma
+    k2 = QE_GAMMA_2 * dt * (kappa * rho / sigma - 0.5) + rho / sigma
+    k3 = QE_GAMMA_1 * dt * (1.0 - rho**2)
+    k4 = QE_GAMMA_2 * dt * (1.0 - rho**2)
+    a_coef = k2 + 0.5 * k4
+
+    # Time-major storage: each step writes one contiguous row
+    log_paths = np.empty((num_steps + 1, num_paths))
+    log_paths[0] = np.log(spot)
+    variance = np.full(num_paths, float(v0))
+    drift_rate = (risk_free_rate - dividend_rate) * dt
+
+    for step in range(num_steps):
+        z = rng.standard_normal((2, half))
+        if antithetic:
+            z = np.concatenate([z, -z], axis=1)
+        z_v, z_s = z
+
+        m = theta + (variance - theta) * exp_kdt
+        psi = (variance * s2_v + s2_c) / (m * m)
+
+        # Quadratic branch: V = a (b + Z)^2, evaluated on every path with psi capped at its domain
+        inv_psi = 2.0 / np.minimum(psi, QE_PSI_CRITICAL)
+        b2 = inv_psi - 1.0 + np.sqrt(inv_psi * (inv_psi - 1.0))
+        a = m / (1.0 + b2)
+        one_minus = 1.0 - 2.0 * a_coef * a
+        # ln M = ln E[exp(A V(t + dt))]; not finite where the moment does not exist
+        with np.errstate(invalid='ignore', divide='ignore'):
+            log_m = a_coef * b2 * a / one_minus - 0.5 * np.log(one_minus)
+        next_variance = a * (np.sqrt(b2) + z_v)**2
+
+        # Exponential branch (few paths): V = 0 with probability p, exponential tail otherwise
+        exponential = np.flatnonzero(psi > QE_PSI_CRITICAL)
+        if exponential.size:
+            psi_e = psi[exponential]
+            p = (psi_e - 1.0) / (psi_e + 1.0)
+            beta = (1.0 - p) / m[exponential]
+            u = ndtr(z_v[exponential])
+            next_variance[exponential] = np.log(np.maximum((1.0 - p) / np.maximum(1.0 - u, 1e-300), 1.0)) / beta
+            with np.errstate(invalid='ignore', divide='ignore'):
+                log_m[exponential] = np.log(p + beta * (1.0 - p) / (beta - a_coef))
+                log_m[exponential[beta <= a_coef]] = np.nan
+
+        # Martingale correction of the drift: K0* = -ln M - (K1 + K3 / 2) V(t), plus K1 V(t)
+        drift = -log_m - 0.5 * k3 * variance
+        uncorrected = ~np.isfinite(drift)
+        if uncorrected.any():
+            drift[uncorrected] = k0 + k1 * variance[uncorrected]
+        log_paths[step + 1] = (
+            log_paths[step] + drift_rate + drift + k2 * next_variance
+            + np.sqrt(k3 * variance + k4 * next_variance) * z_s
+        )
+        variance = next_variance
+
+    return np.exp(log_paths.T)
+
+
+def _average_call(paths, strike, barrier):
+    return np.maximum(paths[:, 1:].mean(axis=1) - strike, 0.0)
+
+
+def _up_and_out_call(paths, strike, barrier):
+    return np.where(paths.max(axis=1) < barrier, np.maximum(paths[:, -1] - strike, 0.0), 0.0)
+
+
+def _floating_lookback_call(paths, strike, barrier):
+    return paths[:, -1] - paths.min(axis=1)
+
+
+# Payoffs on the simulated spot paths (num_paths, num_steps + 1), undiscounted
+HESTON_MC_PAYOFFS = {
+    'european_call': ('European Call', lambda paths, strike, barrier: np.maximum(paths[:, -1] - strike, 0.0)),
+    'european_put': ('European Put', lambda paths, strike, barrier: np.maximum(strike - paths[:, -1], 0.0)),
+    'asian_call': ('Arithmetic Asian Call', _average_call),
+    'up_and_out_call': ('Up-and-Out Call (discrete monitoring)', _up_and_out_call),
+    'lookback_call': ('Floating-Strike Lookback Call', _floating_lookback_call),
+}
+
+
+def _mc_estimate(discounted_payoffs, antithetic: bool):
+    """Mean and standard error; antithetic pairs are averaged first, as they are not independent."""
+    if antithetic:
+        half = len(discounted_payoffs) // 2
+        discounted_payoffs = 0.5 * (discounted_payoffs[:half] + discounted_payoffs[half:])
+    return discounted_payoffs.mean(), discounted_payoffs.std(ddof=1) / np.sqrt(len(discounted_payoffs))
+
+
+@isolated_evaluation_date
+def price_heston_monte_carlo(option_params: dict, heston_params: dict, mc_params: dict, evaluation_dt: date):
+    """
+    Prices a European or path-dependent option under Heston by Monte Carlo (QE scheme).
+
+    The European call of the same strike is priced on the same paths and compared with
+    AnalyticHestonEngine, which validates the discretization: its error should stay within
+    a few standard errors.
+
+    Args:
+        option_params (dict): maturity_dt, spot_price, strike_price, dividend_rate_pct,
+            risk_free_rate_pct.
+        heston_params (dict): v0, kappa, theta, sigma, rho.
+        mc_params (dict): payoff (a key of HESTON_MC_PAYOFFS), barrier, num_paths,
+            num_steps, seed, antithetic.
+        evaluation_dt (date): The evaluation date.
+
+    Returns:
+        dict: Price, standard error and 95% interval of the payoff, the validation of the
+        European call against the analytic engine, and the timings.
+    """
+    today = ql.Date(evaluation_dt.day, evaluation_dt.month, evaluation_dt.year)
+    set_evaluation_date(today)
+    day_count = ql.Actual365Fixed()
+
+    maturity_dt = option_params['maturity_dt']
+    maturity_date = ql.Date(maturity_dt.day, maturity_dt.month, maturity_dt.year)
+    maturity = day_count.yearFraction(today, maturity_date)
+    spot_price = option_params['spot_price']
+    strike_price = option_params['strike_price']
+    dividend_rate = option_params['dividend_rate_pct'] / 100.0
+    risk_free_rate = option_params['risk_free_rate_pct'] / 100.0
+    v0, kappa, theta, sigma, rho = (heston_params[name] for name in ('v0', 'kappa', 'theta', 'sigma', 'rho'))
+
+    # Reference: analytic European call
+    option = ql.VanillaOption(ql.PlainVanillaPayoff(ql.Option.Call, strike_price), ql.EuropeanExercise(maturity_date))
+    heston_process = ql.HestonProcess(
+        ql.YieldTermStructureHandle(ql.FlatForward(today, risk_free_rate, day_count)),
+        ql.YieldTermStructureHandle(ql.FlatForward(today, dividend_rate, day_count)),
+        ql.QuoteHandle(ql.SimpleQuote(spot_price)), v0, kappa, theta, sigma, rho
+    )
+    option.setPricingEngine(ql.AnalyticHestonEngine(ql.HestonModel(heston_process)))
+    analytic_call = option.NPV()
+
+    antithetic = mc_params['antithetic']
+    start = time.perf_counter()
+    paths = simulate_heston_paths(
+        spot_price, risk_free_rate, dividend_rate, (theta, kappa, sigma, rho, v0), maturity,
+        mc_params['num_steps'], mc_params['num_paths'], mc_params['seed'], antithetic
+    )
+    simulation_ms = (time.perf_counter() - start) * 1000
+
+    discount = np.exp(-risk_free_rate * maturity)
+    payoff_label, payoff = HESTON_MC_PAYOFFS[mc_params['payoff']]
+    price, std_error = _mc_estimate(discount * payoff(paths, strike_price, mc_params['barrier']), antithetic)
+    call_price, call_std_error = _mc_estimate(discount * np.maximum(paths[:, -1] - strike_price, 0.0), antithetic)
+    forward_error = np.mean(paths[:, -1]) / (spot_price * np.exp((risk_free_rate - dividend_rate) * maturity)) - 1.0
+    total_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        'payoff': payoff_label,
+        'price': np.round(price, 4),
+        'std_error': np.round(std_error, 4),
+        'confidence_interval': f"[{price - 1.96 * std_error:.4f}, {price + 1.96 * std_error:.4f}]",
+        'validation': {
+            'mc_call': np.round(call_price, 4),
+            'mc_call_std_error': np.round(call_std_error, 4),
+            'analytic_call': np.round(analytic_call, 4),
+            'error': np.round(call_price - analytic_call, 4),
+            'error_in_std_errors': np.round((call_price - analytic_call) / call_std_error, 2),
+            'forward_error': f"{forward_error:.2e}",
+        },
+        'num_paths': paths.shape[0],
+        'num_steps': paths.shape[1] - 1,
+        'simulation_ms': np.round(simulation_ms, 1),
+        'total_ms': np.round(total_ms, 1),
+    }
+
+
+# --- Chebyshev proxy: Heston prices precomputed on a tensor grid, for instant repricing ---
+
+# Axes of the proxy: (name, lower, upper, change of variable, number of Chebyshev nodes).
+# The nodes are placed in the transformed variable, where the price is smoother (log of
+# moneyness and kappa, square root of maturity and variances). The parameter axes come first:
+# they are contracted first, which leaves a small moneyness x maturity table for the strikes.
+HESTON_PROXY_AXES = (
+    ('theta', 0.01, 0.25, 'sqrt', 6),
+    ('kappa', 0.05, 5.0, 'log', 8),
+    ('sigma', 0.05, 1.0, 'linear', 6),
+    ('rho', -0.95, 0.25, 'linear', 6),
+    ('v0', 0.01, 0.25, 'sqrt', 6),
+    ('moneyness', 0.8, 1.25, 'log', 12),
+    ('maturity', 0.1, 2.0, 'sqrt', 8),
+)
+# Relative truncation error of the tensor-train compression of the coefficients
+HESTON_PROXY_TT_TOLERANCE = 1.0e-4
+HESTON_PROXY_VALIDATION_POINTS = 2000
+# The error bound is the largest error measured on the validation points times this factor
+HESTON_PROXY_SAFETY_FACTOR = 2.0
+# The fast path keeps the proxy prices only when the error bound is within this fraction of
+# every price (the bound is absolute: it would swamp cheap out-of-the-money or short options)
+HESTON_PROXY_MAX_RELATIVE_ERROR = 0.02
+
+_PROXY_TRANSFORMS = {'linear': lambda x: x, 'log': np.log, 'sqrt': np.sqrt}
+_PROXY_INVERSES = {'linear': lambda x: x, 'log': np.exp, 'sqrt': np.square}
+_heston_proxy = None
+
+
+def _proxy_coordinates(axis, values):
+    """Maps values of a proxy axis onto [-1, 1] (NaN outside the box of the proxy)."""
+    _, lower, upper, transform, _ = axis
+    values = np.asarray(values, dtype=float)
+    f = _PROXY_TRANSFORMS[transform]
+    lo, hi = f(lower), f(upper)
+    inside = (values >= lower) & (values <= upper)
+    return np.where(inside, (2.0 * f(np.where(inside, values, lower)) - lo - hi) / (hi - lo), np.nan)
+
+
+def _proxy_nodes(axis):
+    """Chebyshev nodes of the first kind of a proxy axis, in the original variable."""
+    _, lower, upper, transform, num_nodes = axis
+    x = np.cos(np.pi * (np.arange(num_nodes) + 0.5) / num_nodes)
+    lo, hi = _PROXY_TRANSFORMS[transform](lower), _PROXY_TRANSFORMS[transform](upper)
+    return _PROXY_INVERSES[transform](lo + (x + 1.0) * (hi - lo) / 2.0)
+
+
+def _tensor_train(tensor, tolerance: float) -> list:
+    """
+    Tensor-train decomposition (TT-SVD, Oseledets 2011): tensor[i1, ..., id] is approximated by
+    the product of the matrices cores[k][:, ik, :], within a relative Frobenius error tolerance.
+    """
+    shape = tensor.shape
+    threshold = tolerance * np.linalg.norm(tensor) / np.sqrt(len(shape) - 1)
+    cores, rank, remainder = [], 1, tensor
+    for size in shape[:-1]:
+        u, s, vt = np.linalg.svd(remainder.reshape(rank * size, -1), full_matrices=False)
+        # Smallest rank whose discarded singular values stay below the threshold
+        discarded = np.sqrt(np.cumsum(s[::-1]**2))[::-1]
+        new_rank = max(1, int(np.sum(discarded > threshold)))
+        cores.append(u[:, :new_rank].reshape(rank, size, new_rank))
+        remainder, rank = s[:new_rank, None] * vt[:new_rank], new_rank
+    cores.append(remainder.reshape(rank, shape[-1], 1))
+    return cores
+
+
+def _chebyshev_polynomials(coordinates, num_nodes: int):
+    """T_0 .. T_{n-1} at coordinates in [-1, 1], as T_k(cos t) = cos(k t) (shape (len, n))."""
+    return np.cos(np.outer(np.arccos(coordinates), np.arange(num_nodes)))
+
+
+def _evaluate_proxy(cores, coordinates):
+    """
+    Normalized call prices C / (S e^{-qT}) from the tensor-train cores of the Chebyshev
+    coefficients, for one parameter set and arrays of moneyness K/F and maturities, given by
+    their coordinates in [-1, 1] (the order of HESTON_PROXY_AXES). Costs a few small matrix
+    products, whatever the size of the grid.
+    """
+    vector = np.ones(1)
+    for axis, core, x in zip(HESTON_PROXY_AXES[:5], cores[:5], coordinates[:5]):
+        matrix = (vector @ core.reshape(core.shape[0], -1)).reshape(core.shape[1:])
+        vector = _chebyshev_polynomials(np.atleast_1d(x), axis[4])[0] @ matrix
+    moneyness_core, maturity_core = cores[5:]
+    moneyness_factors = _chebyshev_polynomials(coordinates[5], HESTON_PROXY_AXES[5][4]) @ (
+        (vector @ moneyness_core.reshape(moneyness_core.shape[0], -1)).reshape(moneyness_core.shape[1:])
+    )
+    maturity_factors = _chebyshev_polynomials(coordinates[6], HESTON_PROXY_AXES[6][4]) @ maturity_core[:, :, 0].T
+    return np.sum(moneyness_factors * maturity_factors, axis=1)
+
+
+def build_heston_proxy(path, seed: int = 1) -> dict:
+    """
+    Builds the Chebyshev proxy offline and saves it to path (.npy, with its metadata in a .json
+    file next to it); see the build_heston_proxy management command.
+
+    The normalized price C / (S e^{-qT}) depends only on the moneyness K/F, the maturity and
+    the five Heston parameters, so the rates need no axis. It is computed with
+    heston_call_prices_batch at every node of the tensor grid; the coefficients come from one
+    discrete cosine transform per axis and are compressed into a tensor train. The error bound
+    is measured against the analytic pricer on random points of the box.
+
+    Returns:
+        dict: The metadata (axes, ranks, error bound, validation errors, build time).
+    """
+    from scipy.fft import dct
+
+    start = time.perf_counter()
+    nodes = [_proxy_nodes(axis) for axis in HESTON_PROXY_AXES]
+    moneyness, maturities = (grid.ravel() for grid in np.meshgrid(nodes[5], nodes[6], indexing='ij'))
+    values = np.empty([axis[4] for axis in HESTON_PROXY_AXES])
+    for index in np.ndindex(*values.shape[:5]):
+        params = tuple(nodes[i][j] for i, j in enumerate(index))
+        values[index] = heston_call_prices_batch(1.0, moneyness, maturities, 0.0, 0.0, params).reshape(values.shape[5:])
+
+    coefficients = values
+    for axis_index in range(coefficients.ndim):
+        coefficients = dct(coefficients, type=2, axis=axis_index) / coefficients.shape[axis_index]
+        np.moveaxis(coefficients, axis_index, 0)[0] *= 0.5
+    cores = _tensor_train(coefficients, HESTON_PROXY_TT_TOLERANCE)
+    build_seconds = time.perf_counter() - start
+
+    # Validation on random points of the box, against the analytic pricer
+    rng = np.random.default_rng(seed)
+    points = np.column_stack([rng.uniform(lower, upper, HESTON_PROXY_VALIDATION_POINTS) for _, lower, upper, _, _ in HESTON_PROXY_AXES])
+    errors = np.array([
+        _evaluate_proxy(cores, [_proxy_coordinates(axis, value) for axis, value in zip(HESTON_PROXY_AXES, point)])[0]
+        - heston_call_prices_batch(1.0, point[5:6], point[6:7], 0.0, 0.0, tuple(point[:5]))[0]
+        for point in points
+    ])
+
+    metadata = {
+        'axes': [list(axis) for axis in HESTON_PROXY_AXES],
+        'ranks': [core.shape[2] for core in cores[:-1]],
+        'error_bound': HESTON_PROXY_SAFETY_FACTOR * float(np.max(np.abs(errors))),
+        'max_validation_error': float(np.max(np.abs(errors))),
+        'mean_validation_error': float(np.mean(np.abs(errors))),
+        'validation_points': HESTON_PROXY_VALIDATION_POINTS,
+        'grid_size': int(values.size),
+        'build_seconds': round(build_seconds, 2),
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # The cores are stored end to end in one array, so the file can be memory-mapped
+    np.save(path, np.concatenate([core.ravel() for core in cores]))
+    path.with_suffix('.json').write_text(json.dumps(metadata, indent=2))
+    return metadata
+
+
+def load_heston_proxy(path=None):
+    """
+    Memory-maps the proxy table built by build_heston_proxy (called once at startup by the
+    app config). Returns None when no table was built, or when it does not match the current
+    HESTON_PROXY_AXES (the pricers then use the analytic engine until it is rebuilt).
+    """
+    global _heston_proxy
+    path = Path(path or settings.QL_HESTON_PROXY_PATH)
+    _heston_proxy = None
+    try:
+        metadata = json.loads(path.with_suffix('.json').read_text())
+        flat_cores = np.load(path, mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+    if metadata.get('axes') != [list(axis) for axis in HESTON_PROXY_AXES] or 'ranks' not in metadata:
+        return None
+
+    ranks = [1] + metadata['ranks'] + [1]
+    shapes = [(ranks[k], axis[4], ranks[k + 1]) for k, axis in enumerate(HESTON_PROXY_AXES)]
+    offsets = np.cumsum([0] + [int(np.prod(shape)) for shape in shapes])
+    if offsets[-1] != flat_cores.size:
+        return None
+    cores = [np.asarray(flat_cores[offsets[k]:offsets[k + 1]]).reshape(shape) for k, shape in enumerate(shapes)]
+    _heston_proxy = {'cores': cores, **metadata}
+    return _heston_proxy
+
+
+def heston_proxy_call_prices(spot: float, strikes, maturities, risk_free_rate: float, dividend_rate: float, params):
+    """
+    Heston call prices from the Chebyshev proxy (same arguments as heston_call_prices_batch).
+
+    Returns:
+        tuple: (prices, error_bound) where error_bound is the estimated error of each price in
+        currency units, or None when no proxy is loaded or a quote or parameter is outside
+        its box (the caller then falls back to the analytic pricer). The bound is an
+        a-posteriori estimate, HESTON_PROXY_SAFETY_FACTOR times the largest error measured
+        on the validation points of build_heston_proxy, not a guaranteed bound.
+    """
+    proxy = _heston_proxy
+    if proxy is None:
+        return None
+    strikes = np.asarray(strikes, dtype=float)
+    maturities = np.broadcast_to(np.asarray(maturities, dtype=float), strikes.shape)
+    moneyness = strikes / (spot * np.exp((risk_free_rate - dividend_rate) * maturities))
+    coordinates = [_proxy_coordinates(axis, value) for axis, value in zip(HESTON_PROXY_AXES, (*params, moneyness, maturities))]
+    if not all(np.all(np.isfinite(x)) for x in coordinates):
+        return None
+
+    forward_value = spot * np.exp(-dividend_rate * maturities)
+    prices = forward_value * _evaluate_proxy(proxy['cores'], coordinates)
+    return prices, forward_value * proxy['error_bound']
+
+
+def heston_call_prices_fast(spot: float, strikes, maturities, risk_free_rate: float, dividend_rate: float, params):
+    """
+    Fast-path Heston pricer: the Chebyshev proxy when it covers the request and its error
+    bound stays within HESTON_PROXY_MAX_RELATIVE_ERROR of every price, otherwise the
+    analytic pricer (heston_call_prices_batch).
+
+    Returns:
+        tuple: (prices, engine name, error bound in currency units or None for the analytic pricer).
+    """
+    proxy_result = heston_proxy_call_prices(spot, strikes, maturities, risk_free_rate, dividend_rate, params)
+    if proxy_result is not None:
+        prices, error_bound = proxy_result
+        if np.all(error_bound <= HESTON_PROXY_MAX_RELATIVE_ERROR * np.abs(prices)):
+            return prices, 'Chebyshev proxy', error_bound
+    prices = heston_call_prices_batch(spot, strikes, maturities, risk_free_rate, dividend_rate, params)
+    return prices, 'Analytic (Lewis)', None
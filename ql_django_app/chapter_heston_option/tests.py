@@ -1,3 +1,61 @@
-from django.test import TestCase
+import QuantLib as ql
+import numpy as np
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
+from .services import heston_call_prices_batch
+
+TODAY = ql.Date(8, 5, 2015)
+SPOT, RISK_FREE_RATE, DIVIDEND_RATE = 100.0, 0.02, 0.01
+
+
+@isolated_evaluation_date
+def analytic_heston_call_prices(strikes, maturity_days, params):
+    """Reference prices, one option at a time, with ql.AnalyticHestonEngine."""
+    set_evaluation_date(TODAY)
+    theta, kappa, sigma, rho, v0 = params
+    day_count = ql.Actual365Fixed()
+    process = ql.HestonProcess(
+        ql.YieldTermStructureHandle(ql.FlatForward(TODAY, RISK_FREE_RATE, day_count)),
+        ql.YieldTermStructureHandle(ql.FlatForward(TODAY, DIVIDEND_RATE, day_count)),
+        ql.QuoteHandle(ql.SimpleQuote(SPOT)), v0, kappa, theta, sigma, rho
+    )
+    engine = ql.AnalyticHestonEngine(ql.HestonModel(process))
+    prices = []
+    for strike, days in zip(strikes, maturity_days):
+        option = ql.VanillaOption(ql.PlainVanillaPayoff(ql.Option.Call, float(strike)),
+                                  ql.EuropeanExercise(TODAY + ql.Period(int(days), ql.Days)))
+        option.setPricingEngine(engine)
+        prices.append(option.NPV())
+    return np.array(prices)
+
+
+class BatchHestonPricerTests(SimpleTestCase):
+    """heston_call_prices_batch matches QuantLib's AnalyticHestonEngine."""
+
+    STRIKES = np.array([60.0, 80.0, 95.0, 100.0, 105.0, 120.0, 150.0])
+    MATURITY_DAYS = np.array([30, 182, 365, 730, 1825])
+    PARAMS = [
+        (0.04, 1.5, 0.3, -0.7, 0.04),
+        (0.09, 0.5, 0.8, -0.3, 0.02),
+        (0.02, 4.0, 0.2, 0.2, 0.06),
+    ]
+
+    def test_prices_match_analytic_engine(self):
+        strikes, days = (grid.ravel() for grid in np.meshgrid(self.STRIKES, self.MATURITY_DAYS))
+        for params in self.PARAMS:
+            with self.subTest(params=params):
+                prices = heston_call_prices_batch(SPOT, strikes, days / 365.0, RISK_FREE_RATE, DIVIDEND_RATE, params)
+                np.testing.assert_allclose(prices, analytic_heston_call_prices(strikes, days, params), atol=1e-6)
+
+    def test_gradient_matches_finite_differences(self):
+        strikes, maturities = self.STRIKES, np.full(len(self.STRIKES), 1.0)
+        params = np.array(self.PARAMS[0])
+        _, jacobian = heston_call_prices_batch(SPOT, strikes, maturities, RISK_FREE_RATE, DIVIDEND_RATE, params, gradient=True)
+        for i in range(5):
+            bump = np.zeros(5)
+            bump[i] = 1e-6
+            up = heston_call_prices_batch(SPOT, strikes, maturities, RISK_FREE_RATE, DIVIDEND_RATE, params + bump)
+            down = heston_call_prices_batch(SPOT, strikes, maturities, RISK_FREE_RATE, DIVIDEND_RATE, params - bump)
+            with self.subTest(parameter=i):
+                np.testing.assert_allclose(jacobian[:, i], (up - down) / 2e-6, rtol=1e-5, atol=1e-6)
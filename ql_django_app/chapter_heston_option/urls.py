@@ -3,4 +3,5 @@ from . import views
 app_name = 'chapter_heston_option'
 urlpatterns = [
 path('', views.heston_lab_view, name='heston_lab'),
+path('monte-carlo/', views.heston_monte_carlo_view, name='heston_monte_carlo'),
 ]
\ No newline at end of file
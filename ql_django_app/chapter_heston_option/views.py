@@ -1,6 +1,7 @@
 from django.shortcuts import render
-from .forms import HestonComparisonForm
+from .forms import HestonComparisonForm, HestonMonteCarloForm
 from . import services
+from compute.pool import ComputePoolBusy, ComputeTimeout, run_in_pool
 
 def heston_lab_view(request):
     form = HestonComparisonForm(request.POST or None)
@@ -24,11 +25,39 @@ def heston_lab_view(request):
         }
         
         # Pass the evaluation date from the form to the service
-        results = services.compare_bsm_and_heston(
+        results = run_in_pool('fast', services.compare_bsm_and_heston,
             option_params, 
             heston_params,
             evaluation_dt=form.cleaned_data['evaluation_dt']
         )
 
     context = {'form': form, 'results': results}
-    return render(request, 'chapter_heston_option/heston_lab.html', context)
\ No newline at end of file
+    return render(request, 'chapter_heston_option/heston_lab.html', context)
+
+
+def heston_monte_carlo_view(request):
+    # Les paramètres peuvent être pré-remplis par l'URL (ex. depuis le labo de calibration)
+    form = HestonMonteCarloForm(request.POST or None, initial=request.GET.dict())
+    results = None
+
+    if request.method == 'POST' and form.is_valid():
+        data = form.cleaned_data
+        option_params = {name: data[name] for name in ('maturity_dt', 'spot_price', 'strike_price', 'dividend_rate_pct', 'risk_free_rate_pct')}
+        heston_params = {name: data[name] for name in ('v0', 'kappa', 'theta', 'sigma', 'rho')}
+        mc_params = {name: data[name] for name in ('payoff', 'barrier', 'num_paths', 'num_steps', 'seed', 'antithetic')}
+
+        try:
+            results = run_in_pool('fast', services.price_heston_monte_carlo,
+                option_params,
+                heston_params,
+                mc_params,
+                evaluation_dt=data['evaluation_dt']
+            )
+        except (ComputePoolBusy, ComputeTimeout):
+            # Left to ComputePoolErrorMiddleware (503 / 504)
+            raise
+        except Exception as e:
+            results = {'error': str(e)}
+
+    context = {'form': form, 'results': results}
+    return render(request, 'chapter_heston_option/heston_monte_carlo.html', context)
@@ -1,4 +1,5 @@
 from django import forms
+from compute.qmc import SAMPLING_CHOICES
 
 # Formulaire pour le labo de calibration
 class CalibrationForm(forms.Form):
@@ -13,6 +14,24 @@ class CalibrationForm(forms.Form):
 class HullWhiteSimulationForm(forms.Form):
     alpha = forms.FloatField(label="Alpha (Mean Reversion)", initial=0.1)
     sigma = forms.FloatField(label="Sigma (Volatility)", initial=0.01)
-    num_paths = forms.IntegerField(label="Number of Paths", initial=5)
-    num_years = forms.IntegerField(label="Simulation Length (Years)", initial=10)
-    seed = forms.IntegerField(label="Random Seed", initial=42)
\ No newline at end of file
+    num_paths = forms.IntegerField(label="Number of Paths", initial=5, min_value=1, help_text="The chart shows the first 20 paths.")
+    num_years = forms.IntegerField(label="Simulation Length (Years)", initial=10, min_value=1, max_value=50)
+    seed = forms.IntegerField(label="Random Seed", initial=42)
+    sampling = forms.ChoiceField(label="Sampling", choices=SAMPLING_CHOICES, initial='pseudo',
+                                 help_text="Quasi-Monte Carlo uses one Sobol point per path (one dimension per daily step), laid out by a Brownian bridge.")
+    chart = forms.ChoiceField(label="Chart", initial='paths',
+                              choices=[('paths', 'Sample paths'), ('fan', 'Fan chart (quantile bands of all paths)')],
+                              help_text="The fan chart shows the 1-99%, 5-95% and 25-75% bands, the median and the mean of every simulated path.")
+
+    # Daily steps: the work grows with paths x years x 360 simulated rates (memory does not,
+    # the paths are simulated in shards); 10^6 paths over one year
+    MAX_SIMULATED_RATES = 360_000_000
+
+    def clean(self):
+        cleaned_data = super().clean()
+        num_paths, num_years = cleaned_data.get('num_paths'), cleaned_data.get('num_years')
+        if num_paths and num_years and num_paths * num_years * 360 > self.MAX_SIMULATED_RATES:
+            raise forms.ValidationError(
+                f"Paths x years x 360 daily steps is limited to {self.MAX_SIMULATED_RATES:,} simulated rates."
+            )
+        return cleaned_data
\ No newline at end of file
@@ -1,16 +1,24 @@
 import QuantLib as ql
 from collections import namedtuple
 import math
+import time
 import numpy as np
+from scipy.signal import lfilter
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
+from compute.qmc import SAMPLING_CHOICES, gaussian_generator
+from compute.path_cache import get_path_cache
+from compute.sharding import map_shards, shard_chunk_generator, shard_generator
+from compute.statistics import RunningStatistics
 
 # --- FUNCTION 1: For the Calibration Lab ---
+@isolated_evaluation_date
 def calibrate_hull_white_model():
     """
     Calibrates a Hull-White model to a set of market swaption volatilities.
     """
     today = ql.Date(15, 2, 2002)
     settlement = ql.Date(19, 2, 2002)
-    ql.Settings.instance().evaluationDate = today
+    set_evaluation_date(today)
     term_structure = ql.YieldTermStructureHandle(
         ql.FlatForward(settlement, 0.04875825, ql.Actual365Fixed())
     )
@@ -64,46 +72,382 @@ def calibrate_hull_white_model():
     }
 
 # --- FUNCTION 2: For the Simulation Lab ---
-def simulate_hull_white_paths(alpha, sigma, num_paths, num_years, seed):
+
+# Steps per year of the simulation grid (daily steps on a 360-day year)
+HW_STEPS_PER_YEAR = 360
+# Paths simulated per block: bounds the memory of the Gaussian draws, not the result
+HW_PATHS_PER_BLOCK = 256
+# Paths per shard of the simulation lab: each shard is one task of the 'slow' lane and holds
+# its paths x years x 360 rates in memory; unlike the blocks, the shards fix the random streams
+HW_PATHS_PER_SHARD = 512
+HW_SHARD_LANE = 'slow'
+# Indicative cost of one simulated rate (ms, measured on one core, without cache hits): the
+# Sobol + Brownian bridge shocks cost about 6 times the pseudo-random ones
+HW_ESTIMATED_MS_PER_RATE = {'pseudo': 5.0e-5, 'sobol': 3.0e-4, 'sobol_scrambled': 3.0e-4}
+# The chart shows the first paths only, each with at most HW_PLOT_POINTS points
+HW_PLOTTED_PATHS = 20
+HW_PLOT_POINTS = 400
+# Fan chart: quantile bands (in %) of all the paths at HW_FAN_POINTS dates, plus the mean and a
+# few sample paths. Each shard counts the standardized deviations x(t) / std(x(t)) on
+# HW_FAN_BINS fixed bins over [-HW_FAN_RANGE, HW_FAN_RANGE]: the counts of the shards add up
+# exactly, and the quantiles are interpolated within the bins
+HW_FAN_QUANTILES = [1, 5, 25, 50, 75, 95, 99]
+HW_FAN_POINTS = 60
+HW_FAN_BINS = 600
+HW_FAN_RANGE = 6.0
+HW_FAN_SAMPLE_PATHS = 5
+
+
+def hull_white_short_rate_paths(term_structure, alpha, sigma, num_paths, num_years, seed,
+                                steps_per_year=HW_STEPS_PER_YEAR, sampling='pseudo'):
     """
-    Simulates multiple future paths for the short-term interest rate
-    according to the Hull-White model.
+    Simulates Hull-White short-rate paths with the exact transition of the model.
+
+    r(t) = x(t) + phi(t), where x is an Ornstein-Uhlenbeck process started at 0 and
+    phi(t) = f(0, t) + sigma^2 / 2 * ((1 - e^{-a t}) / a)^2 fits the initial curve, so
+        x(t + dt) = e^{-a dt} x(t) + sigma * sqrt((1 - e^{-2a dt}) / (2a)) * Z
+    holds for any step size. These are the expectation and standard deviation used by
+    ql.HullWhiteProcess.evolve(), so the paths have the same law as those of
+    ql.GaussianPathGenerator. The recursion runs over all the steps at once (scipy lfilter).
+
+    Args:
+        term_structure: The initial ql.YieldTermStructure (or its handle).
+        alpha, sigma (float): Mean reversion speed and volatility of the short rate.
+        num_paths, num_years (int): Number of paths and horizon in years.
+        seed: NumPy seed, or a generator whose stream is continued (batches), see
+            compute.qmc.gaussian_generator.
+        sampling (str): 'pseudo' draws, or Sobol points laid out by a Brownian bridge
+            ('sobol', 'sobol_scrambled').
+
+    Returns:
+        tuple: (times, rates) where rates has shape (num_paths, num_years * steps_per_year + 1),
+        in decimals.
+    """
+    times, rates = hull_white_sweep_paths(term_structure, [(alpha, sigma)], num_paths, num_years, seed, steps_per_year, sampling)
+    return times, rates[0]
+
+
+def _reversion_factors(alpha, times):
+    """(1 - e^{-a t}) / a, with its limit t when a -> 0."""
+    return -np.expm1(-alpha * times) / alpha if alpha > 1e-12 else times
+
+
+def hull_white_drift(term_structure, alpha, sigma, times):
+    """phi(t) = f(0, t) + sigma^2 / 2 * ((1 - e^{-a t}) / a)^2, the deterministic part of r(t)."""
+    forwards = np.array([term_structure.forwardRate(t, t, ql.Continuous, ql.NoFrequency).rate() for t in times])
+    return forwards + 0.5 * (sigma * _reversion_factors(alpha, times))**2
+
+
+def hull_white_unit_deviations(alphas, num_paths, num_years, seed, steps_per_year=HW_STEPS_PER_YEAR,
+                               sampling='pseudo'):
+    """
+    Ornstein-Uhlenbeck paths x (x_0 = 0, unit volatility) for each mean reversion speed of
+    alphas, all driven by the same Gaussian shocks. x scales linearly with sigma, so
+    r = sigma * x + hull_white_drift(...) for any sigma. With quasi-random sampling, each
+    path is one point of a num_steps-dimensional Sobol sequence.
+
+    Returns:
+        tuple: (times, deviations) with deviations of shape (len(alphas), num_paths, num_steps + 1).
+    """
+    num_steps = num_years * steps_per_year
+    times = np.linspace(0.0, num_years, num_steps + 1)
+    dt = 1.0 / steps_per_year
+    # Standard deviation of one step, sqrt((1 - e^{-2a dt}) / (2a)), and decay over one step
+    filters = [(math.sqrt(_reversion_factors(2.0 * alpha, dt)), math.exp(-alpha * dt)) for alpha in alphas]
+
+    rng = gaussian_generator(seed, num_steps, sampling)
+    deviations = np.empty((len(alphas), num_paths, num_steps + 1))
+    deviations[:, :, 0] = 0.0
+    # Blocks draw the same numbers as a single (num_paths, num_steps) draw
+    for first in range(0, num_paths, HW_PATHS_PER_BLOCK):
+        block = slice(first, min(first + HW_PATHS_PER_BLOCK, num_paths))
+        shocks = rng.standard_normal((block.stop - block.start, num_steps))
+        for i, (step_std, decay) in enumerate(filters):
+            # x_{k+1} = decay * x_k + step_std * z_k
+            deviations[i, block, 1:] = lfilter([step_std], [1.0, -decay], shocks, axis=1)
+    return times, deviations
+
+
+def hull_white_sweep_paths(term_structure, params, num_paths, num_years, seed,
+                           steps_per_year=HW_STEPS_PER_YEAR, sampling='pseudo'):
+    """
+    Simulates the short rate for several (alpha, sigma) pairs from the same Gaussian shocks
+    (common random numbers), as in hull_white_short_rate_paths.
+
+    The Ornstein-Uhlenbeck part is filtered once per distinct alpha with a unit volatility
+    and every sigma is a rescaling of it: the draws cost the same for the whole sweep as for
+    a single pair, and the differences between pairs carry no sampling noise.
+
+    Returns:
+        tuple: (times, rates) with rates of shape (len(params), num_paths, num_steps + 1).
+    """
+    alphas = list(dict.fromkeys(alpha for alpha, _ in params))
+    times, deviations = hull_white_unit_deviations(alphas, num_paths, num_years, seed, steps_per_year, sampling)
+    rates = np.empty((len(params),) + deviations.shape[1:])
+    for i, (alpha, sigma) in enumerate(params):
+        np.multiply(deviations[alphas.index(alpha)], sigma, out=rates[i])
+        rates[i] += hull_white_drift(term_structure, alpha, sigma, times)
+    return times, rates
+
+
+def hull_white_yearly_unit_deviations(alpha, x_start, seed, shard_index, first_year, last_year,
+                                     steps_per_year=HW_STEPS_PER_YEAR):
+    """
+    Unit-volatility Ornstein-Uhlenbeck deviations (as hull_white_unit_deviations) for the
+    years first_year to last_year - 1, continuing from x_start (one value per path). The
+    shocks of each year come from their own substream (compute.sharding.shard_chunk_generator),
+    so a path set can be extended by simulating the new years only.
+
+    Returns:
+        ndarray: Time-major, shape ((last_year - first_year) * steps_per_year, len(x_start)):
+        the values after each step.
+    """
+    dt = 1.0 / steps_per_year
+    step_std, decay = math.sqrt(_reversion_factors(2.0 * alpha, dt)), math.exp(-alpha * dt)
+    x = np.asarray(x_start, dtype=float)
+    deviations = np.empty(((last_year - first_year) * steps_per_year, len(x)))
+    for i, year in enumerate(range(first_year, last_year)):
+        shocks = shard_chunk_generator(seed, shard_index, year).standard_normal((steps_per_year, len(x)))
+        # x_{k+1} = decay * x_k + step_std * z_k, started from the last value of the previous year
+        block, _ = lfilter([step_std], [1.0, -decay], shocks, axis=0, zi=(decay * x)[None, :])
+        deviations[i * steps_per_year:(i + 1) * steps_per_year] = block
+        x = block[-1]
+    return deviations
+
+
+def _shard_unit_deviations(alpha, num_paths, num_years, seed, sampling, shard_index, use_cache):
+    """
+    Unit deviations of one shard of the simulation lab, time-major (num_steps + 1 rows of
+    num_paths values), through the path cache (compute.path_cache) when it is enabled.
+
+    The cache is keyed by alpha, the seed and the shard layout only: sigma and the initial
+    curve are applied afterwards (r = sigma * x + phi). A cached set is memory-mapped, and
+    time-major rows make the few dates the lab reads contiguous on disk. Pseudo-random path
+    sets are drawn year by year, so a shorter horizon reads a prefix of a cached set and a
+    longer one only simulates the missing years. With Sobol + Brownian bridge every point
+    spans the whole horizon, so the number of years is part of the key. use_cache=False (a run
+    too large for the quota, see _run_uses_cache) bypasses the cache; eviction is left to the
+    caller, once per run.
+    """
+    cache = get_path_cache() if use_cache else None
+    num_steps = num_years * HW_STEPS_PER_YEAR
+    params = {
+        'model': 'hull_white_unit_deviations', 'alpha': alpha, 'seed': seed, 'sampling': sampling,
+        'shard': shard_index, 'shard_size': HW_PATHS_PER_SHARD, 'paths': num_paths, 'steps_per_year': HW_STEPS_PER_YEAR,
+    }
+    if sampling != 'pseudo':
+        params['years'] = num_years
+    key = cache.key(params) if cache is not None else None
+    cached = cache.load(key) if cache is not None else None
+    if cached is not None and len(cached) > num_steps:
+        return cached[:num_steps + 1]
+
+    if sampling != 'pseudo':
+        rng = shard_generator(seed, shard_index, num_steps, sampling, HW_PATHS_PER_SHARD)
+        deviations = np.ascontiguousarray(hull_white_unit_deviations([alpha], num_paths, num_years, rng)[1][0].T)
+    else:
+        if cached is None:
+            cached = np.zeros((1, num_paths))
+        cached_years = (len(cached) - 1) // HW_STEPS_PER_YEAR
+        extension = hull_white_yearly_unit_deviations(alpha, cached[-1], seed, shard_index, cached_years, num_years)
+        deviations = np.concatenate([cached, extension])
+    if cache is not None:
+        cache.store(key, deviations, evict=False)
+    return deviations
+
+
+def _run_uses_cache(num_paths, num_years):
+    """True when the unit deviations of a whole run fit in the share of the cache quota a run may take."""
+    cache = get_path_cache()
+    return cache is not None and cache.accepts(num_paths * (num_years * HW_STEPS_PER_YEAR + 1) * 8)
+
+
+def _fan_columns(num_steps):
+    """Steps of the fan chart dates, evenly spread over the horizon."""
+    return np.unique(np.linspace(0, num_steps, HW_FAN_POINTS + 1).round().astype(int))
+
+
+def _fan_histograms(deviations, columns, alpha, sigma, times):
+    """
+    Counts of the standardized deviations sign(sigma) x(t) / std(x(t)) (so that they grow
+    with the rate) at each fan chart date, on the fixed bins; the first and last of the
+    HW_FAN_BINS + 2 counts collect the values outside the range.
+    """
+    unit_std = np.sqrt(_reversion_factors(2.0 * alpha, times[columns]))
+    unit_std[unit_std == 0.0] = 1.0
+    standardized = np.sign(sigma) * deviations[columns] / unit_std[:, None]
+    width = 2.0 * HW_FAN_RANGE / HW_FAN_BINS
+    bins = np.clip(np.floor((standardized + HW_FAN_RANGE) / width).astype(np.int64) + 1, 0, HW_FAN_BINS + 1)
+    bins += np.arange(len(columns))[:, None] * (HW_FAN_BINS + 2)
+    return np.bincount(bins.ravel(), minlength=len(columns) * (HW_FAN_BINS + 2)).reshape(len(columns), -1)
+
+
+def _histogram_quantiles(counts, levels):
+    """Quantiles (levels in %) of the standardized deviations, one column per fan chart date."""
+    width = 2.0 * HW_FAN_RANGE / HW_FAN_BINS
+    cdf = np.cumsum(counts, axis=1) / counts.sum(axis=1, keepdims=True)
+    rows = np.arange(len(counts))
+    quantiles = np.empty((len(levels), len(counts)))
+    for i, level in enumerate(levels):
+        q = level / 100.0
+        # First bin where the cumulative frequency reaches q, then linear interpolation inside it
+        bins = np.minimum((cdf < q).sum(axis=1), HW_FAN_BINS + 1)
+        below = np.where(bins > 0, cdf[rows, np.maximum(bins - 1, 0)], 0.0)
+        in_bin = cdf[rows, bins] - below
+        fraction = np.divide(q - below, in_bin, out=np.full(len(counts), 0.5), where=in_bin > 0)
+        quantiles[i] = np.clip(-HW_FAN_RANGE + (bins - 1 + fraction) * width, -HW_FAN_RANGE, HW_FAN_RANGE)
+    return quantiles
+
+
+def _reported_horizons(num_years):
+    """Years at which the simulated moments are compared with QuantLib."""
+    return sorted({1, max(num_years // 2, 1), num_years})
+
+
+@isolated_evaluation_date
+def hull_white_paths_shard(alpha, sigma, num_years, seed, sampling, chart, use_cache, shard_index, num_paths):
+    """
+    Simulates one shard of the simulation lab (a task of the compute pool) with its own
+    random streams (compute.sharding), reusing the cached paths of earlier requests.
+
+    Returns:
+        dict: 'stats', the RunningStatistics of the rates at the reported horizons, and for a
+        fan chart the histograms of the shard ('fan_counts') and the moments of the rates at
+        the fan dates ('fan_stats'). The first shard also returns the exact moments of
+        ql.HullWhiteProcess and the chart data: the plotted paths, or the fan dates with
+        the scale and drift that turn standardized deviations into rates, and sample paths.
     """
     today = ql.Date(15, 5, 2015)
-    ql.Settings.instance().evaluationDate = today
-    
+    set_evaluation_date(today)
+
     # 1. Initial flat yield curve
     risk_free_curve = ql.FlatForward(today, 0.005, ql.Actual365Fixed())
     risk_free_handle = ql.YieldTermStructureHandle(risk_free_curve)
-    
-    # 2. Hull-White process with user parameters
+
+    # 2. Paths of the shard: cached unit deviations, scaled by sigma and shifted by the drift
+    #    (only at the dates used below)
+    deviations = _shard_unit_deviations(alpha, num_paths, num_years, seed, sampling, shard_index, use_cache)
+    times = np.linspace(0.0, num_years, len(deviations))
+    horizons = _reported_horizons(num_years)
+    columns = [horizon * HW_STEPS_PER_YEAR for horizon in horizons]
+    stats = RunningStatistics()
+    stats.update((deviations[columns] * sigma + hull_white_drift(risk_free_curve, alpha, sigma, times[columns])[:, None]).T)
+    shard = {'stats': stats}
+    if chart == 'fan':
+        fan_columns = _fan_columns(len(deviations) - 1)
+        fan_drift = hull_white_drift(risk_free_curve, alpha, sigma, times[fan_columns])
+        shard['fan_counts'] = _fan_histograms(deviations, fan_columns, alpha, sigma, times)
+        shard['fan_stats'] = RunningStatistics()
+        shard['fan_stats'].update((deviations[fan_columns] * sigma + fan_drift[:, None]).T)
+    if shard_index > 0:
+        return shard
+
+    # 3. Hull-White process with user parameters (reference for the moments)
     process = ql.HullWhiteProcess(risk_free_handle, alpha, sigma)
-    
-    # 3. Time grid for the simulation
-    timestep = 360 # Number of steps per year
-    length = num_years # Number of years
-    times = ql.TimeGrid(length, timestep)
-    
-    # 4. Random sequence generator
-    rng = ql.GaussianRandomSequenceGenerator(
-        ql.UniformRandomSequenceGenerator(timestep, ql.UniformRandomGenerator(seed))
-    )
-    
-    # 5. Path generator
-    seq = ql.GaussianPathGenerator(process, length, timestep, rng, False)
-    
-    # 6. Simulate the paths
-    paths = []
-    for i in range(num_paths):
-        path = seq.next().value()
-        paths.append([risk_free_curve.zeroRate(0, ql.Continuous).rate()] + list(path))
-
-    # 7. Prepare data for plotting
-    time_points = list(times)
-    plot_data = []
-    for i in range(num_paths):
+    ql_moments = [
+        (process.expectation(0.0, process.x0(), horizon), process.stdDeviation(0.0, process.x0(), horizon))
+        for horizon in horizons
+    ]
+
+    # 4. Prepare data for plotting
+    if chart == 'fan':
+        # Dates, scale and drift of the fan chart; sample paths at the same dates
+        fan_times = times[fan_columns]
+        shard.update({
+            'fan_times': fan_times,
+            'fan_scale': abs(sigma) * np.sqrt(_reversion_factors(2.0 * alpha, fan_times)),
+            'fan_drift': fan_drift,
+            'fan_samples': deviations[fan_columns, :HW_FAN_SAMPLE_PATHS].T * sigma + fan_drift,
+            'plot_data': [],
+        })
+    else:
         # We take a sample of points to keep the chart light
-        path_points = [{'x': t, 'y': p * 100} for t, p in zip(time_points, paths[i])][::10]
-        plot_data.append({'path_name': f'Path {i+1}', 'points': path_points})
+        stride = max(1, (len(times) - 1) // HW_PLOT_POINTS)
+        plotted_paths = min(num_paths, HW_PLOTTED_PATHS)
+        plot_times = times[::stride]
+        plot_rates = deviations[::stride, :plotted_paths] * sigma + hull_white_drift(risk_free_curve, alpha, sigma, plot_times)[:, None]
+        shard['plot_data'] = [
+            {
+                'path_name': f'Path {i+1}',
+                'points': [{'x': t, 'y': p * 100} for t, p in zip(plot_times.tolist(), plot_rates[:, i].tolist())]
+            }
+            for i in range(plotted_paths)
+        ]
+    shard.update({'ql_moments': ql_moments, 'num_steps': len(deviations) - 1})
+    return shard
+
+
+def _fan_chart(first_shard, fan_counts, fan_stats):
+    """Fan chart payload: rates in % at the fan dates, rounded (a few KB whatever the number of paths)."""
+    quantiles = _histogram_quantiles(fan_counts, HW_FAN_QUANTILES) * first_shard['fan_scale'] + first_shard['fan_drift']
+    return {
+        'times': np.round(first_shard['fan_times'], 4).tolist(),
+        'quantiles': [
+            {'level': level, 'values': np.round(values * 100, 4).tolist()}
+            for level, values in zip(HW_FAN_QUANTILES, quantiles)
+        ],
+        'mean': np.round(fan_stats.mean * 100, 4).tolist(),
+        'samples': np.round(first_shard['fan_samples'] * 100, 4).tolist(),
+    }
+
+
+def estimate_simulation_cost_ms(num_paths, num_years, sampling='pseudo'):
+    """Estimated duration of simulate_hull_white_paths on one core (in milliseconds), cache misses assumed."""
+    return num_paths * num_years * HW_STEPS_PER_YEAR * HW_ESTIMATED_MS_PER_RATE[sampling]
+
 
-    return plot_data
\ No newline at end of file
+def simulate_hull_white_paths(alpha, sigma, num_paths, num_years, seed, sampling='pseudo', chart='paths'):
+    """
+    Simulates multiple future paths for the short-term interest rate
+    according to the Hull-White model.
+
+    The paths follow the exact transition of hull_white_short_rate_paths, in shards of
+    HW_PATHS_PER_SHARD paths spread over the workers of the 'slow' lane
+    (compute.sharding.map_shards); the mean and standard deviation of the simulated rates
+    are compared with the exact moments of ql.HullWhiteProcess. Every shard has its own random stream and the shards are merged in
+    order, so the results for a seed do not depend on the number of workers. sampling selects
+    pseudo-random or Sobol + Brownian bridge shocks (compute.qmc.SAMPLING_CHOICES). Path
+    sets are kept in the disk cache, so repeated or extended simulations reuse them.
+    chart='fan' replaces the plotted paths by a fan chart of all the paths (quantile bands,
+    mean and a few sample paths), aggregated in the shards, so its payload does not grow
+    with the number of paths. Call it from the web process: it only waits for the shards
+    and merges them.
+    """
+    start = time.perf_counter()
+    stats, fan_stats = RunningStatistics(), RunningStatistics()
+    first_shard, fan_counts = None, 0
+    use_cache = _run_uses_cache(num_paths, num_years)
+    shards = map_shards(HW_SHARD_LANE, hull_white_paths_shard, (alpha, sigma, num_years, seed, sampling, chart, use_cache),
+                        num_paths, HW_PATHS_PER_SHARD)
+    for shard in shards:
+        stats.merge(shard['stats'])
+        if chart == 'fan':
+            fan_stats.merge(shard['fan_stats'])
+            fan_counts = fan_counts + shard['fan_counts']
+        first_shard = first_shard or shard
+    if use_cache:
+        get_path_cache().evict()
+    simulation_ms = (time.perf_counter() - start) * 1000
+
+    # Moments against QuantLib
+    statistics = []
+    for i, horizon in enumerate(_reported_horizons(num_years)):
+        ql_mean, ql_std = first_shard['ql_moments'][i]
+        statistics.append({
+            'time': horizon,
+            'mean_pct': np.round(stats.mean[i] * 100, 4),
+            'ql_mean_pct': np.round(ql_mean * 100, 4),
+            'std_pct': np.round(np.sqrt(stats.variance[i]) * 100, 4) if num_paths > 1 else 'N/A',
+            'ql_std_pct': np.round(ql_std * 100, 4),
+        })
+
+    return {
+        'plot_data': first_shard['plot_data'],
+        'statistics': statistics,
+        'num_paths': num_paths,
+        'num_steps': first_shard['num_steps'],
+        'plotted_paths': len(first_shard['plot_data']),
+        'fan_chart': _fan_chart(first_shard, fan_counts, fan_stats) if chart == 'fan' else None,
+        'simulation_ms': np.round(simulation_ms, 1),
+        'sampling': dict(SAMPLING_CHOICES)[sampling],
+    }
@@ -1,3 +1,72 @@
-from django.test import TestCase
+import shutil
+import tempfile
 
-# Create your tests here.
+import numpy as np
+from django.test import TestCase, override_settings
+
+from compute.jobs import to_jsonable
+from compute.pool import shutdown_pools
+from .services import HW_PATHS_PER_SHARD, _shard_unit_deviations, simulate_hull_white_paths
+
+
+def _pools(workers):
+    return {'fast': {'workers': 0}, 'slow': {'workers': workers}}
+
+
+def _simulation(**kwargs):
+    results = simulate_hull_white_paths(**kwargs)
+    results.pop('simulation_ms')
+    return to_jsonable(results)
+
+
+# Worker processes read the project settings, not override_settings: the cache stays off here
+@override_settings(QL_PATH_CACHE_DIR=None)
+class ShardedSimulationTests(TestCase):
+    """simulate_hull_white_paths gives the same paths and statistics whatever the number of workers."""
+
+    PARAMS = {'alpha': 0.1, 'sigma': 0.01, 'num_paths': 2 * HW_PATHS_PER_SHARD + 100, 'num_years': 2, 'seed': 42}
+
+    def tearDown(self):
+        shutdown_pools()
+
+    def test_results_do_not_depend_on_the_number_of_workers(self):
+        for sampling, chart in [('pseudo', 'paths'), ('pseudo', 'fan'), ('sobol_scrambled', 'paths')]:
+            runs = []
+            for workers in (0, 1, 3):
+                shutdown_pools()
+                with self.settings(QL_COMPUTE_POOLS=_pools(workers)):
+                    runs.append(_simulation(**self.PARAMS, sampling=sampling, chart=chart))
+            with self.subTest(sampling=sampling, chart=chart):
+                self.assertEqual(runs[0], runs[1])
+                self.assertEqual(runs[0], runs[2])
+
+
+@override_settings(QL_COMPUTE_POOLS=_pools(0))
+class PathCacheExtensionTests(TestCase):
+    """A cached path set extended to a longer horizon equals a fresh simulation of that horizon."""
+
+    PARAMS = {'alpha': 0.1, 'sigma': 0.01, 'num_paths': HW_PATHS_PER_SHARD + 100, 'seed': 7}
+
+    def setUp(self):
+        shutdown_pools()
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_extended_path_set_equals_fresh_run(self):
+        with self.settings(QL_PATH_CACHE_DIR=None):
+            fresh = _simulation(**self.PARAMS, num_years=5)
+            fresh_deviations = _shard_unit_deviations(0.1, 100, 5, 7, 'pseudo', 1, use_cache=False)
+
+        with self.settings(QL_PATH_CACHE_DIR=self.cache_dir):
+            _simulation(**self.PARAMS, num_years=2)
+            _shard_unit_deviations(0.1, 100, 2, 7, 'pseudo', 1, use_cache=True)
+            extended = _simulation(**self.PARAMS, num_years=5)
+            extended_deviations = _shard_unit_deviations(0.1, 100, 5, 7, 'pseudo', 1, use_cache=True)
+            # A shorter horizon reads a prefix of the extended set
+            prefix_deviations = _shard_unit_deviations(0.1, 100, 2, 7, 'pseudo', 1, use_cache=True)
+
+        self.assertEqual(fresh, extended)
+        np.testing.assert_array_equal(fresh_deviations, extended_deviations)
+        np.testing.assert_array_equal(fresh_deviations[:len(prefix_deviations)], prefix_deviations)
@@ -1,5 +1,7 @@
-from django.shortcuts import render
+from django.shortcuts import render, redirect
 from . import services
+from compute.pool import ComputePoolBusy, ComputeTimeout, run_in_pool
+from compute.jobs import get_job, should_run_as_job, submit_job
 from .forms import CalibrationForm, HullWhiteSimulationForm
 
 # --- View for the "Short-rate model calibration" Lab ---
@@ -19,7 +21,10 @@ def short_rate_calibration_view(request):
         model_name = form.fields['model_name'].initial
 
     try:
-        results = services.calibrate_short_rate_model(model_name)
+        results = run_in_pool('slow', services.calibrate_short_rate_model, model_name)
+    except (ComputePoolBusy, ComputeTimeout):
+        # Left to ComputePoolErrorMiddleware (503 / 504)
+        raise
     except Exception as e:
         # In case of a calculation error, we log it and results will be None
         print(f"ERROR during calibration service call: {e}")
@@ -32,38 +37,39 @@ def short_rate_calibration_view(request):
 def hull_white_simulation_view(request):
     """
     Handles the interactive Hull-White simulation lab page.
-    It always runs a simulation to display a chart.
+    It always runs a simulation to display a chart; large ones run as a background job.
     """
     form = HullWhiteSimulationForm(request.POST or None)
+    job = get_job(request.GET.get('job')) if request.method == 'GET' else None
     
-    # Determine which parameters to use for the simulation
-    if form.is_valid():
-        alpha = form.cleaned_data['alpha']
-        sigma = form.cleaned_data['sigma']
-        num_paths = form.cleaned_data['num_paths']
-        num_years = form.cleaned_data['num_years']
-        seed = form.cleaned_data['seed']
+    if job is not None:
+        # Page of a background simulation: its result once done, else the progress box
+        form = HullWhiteSimulationForm(initial=job.params)
+        results = job.result
     else:
+        # Determine which parameters to use for the simulation
+        if form.is_valid():
+            params = {name: form.cleaned_data[name] for name in ('alpha', 'sigma', 'num_paths', 'num_years', 'seed', 'sampling', 'chart')}
+            # Large simulations run as a background job; the service spreads its shards over
+            # the pool itself, so the job waits for them in the background thread
+            estimated_cost_ms = services.estimate_simulation_cost_ms(params['num_paths'], params['num_years'], params['sampling'])
+            if should_run_as_job(estimated_cost_ms):
+                job = submit_job(services.simulate_hull_white_paths, params, estimated_cost_ms, in_thread=True)
+                return redirect(f"{request.path}?job={job.pk}")
+        else:
+            # An invalid submission keeps its errors on display; the chart uses the defaults
+            if not form.is_bound:
+                form = HullWhiteSimulationForm()
+            params = {name: form.fields[name].initial for name in ('alpha', 'sigma', 'num_paths', 'num_years', 'seed', 'sampling', 'chart')}
         
-        form = HullWhiteSimulationForm()
-        alpha = form.fields['alpha'].initial
-        sigma = form.fields['sigma'].initial
-        num_paths = form.fields['num_paths'].initial
-        num_years = form.fields['num_years'].initial
-        seed = form.fields['seed'].initial
-    
-    # Always run the simulation service with the determined parameters
-    plot_data = services.simulate_hull_white_paths(
-        alpha=alpha,
-        sigma=sigma,
-        num_paths=num_paths,
-        num_years=num_years,
-        seed=seed
-    )
+        # The shards of the simulation are spread over the compute pool by the service itself
+        results = services.simulate_hull_white_paths(**params)
     
     context = {
         'form': form, 
-        'plot_data': plot_data
+        'plot_data': results['plot_data'] if results else None,
+        'results': results,
+        'job': job
     }
     # Renders the template for the simulation lab
     return render(request, 'chapter_hull_white/hull_white_lab.html', context)
@@ -1,7 +1,9 @@
 import QuantLib as ql
 from datetime import date
 import numpy as np
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
 
+@isolated_evaluation_date
 def build_spreaded_curve(spread_bps: float, evaluation_dt: date):
     """
     Builds a base curve for a given evaluation date and derives a new curve 
@@ -10,7 +12,7 @@ def build_spreaded_curve(spread_bps: float, evaluation_dt: date):
     
     # 1. Set up evaluation date and market conventions
     today = ql.Date(evaluation_dt.day, evaluation_dt.month, evaluation_dt.year)
-    ql.Settings.instance().evaluationDate = today
+    set_evaluation_date(today)
     
     # 2. Build the base (risk-free) curve
     # The nodes define the maximum date of the curve (today + 20 years)
@@ -1,6 +1,7 @@
 from django.shortcuts import render
 from .forms import SpreadCurveForm
 from . import services
+from compute.pool import run_in_pool
 
 def implied_curve_lab_view(request):
     form = SpreadCurveForm(request.POST or None)
@@ -14,7 +15,7 @@ def implied_curve_lab_view(request):
         eval_dt = form.fields['evaluation_dt'].initial
         spread = form.fields['spread_bps'].initial
             
-    plot_points = services.build_spreaded_curve(
+    plot_points = run_in_pool('fast', services.build_spreaded_curve,
         spread_bps=spread,
         evaluation_dt=eval_dt
     )
@@ -1,13 +1,28 @@
 from django import forms
+from compute.qmc import SAMPLING_CHOICES
 
 class ConvergenceForm(forms.Form):
     EXPERIMENT_CHOICES = [
         ('vary_sigma', 'Impact of Sigma (Volatility)'),
         ('vol_dist', 'Discount Factor Distribution'),
+        ('qmc_vs_mc', 'Monte Carlo vs Quasi-Monte Carlo'),
+    ]
+    
+    INTEGRATION_CHOICES = [
+        ('simpson', "Simpson's rule"),
+        ('trapezoid', 'Trapezoidal rule'),
     ]
     
     experiment_type = forms.ChoiceField(label="Experiment to run", choices=EXPERIMENT_CHOICES)
     a = forms.FloatField(label="Alpha (Mean Reversion)", initial=0.1)
     sigma = forms.FloatField(label="Sigma (Volatility)", initial=0.02)
-    num_paths = forms.IntegerField(label="Number of Monte Carlo Paths", initial=500, min_value=100, max_value=5000)
-    seed = forms.IntegerField(label="Random Seed", initial=42)
\ No newline at end of file
+    num_paths = forms.IntegerField(label="Number of Monte Carlo Paths", initial=500, min_value=100, max_value=1000000)
+    seed = forms.IntegerField(label="Random Seed", initial=42)
+    target_std_error = forms.FloatField(label="Target Std Error of DF (optional)", required=False, min_value=0.0,
+                                        help_text="Simulate in batches until the discount factors reach this standard error; the number of paths becomes a cap.")
+    time_budget_ms = forms.FloatField(label="Time Budget in ms (optional)", required=False, min_value=0.0)
+    integration = forms.ChoiceField(label="Discount Factor Integration", choices=INTEGRATION_CHOICES, initial='simpson')
+    common_random_numbers = forms.BooleanField(label="Common random numbers (sigma sweep)", required=False, initial=True,
+                                               help_text="Simulate every sigma from the same Gaussian draws, rescaled, instead of one independent stream per sigma.")
+    sampling = forms.ChoiceField(label="Sampling", choices=SAMPLING_CHOICES, initial='pseudo',
+                                 help_text="With quasi-random paths the std error shown assumes independent draws; compare the methods with the 'Monte Carlo vs Quasi-Monte Carlo' experiment.")
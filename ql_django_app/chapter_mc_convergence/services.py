@@ -1,73 +1,277 @@
 import QuantLib as ql
 import numpy as np
-from scipy.integrate import simpson
 import math
+from time import perf_counter
+from chapter_hull_white.services import hull_white_drift, hull_white_short_rate_paths, hull_white_unit_deviations
+from compute.statistics import RunningStatistics, simulate_until_converged
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
+from compute.qmc import gaussian_generator
+from compute.sharding import map_shards, shard_generator
 
+# Valeurs de sigma balayées par l'expérience 'vary_sigma'
+SIGMA_SWEEP = np.arange(0.01, 0.1, 0.03)
+# Coût indicatif d'une trajectoire (180 pas + intégrales des facteurs d'actualisation), en ms
+ESTIMATED_MS_PER_PATH = 0.008
+# Sans critère d'arrêt, les trajectoires sont tout de même simulées par lots de cette taille
+# pour borner la mémoire
+FIXED_BATCH_SIZE = 10000
+# Marché commun des expériences : courbe plate à 5 %, 180 pas mensuels sur 15 ans,
+# facteurs d'actualisation relevés chaque année
+EXPERIMENT_DATE = ql.Date(15, 1, 2015)
+EXPERIMENT_FORWARD_RATE = 0.05
+EXPERIMENT_TIMESTEP = 180
+EXPERIMENT_LENGTH = 15
+EXPERIMENT_GRID = np.arange(12, EXPERIMENT_TIMESTEP + 1, 12)
+# Tranches (compute.sharding) : trajectoires par tâche du pool. Les flux aléatoires ne
+# dépendent que de seed et de cette taille ; le flux SSE envoie une mise à jour par tranche
+CONVERGENCE_SHARD_SIZE = 2000
+CONVERGENCE_LANE = 'slow'
+STREAM_LANE = 'fast'
+STREAMED_EXPERIMENTS = ('vary_sigma', 'vol_dist')
+# Comparaison MC / QMC : répétitions indépendantes (flux pseudo-aléatoires ou brouillages de
+# Sobol) et plus petit nombre de trajectoires de la courbe (puissances de 2 ensuite)
+QMC_REPLICATIONS = 16
+QMC_MIN_PATHS = 64
+QMC_COMPARED_SAMPLINGS = [('pseudo', 'Pseudo-random MC'), ('sobol_scrambled', 'Scrambled Sobol + Brownian bridge')]
 
-def get_path_generator(timestep, hw_process, length, seed):
+
+def cumulative_integral(values, dt: float, method: str = 'simpson'):
+    """
+    Intégrales cumulées ∫_0^{t_j} de chaque ligne de values (matrice n x (m+1), grille
+    uniforme de pas dt), pour tous les points j de la grille en une seule passe : O(n·m).
+
+    'trapezoid' applique la règle des trapèzes. 'simpson' reproduit scipy.integrate.simpson
+    appelé sur chaque préfixe values[:, :j+1] : Simpson composite pour un nombre pair
+    d'intervalles, plus la correction de Cartwright du dernier intervalle sinon (trapèze pour
+    un seul intervalle).
     """
-    Crée un générateur de chemins Monte Carlo (pseudo-aléatoire).
+    # Le temps passe en premier axe : les sommes cumulées portent alors sur des lignes
+    # contiguës de toutes les trajectoires à la fois (bien plus rapide que le long de axis=-1)
+    values = np.moveaxis(np.asarray(values, dtype=float), -1, 0)
+    integrals = np.empty(values.shape)
+    integrals[0] = 0.0
+    if len(values) < 2:
+        return np.moveaxis(integrals, 0, -1)
+    if method == 'trapezoid':
+        steps = values[1:] + values[:-1]
+        steps *= 0.5 * dt
+        np.cumsum(steps, axis=0, out=integrals[1:])
+        return np.moveaxis(integrals, 0, -1)
+    if method != 'simpson':
+        raise ValueError(f"Unknown integration method: {method}")
+
+    # Préfixes d'un nombre pair d'intervalles : sommes cumulées des paraboles (y0 + 4y1 + y2)
+    pairs = 4.0 * values[1:-1:2]
+    pairs += values[0:-2:2]
+    pairs += values[2::2]
+    pairs *= dt / 3.0
+    np.cumsum(pairs, axis=0, out=integrals[2::2])
+    # Nombre impair d'intervalles : Simpson jusqu'à j - 1, puis la parabole des trois derniers
+    # points (trapèze pour le premier intervalle)
+    integrals[1] = 0.5 * dt * (values[0] + values[1])
+    last_interval = 8.0 * values[2:-1:2]
+    last_interval += 5.0 * values[3::2]
+    last_interval -= values[1:-2:2]
+    last_interval *= dt / 12.0
+    last_interval += integrals[2:-1:2]
+    integrals[3::2] = last_interval
+    return np.moveaxis(integrals, 0, -1)
+
+def discount_factor_sampler(term_structure, a, sigma, timestep, length, seed, avg_grid_array, method='simpson',
+                            sampling='pseudo'):
+    """
+    Renvoie une fonction qui simule n trajectoires et leurs facteurs d'actualisation
+    exp(-∫r dt) à chaque point de la grille (matrice n x len(avg_grid_array)).
+
+    Les taux courts viennent du simulateur vectorisé de Hull-White (transition exacte,
+    chapter_hull_white) ; les appels successifs continuent le même flux aléatoire, pseudo-
+    aléatoire ou de Sobol (sampling, voir compute.qmc).
     """
-    usg = ql.UniformRandomSequenceGenerator(timestep, ql.UniformRandomGenerator(seed))
-    rng = ql.GaussianRandomSequenceGenerator(usg)
-    return ql.GaussianPathGenerator(hw_process, length, timestep, rng, False)
+    rng = gaussian_generator(seed, timestep, sampling)
+    def draw(n):
+        time, paths = hull_white_short_rate_paths(term_structure, a, sigma, n, length, rng, steps_per_year=timestep // length)
+        return np.exp(-cumulative_integral(paths, time[1] - time[0], method)[:, avg_grid_array])
+    return draw
 
-def generate_paths(num_paths, timestep, seq):
+def sweep_discount_factor_sampler(term_structure, a, sigmas, timestep, length, seed, avg_grid_array, method='simpson',
+                                  sampling='pseudo'):
     """
-    Génère un nombre spécifié de trajectoires à partir d'un générateur de chemins.
+    Comme discount_factor_sampler, pour toutes les valeurs de sigmas à la fois (nombres
+    aléatoires communs). Le taux court vaut r = sigma·x + phi_sigma : l'intégrale de la partie
+    aléatoire x (volatilité unité) est calculée une seule fois et remise à l'échelle pour
+    chaque sigma, celle de phi_sigma est déterministe.
+    Chaque échantillon est une matrice len(sigmas) x len(avg_grid_array).
     """
-    arr = np.zeros((num_paths, timestep + 1))
-    for i in range(num_paths):
-        path = seq.next().value()
-        arr[i, :] = np.array(list(path))
-    time = np.array(list(seq.timeGrid()))
-    return time, arr
+    rng = gaussian_generator(seed, timestep, sampling)
+    steps_per_year = timestep // length
+    time = np.linspace(0.0, length, timestep + 1)
+    dt = time[1] - time[0]
+    drift_integrals = np.array([
+        cumulative_integral(hull_white_drift(term_structure, a, s, time), dt, method)[avg_grid_array] for s in sigmas
+    ])
+    def draw(n):
+        _, deviations = hull_white_unit_deviations([a], n, length, rng, steps_per_year)
+        deviation_integrals = cumulative_integral(deviations[0], dt, method)[:, avg_grid_array]
+        return np.exp(-(deviation_integrals[:, None, :] * np.asarray(sigmas)[:, None] + drift_integrals))
+    return draw
 
-def run_convergence_experiment(experiment_type: str, a: float, sigma: float, num_paths: int, seed: int):
+def simulate_discount_factors(draw, num_paths, target_std_error=None, time_budget_ms=None, batch_size=100):
+    """
+    Accumule les statistiques des facteurs d'actualisation. Sans critère d'arrêt, simule
+    exactement num_paths trajectoires ; sinon simule par lots jusqu'à atteindre l'erreur
+    standard cible ou le budget de temps, num_paths servant alors de plafond.
+    """
+    if target_std_error is None and time_budget_ms is None:
+        stats = RunningStatistics()
+        for first in range(0, num_paths, FIXED_BATCH_SIZE):
+            stats.update(draw(min(FIXED_BATCH_SIZE, num_paths - first)))
+        return {'stats': stats, 'num_samples': stats.count, 'std_error': float(np.max(stats.std_error)), 'stop_reason': None}
+    return simulate_until_converged(
+        draw, batch_size, target_std_error=target_std_error, time_budget_ms=time_budget_ms, max_samples=num_paths
+    )
+
+def _sharded_run(experiment_type, a, sigma, num_paths, seed, integration, sampling):
+    """Comme simulate_discount_factors sans critère d'arrêt, avec les tranches réparties sur le pool."""
+    for stats in simulate_convergence_shards(experiment_type, a, sigma, num_paths, seed, integration, sampling):
+        pass
+    return {'stats': stats, 'num_samples': stats.count, 'std_error': float(np.max(stats.std_error)), 'stop_reason': None}
+
+def estimate_experiment_cost_ms(experiment_type: str, num_paths: int, time_budget_ms: float = None,
+                                common_random_numbers: bool = True) -> float:
+    """
+    Estime la durée de run_convergence_experiment (en millisecondes). En mode adaptatif,
+    num_paths est un plafond : l'estimation est alors un majorant, borné par le budget de
+    temps de chaque simulation. Avec les nombres aléatoires communs, le balayage de sigma
+    ne coûte qu'une simulation.
+    """
+    if experiment_type == 'qmc_vs_mc':
+        return len(QMC_COMPARED_SAMPLINGS) * QMC_REPLICATIONS * _comparison_path_counts(num_paths)[-1] * ESTIMATED_MS_PER_PATH
+    runs = len(SIGMA_SWEEP) if experiment_type == 'vary_sigma' and not common_random_numbers else 1
+    per_run_ms = num_paths * ESTIMATED_MS_PER_PATH
+    if time_budget_ms is not None:
+        per_run_ms = min(per_run_ms, time_budget_ms)
+    return runs * per_run_ms
+
+def _comparison_path_counts(num_paths: int) -> list:
+    """Nombres de trajectoires de la comparaison MC / QMC : puissances de 2 de QMC_MIN_PATHS à num_paths."""
+    counts = [QMC_MIN_PATHS]
+    while counts[-1] * 2 <= num_paths:
+        counts.append(counts[-1] * 2)
+    return counts
+
+def replicated_standard_errors(make_sampler, path_counts, num_replications: int = QMC_REPLICATIONS):
+    """
+    Erreur standard de l'estimateur des facteurs d'actualisation (la plus grande de la grille)
+    pour chaque nombre de trajectoires de path_counts, mesurée par l'écart-type de
+    num_replications estimations indépendantes : valable aussi pour le QMC randomisé, où les
+    trajectoires d'une même séquence ne sont pas indépendantes. make_sampler(r) renvoie
+    l'échantillonneur de la répétition r ; les estimations à path_counts[i] trajectoires sont
+    les préfixes d'une même simulation.
+    """
+    estimates = []
+    for replication in range(num_replications):
+        draw = make_sampler(replication)
+        total, simulated, row = 0.0, 0, []
+        for count in path_counts:
+            total = total + draw(count - simulated).sum(axis=0)
+            simulated = count
+            row.append(total / count)
+        estimates.append(row)
+    return np.max(np.std(np.array(estimates), axis=0, ddof=1), axis=-1)
+
+def _experiment_curve():
+    return ql.FlatForward(EXPERIMENT_DATE, ql.QuoteHandle(ql.SimpleQuote(EXPERIMENT_FORWARD_RATE)),
+                          ql.Thirty360(ql.Thirty360.BondBasis))
+
+def _theoretical_vol(spot_curve, a, sigma, term):
+    """Écart-type théorique (en %) du facteur d'actualisation D(0,T) pour chaque maturité de term."""
+    V = lambda t, T, a_param, sigma_param: sigma_param**2/a_param**2 * (T-t + 2/a_param*math.exp(-a_param*(T-t)) - 1/(2*a_param)*math.exp(-2*a_param*(T-t)) - 3/(2*a_param))
+    return [100*np.sqrt(math.exp(V(0,T,a,sigma))-1.0) * spot_curve.discount(T) for T in term]
+
+@isolated_evaluation_date
+def run_convergence_experiment(experiment_type: str, a: float, sigma: float, num_paths: int, seed: int,
+                               target_std_error: float = None, time_budget_ms: float = None,
+                               integration: str = 'simpson', common_random_numbers: bool = True,
+                               sampling: str = 'pseudo'):
     """
     Exécute une expérience de convergence Monte Carlo pour Hull-White.
+    Avec un nombre fixe de trajectoires (uses_shards), les trajectoires sont simulées par
+    tranches réparties sur les workers du pool, avec un résultat indépendant de leur nombre ;
+    il faut alors appeler la fonction depuis le processus web (dans un worker, les tranches
+    s'exécutent l'une après l'autre).
+    sampling choisit des tirages pseudo-aléatoires ou une séquence de Sobol construite par pont
+    brownien (compute.qmc) ; en QMC l'erreur standard affichée suppose des tirages indépendants.
+    'qmc_vs_mc' compare l'erreur des deux méthodes pour 64, 128, ... jusqu'à num_paths
+    trajectoires (sampling et critères d'arrêt ignorés).
+    Les facteurs d'actualisation exp(-∫r dt) sont intégrés par la règle de Simpson ou des
+    trapèzes (integration), pour tous les points de la grille en une passe.
+    Pour 'vary_sigma', common_random_numbers simule toutes les valeurs de sigma ensemble à
+    partir des mêmes tirages ; sinon chaque sigma a son propre flux aléatoire (issu de seed).
+    En mode adaptatif (target_std_error et/ou time_budget_ms), les trajectoires sont simulées
+    par lots jusqu'à ce que l'erreur standard des facteurs d'actualisation atteigne la
+    tolérance ou que le budget soit épuisé ; num_paths sert alors de plafond.
     """
     # --- Setup commun ---
-    today = ql.Date(15, 1, 2015)
-    ql.Settings.instance().evaluationDate = today
-    timestep = 180
-    length = 15
-    forward_rate = 0.05
-    day_count = ql.Thirty360(ql.Thirty360.BondBasis)
-    avg_grid_array = np.arange(12, timestep + 1, 12)
-    
-    spot_curve = ql.FlatForward(today, ql.QuoteHandle(ql.SimpleQuote(forward_rate)), day_count)
-    spot_curve_handle = ql.YieldTermStructureHandle(spot_curve)
+    # Pas de date d'évaluation ici : la courbe a une date de référence fixe, et les tranches
+    # envoyées au pool fixent la leur (attendre le pool en tenant la date bloquerait les
+    # autres requêtes)
+    timestep = EXPERIMENT_TIMESTEP
+    length = EXPERIMENT_LENGTH
+    avg_grid_array = EXPERIMENT_GRID
+    spot_curve = _experiment_curve()
 
     if experiment_type == 'vary_sigma':
         plots = []
-        sigma_array = np.arange(0.01, 0.1, 0.03)
-        for s_exp in sigma_array:
-            hw_process = ql.HullWhiteProcess(spot_curve_handle, abs(a), abs(s_exp))
-            seq = get_path_generator(timestep, hw_process, length, seed)
-            time, paths = generate_paths(num_paths, timestep, seq)
-            
-            zero_price_theory = np.array([spot_curve.discount(time[j]) for j in avg_grid_array])
-            avgs = [np.mean([math.exp(-simpson(paths[i, :j+1], x=time[:j+1])) for i in range(num_paths)]) for j in avg_grid_array]
-            term = [time[j] for j in avg_grid_array]
+        time = np.linspace(0.0, length, timestep + 1)
+        start = perf_counter()
+        if common_random_numbers:
+            if uses_shards(experiment_type, target_std_error, time_budget_ms, common_random_numbers):
+                sweep_run = _sharded_run(experiment_type, a, sigma, num_paths, seed, integration, sampling)
+            else:
+                draw = sweep_discount_factor_sampler(spot_curve, abs(a), np.abs(SIGMA_SWEEP), timestep, length, seed, avg_grid_array, integration, sampling)
+                sweep_run = simulate_discount_factors(draw, num_paths, target_std_error, time_budget_ms)
+            # Une simulation pour tout le balayage : mêmes trajectoires pour chaque sigma
+            runs = [sweep_run] * len(SIGMA_SWEEP)
+            means = sweep_run['stats'].mean
+        else:
+            seeds = np.random.SeedSequence(seed).spawn(len(SIGMA_SWEEP))
+            runs = [
+                simulate_discount_factors(
+                    discount_factor_sampler(spot_curve, abs(a), abs(s_exp), timestep, length, s_seed, avg_grid_array, integration, sampling),
+                    num_paths, target_std_error, time_budget_ms
+                )
+                for s_exp, s_seed in zip(SIGMA_SWEEP, seeds)
+            ]
+            means = [run['stats'].mean for run in runs]
+        sweep_ms = (perf_counter() - start) * 1000
+
+        zero_price_theory = np.array([spot_curve.discount(time[j]) for j in avg_grid_array])
+        term = [time[j] for j in avg_grid_array]
+        for s_exp, avgs in zip(SIGMA_SWEEP, means):
             errors = np.abs(zero_price_theory - np.array(avgs))
-            
             plots.append({'label': f'Sigma = {s_exp:.2f}', 'points': [{'x': t, 'y': e} for t, e in zip(term, errors)]})
-        return {'title': f'DF Error for a={a:.2f}', 'plots': plots, 'y_axis': 'Absolute Error |ε(T)|'}
+        return {
+            'title': f'DF Error for a={a:.2f}', 'plots': plots, 'y_axis': 'Absolute Error |ε(T)|',
+            'paths_used': [run['num_samples'] for run in runs],
+            'achieved_std_error': max(run['std_error'] for run in runs),
+            'stop_reason': runs[-1]['stop_reason'],
+            'common_random_numbers': common_random_numbers,
+            'sweep_ms': round(sweep_ms, 1),
+        }
 
     elif experiment_type == 'vol_dist':
-        hw_process = ql.HullWhiteProcess(spot_curve_handle, abs(a), abs(sigma))
-        seq = get_path_generator(timestep, hw_process, length, seed)
-        time, paths = generate_paths(num_paths, timestep, seq)
-        
-        discount_factor_matrix = np.array([[np.exp(-simpson(paths[i, :j+1], x=time[:j+1])) for j in avg_grid_array] for i in range(num_paths)])
+        time = np.linspace(0.0, length, timestep + 1)
+        if uses_shards(experiment_type, target_std_error, time_budget_ms):
+            run = _sharded_run(experiment_type, a, sigma, num_paths, seed, integration, sampling)
+        else:
+            draw = discount_factor_sampler(spot_curve, abs(a), abs(sigma), timestep, length, seed, avg_grid_array, integration, sampling)
+            run = simulate_discount_factors(draw, num_paths, target_std_error, time_budget_ms)
         term = [time[j] for j in avg_grid_array]
         
-        vol_empirical = [np.var(discount_factor_matrix[:, i]) for i in range(len(term))]
+        vol_empirical = run['stats'].variance
         vol_empirical_sqrt = 100 * np.sqrt(vol_empirical)
 
-        V = lambda t, T, a_param, sigma_param: sigma_param**2/a_param**2 * (T-t + 2/a_param*math.exp(-a_param*(T-t)) - 1/(2*a_param)*math.exp(-2*a_param*(T-t)) - 3/(2*a_param))
-        vol_theory = [100*np.sqrt(math.exp(V(0,T,a,sigma))-1.0) * spot_curve_handle.discount(T) for T in term]
+        vol_theory = _theoretical_vol(spot_curve, a, sigma, term)
 
         return {
             'title': f'Discount Factor StdDev (a={a:.2f}, σ={sigma:.2f})',
@@ -75,7 +279,162 @@ def run_convergence_experiment(experiment_type: str, a: float, sigma: float, num
                 {'label': 'Empirical Vol', 'points': [{'x': t, 'y': v} for t, v in zip(term, vol_empirical_sqrt)]},
                 {'label': 'Theoretical Vol', 'points': [{'x': t, 'y': v} for t, v in zip(term, vol_theory)]}
             ],
-            'y_axis': 'Std Dev σ_D(0,T) (%)'
+            'y_axis': 'Std Dev σ_D(0,T) (%)',
+            'paths_used': [run['num_samples']],
+            'achieved_std_error': run['std_error'],
+            'stop_reason': run['stop_reason'],
         }
-    
-    return {}
\ No newline at end of file
+
+    elif experiment_type == 'qmc_vs_mc':
+        path_counts = _comparison_path_counts(num_paths)
+        seeds = np.random.SeedSequence(seed).spawn(QMC_REPLICATIONS)
+        plots, errors = [], {}
+        for method, label in QMC_COMPARED_SAMPLINGS:
+            errors[method] = replicated_standard_errors(
+                lambda r: discount_factor_sampler(spot_curve, abs(a), abs(sigma), timestep, length, seeds[r],
+                                                  avg_grid_array, integration, method),
+                path_counts
+            )
+            plots.append({'label': label, 'points': [{'x': n, 'y': e} for n, e in zip(path_counts, errors[method])]})
+        # Trajectoires pseudo-aléatoires nécessaires pour l'erreur du QMC : l'erreur décroît en 1/sqrt(n)
+        path_ratio = (errors['pseudo'][-1] / errors['sobol_scrambled'][-1])**2
+        return {
+            'title': f'MC vs QMC Std Error of DF (a={a:.2f}, σ={sigma:.2f})',
+            'plots': plots,
+            'y_axis': f'Std Error (max over T, {QMC_REPLICATIONS} replications)',
+            'x_axis': 'Number of Paths', 'log_scale': True,
+            'paths_used': [path_counts[-1]] * len(QMC_COMPARED_SAMPLINGS),
+            'achieved_std_error': float(errors['sobol_scrambled'][-1]),
+            'stop_reason': None,
+            'qmc_path_ratio': np.round(path_ratio, 1),
+        }
+
+    return {}
+
+# --- Tranches réparties sur le pool, flux SSE ---
+
+@isolated_evaluation_date
+def convergence_shard_statistics(experiment_type: str, a: float, sigma: float, seed: int, integration: str,
+                                 sampling: str, shard_index: int, num_paths: int) -> RunningStatistics:
+    """
+    Simule une tranche de trajectoires de l'expérience (tâche du pool) et renvoie ses
+    statistiques. La tranche a son propre flux aléatoire (compute.sharding.shard_generator) :
+    le résultat ne dépend ni de l'ordre d'exécution des tranches ni du worker qui les simule.
+    """
+    set_evaluation_date(EXPERIMENT_DATE)
+    spot_curve = _experiment_curve()
+    rng = shard_generator(seed, shard_index, EXPERIMENT_TIMESTEP, sampling, CONVERGENCE_SHARD_SIZE)
+    if experiment_type == 'vary_sigma':
+        draw = sweep_discount_factor_sampler(spot_curve, abs(a), np.abs(SIGMA_SWEEP), EXPERIMENT_TIMESTEP,
+                                             EXPERIMENT_LENGTH, rng, EXPERIMENT_GRID, integration)
+    else:
+        draw = discount_factor_sampler(spot_curve, abs(a), abs(sigma), EXPERIMENT_TIMESTEP,
+                                       EXPERIMENT_LENGTH, rng, EXPERIMENT_GRID, integration)
+    stats = RunningStatistics()
+    stats.update(draw(num_paths))
+    return stats
+
+def uses_shards(experiment_type: str, target_std_error: float = None, time_budget_ms: float = None,
+                common_random_numbers: bool = True) -> bool:
+    """
+    Vrai quand run_convergence_experiment répartit ses trajectoires en tranches sur le pool :
+    nombre fixe de trajectoires, une seule simulation (vol_dist, ou vary_sigma avec nombres
+    aléatoires communs). Il faut alors l'appeler depuis le processus web.
+    """
+    if target_std_error is not None or time_budget_ms is not None:
+        return False
+    return experiment_type == 'vol_dist' or (experiment_type == 'vary_sigma' and common_random_numbers)
+
+def simulate_convergence_shards(experiment_type: str, a: float, sigma: float, num_paths: int, seed: int,
+                                integration: str = 'simpson', sampling: str = 'pseudo', lane: str = CONVERGENCE_LANE):
+    """
+    Générateur : simule num_paths trajectoires par tranches de CONVERGENCE_SHARD_SIZE sur les
+    workers du pool et produit les statistiques cumulées après chaque tranche. Les tranches
+    sont fusionnées dans l'ordre : pour un seed donné, le résultat est identique quel que
+    soit le nombre de workers. Fermer le générateur annule les tranches non lancées.
+    """
+    stats = RunningStatistics()
+    shards = map_shards(lane, convergence_shard_statistics, (experiment_type, a, sigma, seed, integration, sampling),
+                        num_paths, CONVERGENCE_SHARD_SIZE)
+    try:
+        for shard_stats in shards:
+            stats.merge(shard_stats)
+            yield stats
+    finally:
+        shards.close()
+
+def convergence_snapshot(experiment_type: str, a: float, sigma: float, stats: RunningStatistics) -> dict:
+    """
+    Estimations courantes de l'expérience à partir des statistiques accumulées : une série par
+    courbe du graphique, avec sa bande de confiance à 95 % (low/high).
+    """
+    spot_curve = _experiment_curve()
+    term = EXPERIMENT_GRID * EXPERIMENT_LENGTH / EXPERIMENT_TIMESTEP
+    std_error = stats.std_error
+    series = []
+    if experiment_type == 'vary_sigma':
+        zero_price_theory = np.array([spot_curve.discount(T) for T in term])
+        for s_exp, means, errors in zip(SIGMA_SWEEP, stats.mean, std_error):
+            gap = np.abs(zero_price_theory - means)
+            series.append({
+                'label': f'Sigma = {s_exp:.2f}',
+                'points': [{'x': t, 'y': e, 'low': max(e - 1.96 * se, 0.0), 'high': e + 1.96 * se}
+                           for t, e, se in zip(term, gap, errors)],
+            })
+        title, y_axis = f'DF Error for a={a:.2f}', 'Absolute Error |ε(T)|'
+    else:
+        vol = 100 * np.sqrt(stats.variance)
+        # Erreur standard de l'écart-type empirique (approximation gaussienne)
+        vol_error = vol / np.sqrt(2 * max(stats.count - 1, 1))
+        series.append({
+            'label': 'Empirical Vol',
+            'points': [{'x': t, 'y': v, 'low': v - 1.96 * e, 'high': v + 1.96 * e} for t, v, e in zip(term, vol, vol_error)],
+        })
+        series.append({
+            'label': 'Theoretical Vol',
+            'points': [{'x': t, 'y': v} for t, v in zip(term, _theoretical_vol(spot_curve, a, sigma, term))],
+        })
+        title, y_axis = f'Discount Factor StdDev (a={a:.2f}, σ={sigma:.2f})', 'Std Dev σ_D(0,T) (%)'
+    return {
+        'title': title, 'y_axis': y_axis, 'series': series,
+        'paths': stats.count, 'std_error': float(np.max(std_error)),
+    }
+
+def can_stream(experiment_type: str, common_random_numbers: bool = True) -> bool:
+    """
+    Vrai quand l'expérience peut être suivie en direct : le flux simule une seule suite de
+    tranches, donc le balayage de sigma uniquement avec des nombres aléatoires communs.
+    """
+    return experiment_type in STREAMED_EXPERIMENTS and (experiment_type != 'vary_sigma' or common_random_numbers)
+
+def stream_convergence_experiment(experiment_type: str, a: float, sigma: float, num_paths: int, seed: int,
+                                  target_std_error: float = None, time_budget_ms: float = None,
+                                  integration: str = 'simpson', sampling: str = 'pseudo'):
+    """
+    Générateur : simule l'expérience par tranches (simulate_convergence_shards, sur le couloir
+    'fast') et produit un instantané (convergence_snapshot) après chaque tranche. Les
+    statistiques sont fusionnées au fil de l'eau : la mémoire reste constante quel que soit
+    le nombre de trajectoires. Le flux s'arrête à num_paths, à l'erreur standard cible ou au
+    budget de temps ; le dernier instantané porte la raison de l'arrêt.
+    Fermer le générateur (client déconnecté) annule les tranches qui n'ont pas été lancées.
+    'vary_sigma' est simulé avec des nombres aléatoires communs (voir can_stream).
+    """
+    start = perf_counter()
+    shards = simulate_convergence_shards(experiment_type, a, sigma, num_paths, seed, integration, sampling, STREAM_LANE)
+    try:
+        for stats in shards:
+            snapshot = convergence_snapshot(experiment_type, a, sigma, stats)
+            elapsed_ms = (perf_counter() - start) * 1000
+            stop_reason = None
+            if target_std_error is not None and snapshot['std_error'] <= target_std_error:
+                stop_reason = 'tolerance'
+            elif time_budget_ms is not None and elapsed_ms >= time_budget_ms:
+                stop_reason = 'time_budget'
+            elif stats.count >= num_paths:
+                stop_reason = 'max_samples'
+            snapshot.update({'elapsed_ms': round(elapsed_ms, 1), 'stop_reason': stop_reason})
+            yield snapshot
+            if stop_reason is not None:
+                return
+    finally:
+        shards.close()
@@ -1,3 +1,49 @@
-from django.test import TestCase
+import numpy as np
+from django.test import SimpleTestCase, TestCase, override_settings
+from scipy.integrate import cumulative_trapezoid, simpson
 
-# Create your tests here.
+from compute.jobs import to_jsonable
+from compute.pool import shutdown_pools
+from .services import CONVERGENCE_SHARD_SIZE, cumulative_integral, run_convergence_experiment
+
+
+class CumulativeIntegralTests(SimpleTestCase):
+    """cumulative_integral reproduit scipy sur chaque préfixe de la grille."""
+
+    def setUp(self):
+        self.dt = 0.05
+        self.values = np.random.default_rng(3).normal(1.0, 0.3, size=(4, 12))
+
+    def test_simpson_matches_scipy_on_every_prefix(self):
+        integrals = cumulative_integral(self.values, self.dt, 'simpson')
+        np.testing.assert_array_equal(integrals[:, 0], 0.0)
+        for j in range(1, self.values.shape[1]):
+            with self.subTest(intervals=j):
+                np.testing.assert_allclose(integrals[:, j], simpson(self.values[:, :j + 1], dx=self.dt), rtol=1e-12, atol=1e-14)
+
+    def test_trapezoid_matches_scipy(self):
+        expected = cumulative_trapezoid(self.values, dx=self.dt, initial=0.0)
+        np.testing.assert_allclose(cumulative_integral(self.values, self.dt, 'trapezoid'), expected, rtol=1e-12, atol=1e-14)
+
+
+# Les tranches ne passent que par le pool : aucun cache de trajectoires en jeu
+class ShardedExperimentTests(TestCase):
+    """run_convergence_experiment donne le même résultat quel que soit le nombre de workers."""
+
+    PARAMS = {'a': 0.1, 'sigma': 0.1, 'num_paths': 2 * CONVERGENCE_SHARD_SIZE + 500, 'seed': 42}
+
+    def tearDown(self):
+        shutdown_pools()
+
+    def test_results_do_not_depend_on_the_number_of_workers(self):
+        for experiment_type in ('vol_dist', 'vary_sigma'):
+            runs = []
+            for workers in (0, 1, 3):
+                shutdown_pools()
+                with override_settings(QL_COMPUTE_POOLS={'fast': {'workers': 0}, 'slow': {'workers': workers}}):
+                    results = run_convergence_experiment(experiment_type, **self.PARAMS)
+                results.pop('sweep_ms', None)
+                runs.append(to_jsonable(results))
+            with self.subTest(experiment_type=experiment_type):
+                self.assertEqual(runs[0], runs[1])
+                self.assertEqual(runs[0], runs[2])
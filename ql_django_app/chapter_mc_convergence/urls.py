@@ -4,4 +4,5 @@ from . import views
 app_name = 'chapter_mc_convergence'
 urlpatterns = [
     path('', views.convergence_lab_view, name='convergence_lab'),
+    path('stream/', views.convergence_stream_view, name='convergence_stream'),
 ]
\ No newline at end of file
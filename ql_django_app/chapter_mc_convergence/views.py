@@ -1,17 +1,87 @@
-from django.shortcuts import render
+import json
+
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import render, redirect
 from .forms import ConvergenceForm
 from . import services
+from compute.pool import run_in_pool
+from compute.jobs import get_job, should_run_as_job, submit_job, to_jsonable
 
 def convergence_lab_view(request):
     form = ConvergenceForm(request.POST or None)
     results = None
+    job = None
     if request.method == 'POST' and form.is_valid():
-        results = services.run_convergence_experiment(
-            experiment_type=form.cleaned_data['experiment_type'],
-            a=form.cleaned_data['a'],
-            sigma=form.cleaned_data['sigma'],
-            num_paths=form.cleaned_data['num_paths'],
-            seed=form.cleaned_data['seed']
+        params = {
+            'experiment_type': form.cleaned_data['experiment_type'],
+            'a': form.cleaned_data['a'],
+            'sigma': form.cleaned_data['sigma'],
+            'num_paths': form.cleaned_data['num_paths'],
+            'seed': form.cleaned_data['seed'],
+            'target_std_error': form.cleaned_data['target_std_error'],
+            'time_budget_ms': form.cleaned_data['time_budget_ms'],
+            'integration': form.cleaned_data['integration'],
+            'common_random_numbers': form.cleaned_data['common_random_numbers'],
+            'sampling': form.cleaned_data['sampling'],
+        }
+        # Les grosses simulations partent en tâche de fond au-delà du seuil de coût
+        estimated_cost_ms = services.estimate_experiment_cost_ms(
+            params['experiment_type'], params['num_paths'], params['time_budget_ms'], params['common_random_numbers']
+        )
+        # Nombre fixe de trajectoires : la fonction répartit elle-même ses tranches sur le pool
+        fan_out = services.uses_shards(
+            params['experiment_type'], params['target_std_error'], params['time_budget_ms'], params['common_random_numbers']
         )
-    context = {'form': form, 'results': results}
-    return render(request, 'chapter_mc_convergence/convergence_lab.html', context)
\ No newline at end of file
+        if should_run_as_job(estimated_cost_ms):
+            job = submit_job(services.run_convergence_experiment, params, estimated_cost_ms, in_thread=fan_out)
+            return redirect(f"{request.path}?job={job.pk}")
+        if fan_out:
+            results = services.run_convergence_experiment(**params)
+        else:
+            results = run_in_pool('slow', services.run_convergence_experiment, **params)
+    elif request.method == 'GET':
+        job = get_job(request.GET.get('job'))
+        if job is not None:
+            form = ConvergenceForm(initial=job.params)
+            results = job.result
+    context = {'form': form, 'results': results, 'job': job, 'streamed_experiments': services.STREAMED_EXPERIMENTS}
+    return render(request, 'chapter_mc_convergence/convergence_lab.html', context)
+
+
+def convergence_stream_view(request):
+    """
+    Flux Server-Sent Events de l'expérience (paramètres du formulaire en GET) : un événement
+    'progress' après chaque tour de lots, avec les estimations courantes et leurs bandes de
+    confiance, puis 'done' (ou 'error'). Quand le client se déconnecte, le serveur ferme le
+    générateur et les lots restants ne sont pas simulés.
+    """
+    form = ConvergenceForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+    if form.cleaned_data['experiment_type'] not in services.STREAMED_EXPERIMENTS:
+        return JsonResponse({'errors': {'experiment_type': ['This experiment cannot be streamed.']}}, status=400)
+    if not services.can_stream(form.cleaned_data['experiment_type'], form.cleaned_data['common_random_numbers']):
+        return JsonResponse({'errors': {'common_random_numbers': ['The sigma sweep can only be streamed with common random numbers.']}}, status=400)
+    stream = services.stream_convergence_experiment(
+        form.cleaned_data['experiment_type'], form.cleaned_data['a'], form.cleaned_data['sigma'],
+        form.cleaned_data['num_paths'], form.cleaned_data['seed'],
+        target_std_error=form.cleaned_data['target_std_error'],
+        time_budget_ms=form.cleaned_data['time_budget_ms'],
+        integration=form.cleaned_data['integration'],
+        sampling=form.cleaned_data['sampling'],
+    )
+
+    def events():
+        try:
+            for snapshot in stream:
+                yield f"event: progress\ndata: {json.dumps(to_jsonable(snapshot))}\n\n"
+            yield "event: done\ndata: {}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'error': f'{type(e).__name__}: {e}'})}\n\n"
+        finally:
+            stream.close()
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -1,6 +1,8 @@
 import QuantLib as ql
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
 
 
+@isolated_evaluation_date
 def analyze_coupon_details(convention_str: str):
     """
     Deconstructs a floating-rate coupon to illustrate the difference between
@@ -8,7 +10,7 @@ def analyze_coupon_details(convention_str: str):
     user-selected business day convention.
     """
     today = ql.Date(7, ql.January, 2013)
-    ql.Settings.instance().evaluationDate = today
+    set_evaluation_date(today)
     
     # 1. Forward curve from the notebook
     dates, forwards = zip(*[
@@ -1,6 +1,7 @@
 from django.shortcuts import render
 from .forms import ConventionChoiceForm
 from . import services
+from compute.pool import run_in_pool
 
 def coupon_lab_view(request):
     # On initialise les variables
@@ -14,14 +15,14 @@ def coupon_lab_view(request):
         if form.is_valid():
             # Si oui, on appelle le service avec la NOUVELLE donnée du formulaire
             convention = form.cleaned_data['business_day_convention']
-            analysis = services.analyze_coupon_details(convention_str=convention)
+            analysis = run_in_pool('fast', services.analyze_coupon_details, convention_str=convention)
     
     # Si la requête est un GET (premier chargement de la page)
     else:
         form = ConventionChoiceForm()
         # On effectue un premier calcul avec la valeur par défaut pour afficher un résultat
         convention = form.fields['business_day_convention'].initial
-        analysis = services.analyze_coupon_details(convention_str=convention)
+        analysis = run_in_pool('fast', services.analyze_coupon_details, convention_str=convention)
 
     # On prépare le contexte et on rend la page
     context = {'form': form, 'analysis': analysis}
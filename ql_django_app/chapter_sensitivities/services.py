@@ -1,13 +1,15 @@
 import QuantLib as ql
 import numpy as np
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
 
+@isolated_evaluation_date
 def build_base_swap_and_curve():
     """
     Creates the base environment: a vanilla swap and its initial yield curve.
     Returns the swap, the base curve, and a relinkable handle to the curve.
     """
     today = ql.Date(8, ql.March, 2016)
-    ql.Settings.instance().evaluationDate = today
+    set_evaluation_date(today)
     
     # --- 1. Build the initial yield curve from market data ---
     helpers = []
@@ -45,6 +47,7 @@ def build_base_swap_and_curve():
     return swap, rate_curve, curve_handle
 
 
+@isolated_evaluation_date
 def analyze_sensitivity(shock_type: str, shock_size_bps: float):
     """
     Analyzes the sensitivity of a swap's NPV to a specified yield curve shock.
@@ -1,6 +1,7 @@
 from django.shortcuts import render
 from .forms import SensitivityForm
 from . import services
+from compute.pool import run_in_pool
 
 def sensitivity_lab_view(request):
     form = SensitivityForm(request.POST or None)
@@ -14,7 +15,7 @@ def sensitivity_lab_view(request):
         shock_type = form.fields['shock_type'].initial
         shock_size = form.fields['shock_size_bps'].initial
             
-    results = services.analyze_sensitivity(
+    results = run_in_pool('fast', services.analyze_sensitivity,
         shock_type=shock_type,
         shock_size_bps=shock_size
     )
@@ -1,12 +1,14 @@
 import QuantLib as ql
 from datetime import date
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
 
+@isolated_evaluation_date
 def build_treasury_curve(evaluation_dt: date, interpolation_str: str, market_rates: dict):
     """
     Builds a Treasury yield curve using market rates and parameters provided by the user.
     """
     eval_date = ql.Date(evaluation_dt.day, evaluation_dt.month, evaluation_dt.year)
-    ql.Settings.instance().evaluationDate = eval_date
+    set_evaluation_date(eval_date)
     
     # 1. Use the market rates from the form
     deposits_data = {
@@ -1,6 +1,7 @@
 from django.shortcuts import render
 from .forms import CurveConstructionForm
 from . import services
+from compute.pool import run_in_pool
 
 def curve_lab_view(request):
     form = CurveConstructionForm(request.POST or None)
@@ -28,7 +29,7 @@ def curve_lab_view(request):
             'bond_10y_rate': form.fields['bond_10y_rate'].initial,
         }
             
-    plot_points = services.build_treasury_curve(
+    plot_points = run_in_pool('fast', services.build_treasury_curve,
         evaluation_dt=eval_dt,
         interpolation_str=interpolation,
         market_rates=market_rates # Pass the rates to the service
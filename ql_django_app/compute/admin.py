@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import ComputeJob
+
+
+@admin.register(ComputeJob)
+class ComputeJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'task', 'status', 'estimated_cost_ms', 'created_at', 'finished_at')
+    list_filter = ('status', 'task')
+    readonly_fields = ('key', 'created_at', 'started_at', 'finished_at')
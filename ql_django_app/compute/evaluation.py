@@ -0,0 +1,167 @@
+import QuantLib as ql
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+
+
+class _EvaluationDateGate:
+    """
+    Guards QuantLib's process-global evaluation date.
+
+    Any number of threads may hold the gate at the same time as long as they all want the
+    same evaluation date; a thread asking for another date waits until the gate is empty.
+    The date found when the first holder entered is restored when the last one leaves.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._active_serial = None
+        self._holders = 0
+        self._previous_date = None
+
+    def acquire(self, serial: int):
+        with self._condition:
+            while self._holders > 0 and self._active_serial != serial:
+                self._condition.wait()
+            if self._holders == 0:
+                self._previous_date = ql.Settings.instance().evaluationDate
+                self._active_serial = serial
+                ql.Settings.instance().evaluationDate = ql.Date(serial)
+            self._holders += 1
+
+    def release(self):
+        with self._condition:
+            self._holders -= 1
+            if self._holders == 0:
+                ql.Settings.instance().evaluationDate = self._previous_date
+                self._active_serial = None
+                self._condition.notify_all()
+
+
+_gate = _EvaluationDateGate()
+_local = threading.local()
+
+
+def _to_ql_date(value) -> ql.Date:
+    if isinstance(value, ql.Date):
+        return value
+    return ql.Date(value.day, value.month, value.year)
+
+
+def _switch_to(serial):
+    """Moves the current thread's hold on the gate to another date (or to none)."""
+    held = getattr(_local, 'held', None)
+    if held == serial:
+        return
+    if held is not None:
+        _gate.release()
+        _local.held = None
+    if serial is not None:
+        _gate.acquire(serial)
+        _local.held = serial
+
+
+def set_evaluation_date(evaluation_dt):
+    """
+    Sets the QuantLib evaluation date for the rest of the enclosing isolated scope.
+
+    Must be called inside a function decorated with isolated_evaluation_date (or inside an
+    evaluation_date block). The call blocks while other threads compute with another date,
+    and the scope keeps the date in place until it exits.
+
+    Args:
+        evaluation_dt: A QuantLib Date or a datetime.date.
+    """
+    if not getattr(_local, 'frames', None):
+        raise RuntimeError("set_evaluation_date must be called inside an isolated_evaluation_date scope.")
+    _switch_to(_to_ql_date(evaluation_dt).serialNumber())
+
+
+@contextmanager
+def evaluation_date_scope():
+    """
+    Opens an isolated scope: every evaluation date set inside it is protected against other
+    threads until the scope exits. On exit, the date of the enclosing scope is put back; if
+    the enclosing scope had not set one yet, it inherits the inner date (so helpers may set
+    the date for their caller), and the outermost scope releases it.
+    """
+    if not hasattr(_local, 'frames'):
+        _local.frames = []
+    _local.frames.append(getattr(_local, 'held', None))
+    try:
+        yield
+    finally:
+        outer = _local.frames.pop()
+        if outer is not None or not _local.frames:
+            _switch_to(outer)
+
+
+@contextmanager
+def evaluation_date(evaluation_dt):
+    """Isolated scope with the given evaluation date already set."""
+    with evaluation_date_scope():
+        set_evaluation_date(evaluation_dt)
+        yield
+
+
+def isolated_evaluation_date(func):
+    """Decorator running a service inside its own evaluation_date_scope."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with evaluation_date_scope():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+# --- Worker processes pinned to an evaluation date ---
+
+_date_pools = OrderedDict()
+_date_pools_lock = threading.Lock()
+
+
+def _pin_worker(serial: int):
+    ql.Settings.instance().evaluationDate = ql.Date(serial)
+
+
+def _run_pinned(serial: int, func, args, kwargs):
+    with evaluation_date(ql.Date(serial)):
+        return func(*args, **kwargs)
+
+
+def _pool_for(serial: int) -> ProcessPoolExecutor:
+    max_pools = getattr(settings, 'QL_DATE_PINNED_POOLS', 4)
+    workers = getattr(settings, 'QL_DATE_PINNED_WORKERS', 0)
+    with _date_pools_lock:
+        pool = _date_pools.get(serial)
+        if pool is None:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_pin_worker, initargs=(serial,))
+            _date_pools[serial] = pool
+            while len(_date_pools) > max_pools:
+                _, evicted = _date_pools.popitem(last=False)
+                evicted.shutdown(wait=False)
+        _date_pools.move_to_end(serial)
+        return pool
+
+
+def run_at_evaluation_date(evaluation_dt, func, *args, **kwargs):
+    """
+    Runs func(*args, **kwargs) with the given evaluation date.
+
+    When settings.QL_DATE_PINNED_WORKERS is positive, the call is sent to a pool of worker
+    processes whose evaluation date is pinned to that date (one pool per date, at most
+    settings.QL_DATE_PINNED_POOLS of them), so requests for different dates run in parallel
+    on different cores instead of waiting for each other. Otherwise it runs in the calling
+    thread inside an evaluation_date block. func and its arguments must be picklable.
+
+    Args:
+        evaluation_dt (date): The evaluation date (a datetime.date or a QuantLib Date).
+    """
+    serial = _to_ql_date(evaluation_dt).serialNumber()
+    if getattr(settings, 'QL_DATE_PINNED_WORKERS', 0) > 0:
+        return _pool_for(serial).submit(_run_pinned, serial, func, args, kwargs).result()
+    with evaluation_date(ql.Date(serial)):
+        return func(*args, **kwargs)
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.utils import timezone
+
+from .models import ComputeJob
+from .pool import lane_workers, submit_to_pool
+
+# Background jobs share the lane of the other long computations
+JOB_LANE = 'slow'
+
+_submit_lock = threading.Lock()
+_thread_executor = None
+
+
+def to_jsonable(value):
+    """Converts a service result (NumPy scalars and arrays, tuples...) to plain JSON data."""
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return to_jsonable(value.tolist())
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _task_name(func) -> str:
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def job_key(func, kwargs: dict) -> str:
+    payload = json.dumps({'task': _task_name(func), 'params': to_jsonable(kwargs)}, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def should_run_as_job(estimated_cost_ms: float) -> bool:
+    """True when a computation is expected to last longer than settings.QL_JOB_COST_THRESHOLD_MS."""
+    return estimated_cost_ms >= getattr(settings, 'QL_JOB_COST_THRESHOLD_MS', 500)
+
+
+def _execute_job(job_id, func, kwargs: dict):
+    """Runs a job and stores its outcome; executed in a worker process (or a background thread)."""
+    jobs = ComputeJob.objects.filter(pk=job_id)
+    try:
+        jobs.update(status=ComputeJob.RUNNING, started_at=timezone.now())
+        try:
+            result = to_jsonable(func(**kwargs))
+        except Exception as e:
+            jobs.update(status=ComputeJob.FAILED, error=f"{type(e).__name__}: {e}", finished_at=timezone.now())
+        else:
+            jobs.update(status=ComputeJob.DONE, result=result, finished_at=timezone.now())
+    finally:
+        connection.close()
+
+
+def _get_thread_executor() -> ThreadPoolExecutor:
+    global _thread_executor
+    if _thread_executor is None:
+        _thread_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='compute-job')
+    return _thread_executor
+
+
+def submit_job(func, kwargs: dict, estimated_cost_ms: float = None, in_thread: bool = False) -> ComputeJob:
+    """
+    Starts func(**kwargs) in the background and returns its ComputeJob row.
+
+    If an identical job (same function, same arguments) is still pending or running, that
+    job is returned instead of starting a new one. Jobs in flight for longer than
+    settings.QL_JOBS_STALE_AFTER seconds (e.g. lost in a server restart) are not reused.
+    The job runs on the 'slow' lane of the compute pool, or in a background thread of the
+    web process when that lane has no workers. Jobs that spread their own work over the
+    pool (e.g. with compute.sharding.map_shards) pass in_thread=True: they run in the
+    background thread, which only waits for their tasks, so those tasks use every worker.
+
+    Raises:
+        ComputePoolBusy: If the lane queue is full; no job is recorded then.
+    """
+    key = job_key(func, kwargs)
+    stale_after = timedelta(seconds=getattr(settings, 'QL_JOBS_STALE_AFTER', 3600))
+
+    with _submit_lock:
+        in_flight = ComputeJob.objects.filter(
+            key=key, status__in=ComputeJob.IN_FLIGHT, created_at__gte=timezone.now() - stale_after
+        ).first()
+        if in_flight is not None:
+            return in_flight
+
+        job = ComputeJob.objects.create(
+            key=key, task=_task_name(func), params=to_jsonable(kwargs), estimated_cost_ms=estimated_cost_ms
+        )
+        try:
+            if lane_workers(JOB_LANE) > 0 and not in_thread:
+                submit_to_pool(JOB_LANE, _execute_job, job.pk, func, kwargs)
+            else:
+                _get_thread_executor().submit(_execute_job, job.pk, func, kwargs)
+        except BaseException:
+            job.delete()
+            raise
+        return job
+
+
+def get_job(job_id):
+    """Returns the ComputeJob with this id, or None (also for a missing or malformed id)."""
+    if not job_id:
+        return None
+    try:
+        return ComputeJob.objects.filter(pk=uuid.UUID(str(job_id))).first()
+    except ValueError:
+        return None
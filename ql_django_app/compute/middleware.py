@@ -0,0 +1,25 @@
+from django.http import HttpResponse
+
+from .pool import ComputePoolBusy, ComputeTimeout
+
+
+class ComputePoolErrorMiddleware:
+    """
+    Turns the errors of the shared compute pool into proper HTTP answers:
+    503 (with Retry-After) when a lane queue is full, 504 when a task times out.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_exception(self, request, exception):
+        if isinstance(exception, ComputePoolBusy):
+            response = HttpResponse(str(exception), status=503, content_type='text/plain')
+            response['Retry-After'] = '5'
+            return response
+        if isinstance(exception, ComputeTimeout):
+            return HttpResponse(str(exception), status=504, content_type='text/plain')
+        return None
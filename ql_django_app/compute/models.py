@@ -0,0 +1,64 @@
+import uuid
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class ComputeJob(models.Model):
+    """A long computation run in the background (see compute.jobs)."""
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+    IN_FLIGHT = (PENDING, RUNNING)
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Hash of the task and its arguments, used to deduplicate identical in-flight jobs
+    key = models.CharField(max_length=64, db_index=True)
+    task = models.CharField(max_length=200)
+    params = models.JSONField(encoder=DjangoJSONEncoder)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    result = models.JSONField(encoder=DjangoJSONEncoder, null=True, blank=True)
+    error = models.TextField(blank=True)
+    estimated_cost_ms = models.FloatField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.task} [{self.status}]"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (self.DONE, self.FAILED)
+
+    @property
+    def elapsed_ms(self):
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return round((self.finished_at - self.started_at).total_seconds() * 1000, 1)
+
+    def as_dict(self, include_result: bool = True) -> dict:
+        data = {
+            'id': str(self.id),
+            'task': self.task,
+            'status': self.status,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'elapsed_ms': self.elapsed_ms,
+            'error': self.error,
+        }
+        if include_result:
+            data['result'] = self.result
+        return data
@@ -0,0 +1,95 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+# A run may put at most this fraction of the quota in the cache: a larger one would evict its
+# own first entries (and everyone else's) before it could ever be reused
+MAX_RUN_FRACTION = 0.5
+
+
+class PathCache:
+    """
+    On-disk cache of simulated arrays (path sets), one .npy file per key.
+
+    Entries are memory-mapped on read, so a hit costs the pages actually used rather than a
+    full copy. Every hit refreshes the modification time of its file, and when the files
+    exceed quota_bytes the least recently used ones are deleted. Writes go through a
+    temporary file and an atomic rename: the worker processes may share the directory, and a
+    reader never sees a partial file (on POSIX, a file deleted while memory-mapped stays
+    readable until it is unmapped). A run writing several entries checks accepts() first and
+    calls evict() once at the end, rather than rescanning the directory on every store.
+    """
+
+    def __init__(self, directory, quota_bytes: int):
+        self.directory = Path(directory)
+        self.quota_bytes = quota_bytes
+
+    @staticmethod
+    def key(params: dict) -> str:
+        """Hash of the parameters that determine an array (process, seed, layout...)."""
+        return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npy"
+
+    def load(self, key: str):
+        """The cached array (read-only memory map), or None."""
+        path = self._path(key)
+        try:
+            array = np.load(path, mmap_mode='r')
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return array
+
+    def accepts(self, nbytes: int) -> bool:
+        """True when a run storing nbytes in total is small enough to be cached (see MAX_RUN_FRACTION)."""
+        return nbytes <= self.quota_bytes * MAX_RUN_FRACTION
+
+    def store(self, key: str, array, evict: bool = True):
+        """Writes (or replaces) an entry, then (unless evict=False) evicts the least recently used ones over the quota."""
+        array = np.asarray(array)
+        if array.nbytes > self.quota_bytes:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                np.save(file, array)
+            os.replace(temporary, self._path(key))
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
+        if evict:
+            self.evict()
+
+    def evict(self):
+        """Deletes the least recently used entries until the cache fits in its quota."""
+        entries = []
+        if not self.directory.is_dir():
+            return
+        for path in self.directory.glob('*.npy'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.quota_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def get_path_cache():
+    """The cache configured by settings.QL_PATH_CACHE_DIR and QL_PATH_CACHE_QUOTA_MB, or None."""
+    directory = getattr(settings, 'QL_PATH_CACHE_DIR', None)
+    if directory is None:
+        return None
+    return PathCache(directory, int(getattr(settings, 'QL_PATH_CACHE_QUOTA_MB', 1024) * 2**20))
@@ -0,0 +1,228 @@
+import importlib
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+
+DEFAULT_LANES = {
+    'fast': {'workers': 2, 'queue_depth': 16, 'timeout': 30},
+    'slow': {'workers': 2, 'queue_depth': 4, 'timeout': 300},
+}
+
+
+class ComputePoolBusy(Exception):
+    """Raised when a lane already holds as many tasks as its queue depth allows."""
+
+
+class ComputeTimeout(Exception):
+    """Raised when a task did not finish within the timeout of its lane."""
+
+
+def _warm_worker():
+    """
+    Initializer of the worker processes: sets Django up and imports QuantLib, NumPy, SciPy
+    and every services module, so the first task sent to a worker does not pay for them.
+    """
+    import django
+    django.setup()
+
+    from django.apps import apps
+    for module_name in ['QuantLib', 'numpy', 'scipy.optimize', 'scipy.integrate']:
+        importlib.import_module(module_name)
+    for app_config in apps.get_app_configs():
+        try:
+            importlib.import_module(f"{app_config.name}.services")
+        except ModuleNotFoundError:
+            pass
+
+
+def _ping():
+    return True
+
+
+class _Lane:
+    """
+    One ProcessPoolExecutor with a bounded number of in-flight tasks (running + waiting).
+
+    Lanes are independent, so long calibrations sent to the 'slow' lane never hold the
+    workers that serve the interactive pricers of the 'fast' lane.
+    """
+
+    def __init__(self, name: str, workers: int, queue_depth: int, timeout: float):
+        self.name = name
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(workers + queue_depth)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_warm_worker,
+                )
+                # Start every worker now rather than on the first requests
+                for _ in range(self.workers):
+                    self._executor.submit(_ping)
+            return self._executor
+
+    def _reset(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, func, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            raise ComputePoolBusy(f"The '{self.name}' compute queue is full, please retry in a moment.")
+        executor = self._get_executor()
+        try:
+            future = executor.submit(func, *args, **kwargs)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed by the OS): start a fresh pool and try once more
+            self._reset(executor)
+            try:
+                future = self._get_executor().submit(func, *args, **kwargs)
+            except BaseException:
+                self._slots.release()
+                raise
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is given back when the task really ends, not when the caller stops waiting
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_lanes = {}
+_lanes_lock = threading.Lock()
+
+
+def _lane_settings(lane: str) -> dict:
+    configured = getattr(settings, 'QL_COMPUTE_POOLS', DEFAULT_LANES)
+    if lane not in configured:
+        raise ValueError(f"Unknown compute lane: {lane}")
+    return {**DEFAULT_LANES.get(lane, {}), **configured[lane]}
+
+
+def _get_lane(lane: str):
+    with _lanes_lock:
+        if lane not in _lanes:
+            config = _lane_settings(lane)
+            _lanes[lane] = _Lane(lane, config['workers'], config['queue_depth'], config['timeout']) if config['workers'] > 0 else None
+        return _lanes[lane]
+
+
+def in_worker_process() -> bool:
+    """True inside a worker process of the pool (they are started by multiprocessing)."""
+    return multiprocessing.parent_process() is not None
+
+
+def lane_workers(lane: str) -> int:
+    """Number of worker processes configured for a lane (0 = runs in the calling thread)."""
+    return _lane_settings(lane)['workers']
+
+
+def submit_to_pool(lane: str, func, *args, **kwargs):
+    """
+    Sends func(*args, **kwargs) to the worker processes of a lane and returns its Future.
+
+    Raises:
+        ComputePoolBusy: If the lane already holds workers + queue_depth tasks.
+    """
+    pool_lane = _get_lane(lane)
+    if pool_lane is None:
+        raise ValueError(f"The '{lane}' compute lane has no worker processes.")
+    return pool_lane.submit(func, *args, **kwargs)
+
+
+def run_in_pool(lane: str, func, *args, **kwargs):
+    """
+    Runs func(*args, **kwargs) on the shared compute pool and waits for its result.
+
+    The lanes are configured by settings.QL_COMPUTE_POOLS ('fast' for interactive pricers,
+    'slow' for calibrations and large simulations). A lane with 0 workers runs the call in
+    the requesting thread, which keeps the labs usable without worker processes. func and its
+    arguments must be picklable (module-level functions, plain Python data).
+
+    Raises:
+        ComputePoolBusy: If the lane queue is full.
+        ComputeTimeout: If the task (queue wait included) exceeds the lane timeout. A task
+            already running cannot be interrupted; it keeps its slot until it finishes.
+    """
+    pool_lane = _get_lane(lane)
+    if pool_lane is None:
+        return func(*args, **kwargs)
+
+    future = pool_lane.submit(func, *args, **kwargs)
+    try:
+        return future.result(timeout=pool_lane.timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        raise ComputeTimeout(f"The calculation did not finish within {pool_lane.timeout} seconds.")
+    except BrokenProcessPool:
+        pool_lane.shutdown()
+        raise
+
+
+def map_in_pool(lane: str, func, args_list) -> list:
+    """
+    Runs func(*args) for every tuple of args_list on the worker processes of a lane, in
+    parallel, and returns the results in the same order (like run_in_pool for a batch).
+
+    At most one task per worker is in flight at a time: the next task is sent as soon as the
+    oldest one returns, so a batch larger than the lane queue does not overflow it. The whole
+    batch must wait less than the lane timeout. With 0 workers, the calls run one after the
+    other in the requesting thread. Call it from the web process, not from a task already
+    running in the pool.
+
+    Raises:
+        ComputePoolBusy: If the lane queue is full (taken by other requests); the tasks
+            already submitted are cancelled.
+        ComputeTimeout: If the batch does not finish within the lane timeout.
+    """
+    args_list = list(args_list)
+    pool_lane = _get_lane(lane)
+    if pool_lane is None:
+        return [func(*args) for args in args_list]
+
+    futures, results = [], []
+    try:
+        for args in args_list[:pool_lane.workers]:
+            futures.append(pool_lane.submit(func, *args))
+        deadline = time.monotonic() + pool_lane.timeout
+        for i in range(len(args_list)):
+            results.append(futures[i].result(timeout=max(deadline - time.monotonic(), 0)))
+            if len(futures) < len(args_list):
+                futures.append(pool_lane.submit(func, *args_list[len(futures)]))
+        return results
+    except FutureTimeoutError:
+        raise ComputeTimeout(f"The calculation did not finish within {pool_lane.timeout} seconds.")
+    except BrokenProcessPool:
+        pool_lane.shutdown()
+        raise
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def shutdown_pools():
+    """Stops the worker processes of every lane (they are restarted on the next task)."""
+    with _lanes_lock:
+        lanes = [lane for lane in _lanes.values() if lane is not None]
+        _lanes.clear()
+    for lane in lanes:
+        lane.shutdown()
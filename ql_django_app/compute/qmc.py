@@ -0,0 +1,126 @@
+import copy
+from functools import lru_cache
+
+import numpy as np
+from scipy.special import ndtri
+from scipy.stats import qmc
+
+# Ways of drawing the Gaussian shocks of a simulated path (see gaussian_generator)
+SAMPLING_CHOICES = [
+    ('pseudo', 'Pseudo-random (Monte Carlo)'),
+    ('sobol', 'Sobol + Brownian bridge (quasi-Monte Carlo)'),
+    ('sobol_scrambled', 'Scrambled Sobol + Brownian bridge (randomized QMC)'),
+]
+
+# Uniforms are kept away from 0 and 1 before the inverse normal CDF
+_UNIFORM_EPSILON = 2.0**-40
+
+
+@lru_cache(maxsize=8)
+def _bridge_plan(num_steps: int):
+    """
+    Construction order of a Brownian bridge on num_steps unit steps (as ql.BrownianBridge):
+    W(n) first, then the midpoint of every gap left to right, level after level.
+
+    Returns:
+        list: One tuple (points, lefts, rights, left_weights, right_weights, std_devs, draws)
+        of arrays per level. The points are positions on a grid where position 0 holds W(0) = 0,
+        and draws are the indices of the Gaussian coordinates used at that level.
+    """
+    times = np.arange(num_steps + 1, dtype=float)
+    built = np.zeros(num_steps + 1, dtype=bool)
+    built[0] = built[num_steps] = True
+    levels = [(np.array([num_steps]), np.array([0]), np.array([num_steps]),
+               np.zeros(1), np.zeros(1), np.array([np.sqrt(num_steps)]), np.array([0]))]
+    draw = 1
+    while draw < num_steps:
+        known = np.flatnonzero(built)
+        lefts, rights = known[:-1], known[1:]
+        gaps = rights - lefts > 1
+        lefts, rights = lefts[gaps], rights[gaps]
+        points = lefts + (rights - lefts) // 2
+        span = times[rights] - times[lefts]
+        levels.append((
+            points, lefts, rights,
+            (times[rights] - times[points]) / span,
+            (times[points] - times[lefts]) / span,
+            np.sqrt((times[points] - times[lefts]) * (times[rights] - times[points]) / span),
+            np.arange(draw, draw + len(points)),
+        ))
+        built[points] = True
+        draw += len(points)
+    return levels
+
+
+def brownian_bridge_increments(normals):
+    """
+    Maps independent standard normals (one row per path, one column per step) to the
+    increments of a Brownian motion built by bisection: column 0 sets W(n), column 1 the
+    midpoint, and so on. The increments are again independent N(0, 1) variables, but the
+    first columns now carry most of the variance of the path.
+    """
+    normals = np.asarray(normals, dtype=float)
+    num_paths, num_steps = normals.shape
+    path = np.zeros((num_paths, num_steps + 1))
+    for points, lefts, rights, left_weights, right_weights, std_devs, draws in _bridge_plan(num_steps):
+        path[:, points] = left_weights * path[:, lefts] + right_weights * path[:, rights] + std_devs * normals[:, draws]
+    return np.diff(path, axis=1)
+
+
+@lru_cache(maxsize=4)
+def _scrambled_sobol(num_steps: int, seed: int):
+    """Scrambled engines are costly to build in high dimension (about 0.5 s for 10^4): shards reuse them."""
+    return qmc.Sobol(num_steps, scramble=True, seed=np.random.default_rng(seed))
+
+
+class SobolBrownianBridge:
+    """
+    Quasi-random replacement for np.random.Generator in the path simulations: its
+    standard_normal((n, num_steps)) returns the next n points of a num_steps-dimensional
+    Sobol sequence, mapped to Gaussians and laid out by a Brownian bridge, so the best
+    distributed Sobol coordinates drive the coarse shape of every path and the last ones
+    only its fine detail.
+
+    Unscrambled, the sequence skips its first point (the origin, like ql.SobolRsg). With
+    scramble=True, seed (anything np.random.default_rng accepts) picks one random scrambling
+    (linear matrix scramble + digital shift): each scrambled sequence is an unbiased
+    estimator, and independent scramblings give error bars. skip starts the sequence further
+    on, e.g. for a batch computed elsewhere.
+    """
+
+    def __init__(self, num_steps: int, seed=None, scramble: bool = False, skip: int = 0):
+        self.num_steps = num_steps
+        if scramble and isinstance(seed, (int, np.integer)):
+            self._sobol = copy.deepcopy(_scrambled_sobol(num_steps, int(seed)))
+        else:
+            self._sobol = qmc.Sobol(num_steps, scramble=scramble, seed=np.random.default_rng(seed))
+        skip += 0 if scramble else 1
+        if skip:
+            self._sobol.fast_forward(skip)
+
+    def standard_normal(self, size):
+        num_paths, num_steps = size
+        if num_steps != self.num_steps:
+            raise ValueError(f"This sequence draws {self.num_steps} steps per path, not {num_steps}.")
+        uniforms = np.clip(self._sobol.random(num_paths), _UNIFORM_EPSILON, 1.0 - _UNIFORM_EPSILON)
+        return brownian_bridge_increments(ndtri(uniforms))
+
+
+def gaussian_generator(seed, num_steps: int, sampling: str = 'pseudo', skip: int = 0):
+    """
+    Source of the (paths x num_steps) Gaussian shocks of a simulation.
+
+    Args:
+        seed: NumPy seed, or a generator already built (np.random.Generator or
+            SobolBrownianBridge), returned as is so that batches continue its stream.
+        num_steps (int): Steps per path (dimension of the Sobol sequence).
+        sampling (str): 'pseudo', 'sobol' or 'sobol_scrambled' (see SAMPLING_CHOICES).
+        skip (int): Points of the Sobol sequence to skip (quasi-random sampling only).
+    """
+    if isinstance(seed, (np.random.Generator, SobolBrownianBridge)):
+        return seed
+    if sampling == 'pseudo':
+        return np.random.default_rng(seed)
+    if sampling in ('sobol', 'sobol_scrambled'):
+        return SobolBrownianBridge(num_steps, seed=seed, scramble=sampling == 'sobol_scrambled', skip=skip)
+    raise ValueError(f"Unknown sampling: {sampling}")
@@ -0,0 +1,57 @@
+import numpy as np
+
+from .pool import in_worker_process, lane_workers, map_in_pool
+from .qmc import gaussian_generator
+
+# Paths per shard. The shards (and so the random numbers of every path) depend on the seed and
+# on this size only, never on the number of workers that simulate them.
+SHARD_SIZE = 8192
+
+
+def shard_counts(num_paths: int, shard_size: int = SHARD_SIZE) -> list:
+    """Number of paths of each shard: full shards of shard_size, then the remainder."""
+    return [min(shard_size, num_paths - first) for first in range(0, num_paths, shard_size)]
+
+
+def shard_generator(seed, shard_index: int, num_steps: int, sampling: str = 'pseudo', shard_size: int = SHARD_SIZE):
+    """
+    Gaussian generator of one shard of a simulation (see compute.qmc.gaussian_generator).
+
+    Pseudo-random shards draw from independent substreams, SeedSequence(seed) spawned with the
+    shard index as key (the same streams as SeedSequence(seed).spawn(n)[shard_index]).
+    Quasi-random shards skip ahead to their rank in the Sobol sequence (shard_index *
+    shard_size), so the shards of one seed put together are exactly the unsharded sequence.
+    """
+    if sampling == 'pseudo':
+        return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(shard_index,)))
+    return gaussian_generator(seed, num_steps, sampling, skip=shard_index * shard_size)
+
+
+def shard_chunk_generator(seed, shard_index: int, chunk_index: int):
+    """
+    Pseudo-random generator of one chunk of a shard (e.g. one year of time steps), drawn from
+    SeedSequence(seed, spawn_key=(shard_index, chunk_index)), a child of the shard stream.
+    Paths drawn chunk by chunk can be extended with more chunks without changing their
+    beginning (see compute.path_cache).
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(shard_index, chunk_index)))
+
+
+def map_shards(lane: str, func, args: tuple, num_paths: int, shard_size: int = SHARD_SIZE):
+    """
+    Runs func(*args, shard_index, shard_paths) for every shard of num_paths paths and yields
+    the results in shard order.
+
+    The shards are sent to the worker processes of the lane in rounds of one shard per
+    worker (so the lane queue never overflows), and only one round of results is held at a
+    time. Inside a worker process, or with a lane without workers, the shards run one after
+    the other in the calling process. Since each shard has its own random stream and the
+    results come back in order, what the caller reassembles is the same whatever the worker
+    count. Closing the generator early leaves the remaining shards unsimulated.
+    """
+    shards = list(enumerate(shard_counts(num_paths, shard_size)))
+    inline = in_worker_process()
+    per_round = 1 if inline else max(lane_workers(lane), 1)
+    for first in range(0, len(shards), per_round):
+        args_list = [(*args, index, count) for index, count in shards[first:first + per_round]]
+        yield from ([func(*shard_args) for shard_args in args_list] if inline else map_in_pool(lane, func, args_list))
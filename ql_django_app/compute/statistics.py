@@ -0,0 +1,98 @@
+import numpy as np
+import time
+
+
+class RunningStatistics:
+    """
+    Running mean and variance of a stream of samples, updated batch by batch with the
+    parallel form of Welford's algorithm (Chan et al.), so memory stays constant however
+    many samples are accumulated. Every sample may itself be an array (e.g. one value per
+    grid point); statistics are then kept element-wise.
+    """
+
+    def __init__(self, shape=()):
+        self.count = 0
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+
+    def update(self, samples):
+        """Adds a batch of samples, stacked along the first axis."""
+        samples = np.asarray(samples, dtype=float)
+        batch_count = len(samples)
+        if batch_count == 0:
+            return
+        batch_mean = samples.mean(axis=0)
+        batch_m2 = ((samples - batch_mean)**2).sum(axis=0)
+
+        total = self.count + batch_count
+        delta = batch_mean - self.mean
+        self.mean = self.mean + delta * batch_count / total
+        self.m2 = self.m2 + batch_m2 + delta**2 * self.count * batch_count / total
+        self.count = total
+
+    def merge(self, other: 'RunningStatistics'):
+        """Adds the samples summarized by another RunningStatistics (e.g. a batch run elsewhere)."""
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * other.count / total
+        self.m2 = self.m2 + other.m2 + delta**2 * self.count * other.count / total
+        self.count = total
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else np.full_like(self.m2, np.nan)
+
+    @property
+    def std_error(self):
+        return np.sqrt(self.variance / self.count) if self.count > 1 else np.full_like(self.m2, np.inf)
+
+
+def simulate_until_converged(draw_batch, batch_size: int, target_std_error: float = None,
+                             time_budget_ms: float = None, max_samples: int = None, shape=()) -> dict:
+    """
+    Draws batches of samples until the standard error of the mean (the largest one, for
+    array-valued samples) reaches target_std_error, the wall-clock budget is spent or
+    max_samples have been drawn, whichever comes first.
+
+    Args:
+        draw_batch: Callable taking a number of samples and returning them stacked along axis 0.
+        batch_size (int): Number of samples per batch.
+        target_std_error (float): Requested tolerance, or None to run to another limit.
+        time_budget_ms (float): Wall-clock budget in milliseconds, or None.
+        max_samples (int): Hard cap on the number of samples, or None.
+        shape: Shape of a single sample.
+
+    Returns:
+        dict: 'stats' (the RunningStatistics), 'num_samples', 'std_error' (largest one),
+              'elapsed_ms' and 'stop_reason' ('tolerance', 'time_budget' or 'max_samples').
+    """
+    if target_std_error is None and time_budget_ms is None and max_samples is None:
+        raise ValueError("At least one stopping criterion is required.")
+
+    start = time.perf_counter()
+    stats = RunningStatistics(shape)
+    while True:
+        size = batch_size if max_samples is None else min(batch_size, max_samples - stats.count)
+        stats.update(draw_batch(size))
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        std_error = float(np.max(stats.std_error))
+        if target_std_error is not None and std_error <= target_std_error:
+            stop_reason = 'tolerance'
+            break
+        if time_budget_ms is not None and elapsed_ms >= time_budget_ms:
+            stop_reason = 'time_budget'
+            break
+        if max_samples is not None and stats.count >= max_samples:
+            stop_reason = 'max_samples'
+            break
+
+    return {
+        'stats': stats,
+        'num_samples': stats.count,
+        'std_error': std_error,
+        'elapsed_ms': elapsed_ms,
+        'stop_reason': stop_reason,
+    }
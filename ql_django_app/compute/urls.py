@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+app_name = 'compute'
+
+urlpatterns = [
+    path('jobs/<uuid:job_id>/', views.job_status_view, name='job_status'),
+    path('jobs/<uuid:job_id>/stream/', views.job_stream_view, name='job_stream'),
+]
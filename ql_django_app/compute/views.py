@@ -0,0 +1,55 @@
+import json
+import time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+
+from .jobs import get_job
+
+# Durée maximale d'un flux de statut avant que le client ne doive se reconnecter
+STREAM_MAX_SECONDS = 600
+STREAM_POLL_SECONDS = 0.5
+
+
+def _job_or_404(job_id):
+    job = get_job(job_id)
+    if job is None:
+        raise Http404("Unknown job")
+    return job
+
+
+def job_status_view(request, job_id):
+    """
+    Statut d'une tâche de fond en JSON. Le résultat est inclus une fois la tâche terminée,
+    sauf avec ?result=0 (utile pour un simple polling).
+    """
+    job = _job_or_404(job_id)
+    include_result = request.GET.get('result') != '0'
+    return JsonResponse(job.as_dict(include_result=include_result))
+
+
+def job_stream_view(request, job_id):
+    """
+    Flux Server-Sent Events : un événement 'status' à chaque changement de statut, puis un
+    événement 'result' (ou 'error') quand la tâche se termine.
+    """
+    job = _job_or_404(job_id)
+
+    def events():
+        last_status = None
+        deadline = time.monotonic() + STREAM_MAX_SECONDS
+        while time.monotonic() < deadline:
+            job.refresh_from_db()
+            if job.status != last_status:
+                last_status = job.status
+                yield f"event: status\ndata: {json.dumps(job.as_dict(include_result=False), cls=DjangoJSONEncoder)}\n\n"
+            if job.is_finished:
+                event = 'result' if job.status == job.DONE else 'error'
+                yield f"event: {event}\ndata: {json.dumps(job.as_dict(), cls=DjangoJSONEncoder)}\n\n"
+                return
+            time.sleep(STREAM_POLL_SECONDS)
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
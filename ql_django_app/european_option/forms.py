@@ -60,17 +60,20 @@ class EuropeanOptionForm(forms.Form):
         ('AnalyticEuropeanEngine', 'Black-Scholes (Analytic Formula)'),
         ('BinomialCRR', 'Binomial Tree (CRR)'),
         ('BinomialJR', 'Binomial Tree (Jarrow-Rudd)'),
+        ('LatticeCRR', 'Vectorized NumPy Lattice (CRR)'),
+        ('LatticeJR', 'Vectorized NumPy Lattice (Jarrow-Rudd)'),
+        ('LatticeTrinomial', 'Vectorized NumPy Lattice (Trinomial)'),
     ]
     
     pricing_engine = forms.ChoiceField(
         label='Pricing Engine',
         choices=ENGINE_CHOICES,
-        help_text="Choose the mathematical model for valuation. Note: Greeks are only available for the Analytic engine."
+        help_text="Choose the mathematical model for valuation."
     )
     
     binomial_steps = forms.IntegerField(
-        label="Binomial Tree Steps",
+        label="Tree Steps",
         initial=200,
         required=False,
-        help_text="Number of steps for binomial models (higher is more accurate but slower)."
+        help_text="Number of steps for the binomial and trinomial tree models (higher is more accurate but slower)."
     )
\ No newline at end of file
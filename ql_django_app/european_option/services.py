@@ -1,7 +1,20 @@
 import QuantLib as ql
 import numpy as np
 from datetime import date
+from scipy.special import ndtr
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
 
+# Fixed evaluation date shared by the single-option and the batch pricers
+CALCULATION_DATE = ql.Date(8, 5, 2015)
+
+# Engine names of the vectorized NumPy lattices and the lattice type each one uses
+NUMPY_LATTICE_ENGINES = {
+    'LatticeCRR': 'crr',
+    'LatticeJR': 'jr',
+    'LatticeTrinomial': 'trinomial',
+}
+
+@isolated_evaluation_date
 def calculate_european_option_metrics(
     option_type_str: str, 
     maturity_dt: date, 
@@ -43,8 +56,8 @@ def calculate_european_option_metrics(
     calendar = ql.UnitedStates(ql.UnitedStates.GovernmentBond)
     
     # Set the evaluation date (can be made dynamic later)
-    calculation_date = ql.Date(8, 5, 2015)
-    ql.Settings.instance().evaluationDate = calculation_date
+    calculation_date = CALCULATION_DATE
+    set_evaluation_date(calculation_date)
 
     # 2. Construct the European Option (the "Instrument")
     # The instrument's definition does not change regardless of the pricing model.
@@ -56,11 +69,25 @@ def calculate_european_option_metrics(
     spot_handle = ql.QuoteHandle(ql.SimpleQuote(spot_price))
     flat_ts = ql.YieldTermStructureHandle(ql.FlatForward(calculation_date, risk_free_rate, day_count))
     dividend_yield = ql.YieldTermStructureHandle(ql.FlatForward(calculation_date, dividend_rate, day_count))
-    flat_vol_ts = ql.BlackVolTermStructureHandle(ql.BlackConstantVol(calculation_date, calendar, volatility, day_count))
+    # The volatility sits behind a SimpleQuote so that vega can be bumped without rebuilding anything
+    vol_quote = ql.SimpleQuote(volatility)
+    flat_vol_ts = ql.BlackVolTermStructureHandle(ql.BlackConstantVol(calculation_date, calendar, ql.QuoteHandle(vol_quote), day_count))
     
     bsm_process = ql.BlackScholesMertonProcess(spot_handle, dividend_yield, flat_ts, flat_vol_ts)
 
     # 4. Select and construct the "Pricing Engine" based on user's choice
+    # The vectorized NumPy lattices bypass the QuantLib engine machinery entirely
+    if pricing_engine_name in NUMPY_LATTICE_ENGINES:
+        lattice_results = price_vanilla_lattice_batch(
+            option_type_str, spot_price, strike_price,
+            day_count.yearFraction(calculation_date, maturity_date_ql),
+            volatility_pct, dividend_rate_pct, risk_free_rate_pct,
+            lattice=NUMPY_LATTICE_ENGINES[pricing_engine_name], steps=binomial_steps, greeks=True
+        )
+        results = {key: np.round(float(value), 4) for key, value in lattice_results.items()}
+        results['engine_used'] = pricing_engine_name
+        return results
+
     if pricing_engine_name == 'AnalyticEuropeanEngine':
         engine = ql.AnalyticEuropeanEngine(bsm_process)
     elif pricing_engine_name == 'BinomialCRR':
@@ -74,17 +101,402 @@ def calculate_european_option_metrics(
     european_option.setPricingEngine(engine)
 
     # 6. Calculate and structure the results
-    # Note: Greeks are only available for the analytic engine. For others, we return 'N/A'.
-    # This is a key part of the demonstration for the user.
-    can_calculate_greeks = (pricing_engine_name == 'AnalyticEuropeanEngine')
-    
+    # The analytic engine provides every Greek. The binomial engines provide delta and gamma
+    # from the tree nodes and theta from the Black-Scholes PDE; vega is obtained by bumping
+    # the volatility quote, which reprices the same instrument/engine pair.
+    price = european_option.NPV()
+    if pricing_engine_name == 'AnalyticEuropeanEngine':
+        vega = european_option.vega()
+        theta_per_day = european_option.thetaPerDay()
+    else:
+        vol_bump = 0.01
+        vol_quote.setValue(volatility + vol_bump)
+        price_up = european_option.NPV()
+        vol_quote.setValue(volatility - vol_bump)
+        price_down = european_option.NPV()
+        vol_quote.setValue(volatility)
+        vega = (price_up - price_down) / (2 * vol_bump)
+        theta_per_day = european_option.theta() / 365.0
+
     results = {
-        'price': np.round(european_option.NPV(), 4),
+        'price': np.round(price, 4),
         'engine_used': pricing_engine_name,
-        'delta': np.round(european_option.delta(), 4) if can_calculate_greeks else 'N/A',
-        'gamma': np.round(european_option.gamma(), 4) if can_calculate_greeks else 'N/A',
-        'vega': np.round(european_option.vega(), 4) if can_calculate_greeks else 'N/A',
-        'theta': np.round(european_option.thetaPerDay(), 4) if can_calculate_greeks else 'N/A',
+        'delta': np.round(european_option.delta(), 4),
+        'gamma': np.round(european_option.gamma(), 4),
+        'vega': np.round(vega, 4),
+        'theta': np.round(theta_per_day, 4),
     }
     
-    return results
\ No newline at end of file
+    return results
+
+
+def bsm_closed_form(is_call, spot, strike, maturity, volatility, dividend_rate, risk_free_rate):
+    """
+    Vectorized Black-Scholes-Merton kernel. All inputs are NumPy arrays of the same shape
+    (rates and volatility as decimals, maturity in years).
+
+    Greeks follow the QuantLib conventions of AnalyticEuropeanEngine: vega is per unit of
+    volatility and theta is per year (divide by 365 for thetaPerDay).
+    """
+    sqrt_t = np.sqrt(maturity)
+    sigma_sqrt_t = volatility * sqrt_t
+    dividend_df = np.exp(-dividend_rate * maturity)
+    risk_free_df = np.exp(-risk_free_rate * maturity)
+
+    d1 = (np.log(spot / strike) + (risk_free_rate - dividend_rate + 0.5 * volatility**2) * maturity) / sigma_sqrt_t
+    d2 = d1 - sigma_sqrt_t
+    pdf_d1 = np.exp(-0.5 * d1**2) / np.sqrt(2.0 * np.pi)
+
+    # +1 for calls, -1 for puts: N(w*d) gives the right tail for both payoffs
+    w = np.where(is_call, 1.0, -1.0)
+    n_d1 = ndtr(w * d1)
+    n_d2 = ndtr(w * d2)
+
+    price = w * (spot * dividend_df * n_d1 - strike * risk_free_df * n_d2)
+    delta = w * dividend_df * n_d1
+    gamma = dividend_df * pdf_d1 / (spot * sigma_sqrt_t)
+    vega = spot * dividend_df * pdf_d1 * sqrt_t
+    theta = (-spot * dividend_df * pdf_d1 * volatility / (2.0 * sqrt_t)
+             + w * (dividend_rate * spot * dividend_df * n_d1 - risk_free_rate * strike * risk_free_df * n_d2))
+
+    return price, delta, gamma, vega, theta
+
+
+def calculate_european_option_metrics_batch(
+    option_types,
+    spot_prices,
+    strike_prices,
+    maturities_years,
+    volatilities_pct,
+    dividend_rates_pct,
+    risk_free_rates_pct
+) -> dict:
+    """
+    Prices a whole batch of European options (e.g. a full option chain) in one vectorized pass.
+
+    Every argument may be a scalar or an array; they are broadcast against each other, so a
+    strike ladder can be priced with a single spot/vol/rate.
+
+    Args:
+        option_types: 'Call'/'Put' string(s).
+        spot_prices: Current price(s) of the underlying asset.
+        strike_prices: Strike price(s).
+        maturities_years: Time(s) to maturity in years (Actual/365 Fixed).
+        volatilities_pct: Volatility in percent (e.g., 20 for 20%).
+        dividend_rates_pct: Dividend rate in percent.
+        risk_free_rates_pct: Risk-free rate in percent.
+
+    Returns:
+        dict: NumPy arrays for 'price', 'delta', 'gamma', 'vega' and 'theta' (per day),
+              using the same conventions as calculate_european_option_metrics.
+    """
+    is_call = np.asarray(option_types) == 'Call'
+    is_call, spot, strike, maturity, volatility, dividend_rate, risk_free_rate = np.broadcast_arrays(
+        is_call,
+        np.asarray(spot_prices, dtype=float),
+        np.asarray(strike_prices, dtype=float),
+        np.asarray(maturities_years, dtype=float),
+        np.asarray(volatilities_pct, dtype=float) / 100,
+        np.asarray(dividend_rates_pct, dtype=float) / 100,
+        np.asarray(risk_free_rates_pct, dtype=float) / 100,
+    )
+
+    price, delta, gamma, vega, theta = bsm_closed_form(
+        is_call, spot, strike, maturity, volatility, dividend_rate, risk_free_rate
+    )
+
+    return {
+        'price': price,
+        'delta': delta,
+        'gamma': gamma,
+        'vega': vega,
+        'theta': theta / 365.0,
+    }
+
+
+@isolated_evaluation_date
+def cross_check_batch_against_analytic_engine(
+    option_types,
+    spot_prices,
+    strike_prices,
+    maturity_days,
+    volatilities_pct,
+    dividend_rates_pct,
+    risk_free_rates_pct
+) -> dict:
+    """
+    Reprices a batch one option at a time with QuantLib's AnalyticEuropeanEngine and
+    compares it with the vectorized kernel. Maturities are given in whole days from
+    CALCULATION_DATE so that both pricers see exactly the same year fraction.
+
+    Returns:
+        dict: The maximum absolute difference for each metric.
+    """
+    arrays = np.broadcast_arrays(
+        np.asarray(option_types), np.asarray(spot_prices, dtype=float), np.asarray(strike_prices, dtype=float),
+        np.asarray(maturity_days, dtype=int), np.asarray(volatilities_pct, dtype=float),
+        np.asarray(dividend_rates_pct, dtype=float), np.asarray(risk_free_rates_pct, dtype=float),
+    )
+    option_types, spots, strikes, days, vols, dividends, rates = (a.ravel() for a in arrays)
+
+    batch = calculate_european_option_metrics_batch(option_types, spots, strikes, days / 365.0, vols, dividends, rates)
+
+    set_evaluation_date(CALCULATION_DATE)
+    day_count = ql.Actual365Fixed()
+    reference = {key: np.empty(len(spots)) for key in batch}
+    for i in range(len(spots)):
+        maturity = CALCULATION_DATE + ql.Period(int(days[i]), ql.Days)
+        payoff = ql.PlainVanillaPayoff(ql.Option.Call if option_types[i] == 'Call' else ql.Option.Put, strikes[i])
+        option = ql.VanillaOption(payoff, ql.EuropeanExercise(maturity))
+        process = ql.BlackScholesMertonProcess(
+            ql.QuoteHandle(ql.SimpleQuote(spots[i])),
+            ql.YieldTermStructureHandle(ql.FlatForward(CALCULATION_DATE, dividends[i] / 100, day_count)),
+            ql.YieldTermStructureHandle(ql.FlatForward(CALCULATION_DATE, rates[i] / 100, day_count)),
+            ql.BlackVolTermStructureHandle(ql.BlackConstantVol(CALCULATION_DATE, ql.NullCalendar(), vols[i] / 100, day_count)),
+        )
+        option.setPricingEngine(ql.AnalyticEuropeanEngine(process))
+        reference['price'][i] = option.NPV()
+        reference['delta'][i] = option.delta()
+        reference['gamma'][i] = option.gamma()
+        reference['vega'][i] = option.vega()
+        reference['theta'][i] = option.thetaPerDay()
+
+    return {key: float(np.max(np.abs(batch[key] - reference[key]))) for key in batch}
+
+
+def _black_out_of_the_money(forward, strike, total_vol):
+    """
+    Undiscounted Black-76 price of the out-of-the-money option (call if strike >= forward,
+    put otherwise) and its first two derivatives w.r.t. total_vol = sigma * sqrt(T).
+    """
+    w = np.where(strike >= forward, 1.0, -1.0)
+    d1 = np.log(forward / strike) / total_vol + 0.5 * total_vol
+    d2 = d1 - total_vol
+    price = w * (forward * ndtr(w * d1) - strike * ndtr(w * d2))
+    vega = forward * np.exp(-0.5 * d1**2) / np.sqrt(2.0 * np.pi)
+    volga = vega * d1 * d2 / total_vol
+    return price, vega, volga
+
+
+def implied_volatility_batch(prices, forwards, strikes, maturities, discount_factors=1.0, is_call=True,
+                             tolerance=1.0e-10, max_iterations=50):
+    """
+    Inverts the Black-76 formula for a whole vector of option prices at once.
+
+    price = discount_factor * Black(forward, strike, sigma * sqrt(maturity)), so the same
+    solver serves equity options (forward = S e^{(r-q)T}, discount_factor = e^{-rT}) and
+    swaptions (forward = forward swap rate, discount_factor = notional * annuity).
+
+    Each price is reduced to the time value of the out-of-the-money option, which avoids
+    cancellation errors deep in the money. The total volatility starts from the
+    Corrado-Miller rational approximation and is refined with Halley steps kept inside a
+    bisection bracket, so every point converges even far from the money.
+
+    Args:
+        prices, forwards, strikes, maturities, discount_factors: Arrays (or scalars) that
+            broadcast together; maturities in years.
+        is_call: Boolean array (or scalar), True for calls and False for puts.
+
+    Returns:
+        np.ndarray: Implied volatilities as decimals; NaN where the price is outside the
+        no-arbitrage bounds (at or below intrinsic value, or above the forward).
+    """
+    prices, forwards, strikes, maturities, discount_factors, is_call = np.broadcast_arrays(
+        *[np.asarray(x, dtype=float) for x in (prices, forwards, strikes, maturities, discount_factors)],
+        np.asarray(is_call, dtype=bool)
+    )
+    intrinsic = np.maximum(np.where(is_call, forwards - strikes, strikes - forwards), 0.0)
+    time_value = prices / discount_factors - intrinsic
+    valid = (time_value > 0) & (time_value < np.minimum(forwards, strikes)) & (maturities > 0)
+
+    # Inputs of the unsolvable points are replaced by a harmless at-the-money problem
+    f = np.where(valid, forwards, 1.0)
+    k = np.where(valid, strikes, 1.0)
+    target = np.where(valid, time_value, 0.2)
+
+    # Corrado-Miller initial guess for sigma * sqrt(T), written on the call price
+    half_gap = target + np.maximum(f - k, 0.0) - 0.5 * (f - k)
+    radicand = np.maximum(half_gap**2 - (f - k)**2 / np.pi, 0.0)
+    total_vol = np.sqrt(2.0 * np.pi) / (f + k) * (half_gap + np.sqrt(radicand))
+
+    lower = np.zeros_like(total_vol)
+    upper = np.full_like(total_vol, 10.0)
+    total_vol = np.clip(total_vol, 1.0e-4, 5.0)
+
+    for _ in range(max_iterations):
+        price, vega, volga = _black_out_of_the_money(f, k, total_vol)
+        diff = price - target
+        # The Black price increases with the volatility: keep the root bracketed
+        lower = np.where(diff < 0, total_vol, lower)
+        upper = np.where(diff > 0, total_vol, upper)
+
+        newton = diff / np.maximum(vega, 1.0e-300)
+        step = newton / (1.0 - 0.5 * newton * volga / np.maximum(vega, 1.0e-300))
+        candidate = total_vol - step
+        outside = ~np.isfinite(candidate) | (candidate <= lower) | (candidate >= upper)
+        candidate = np.where(outside, 0.5 * (lower + upper), candidate)
+
+        converged = np.abs(candidate - total_vol) < tolerance
+        total_vol = candidate
+        if converged.all():
+            break
+
+    return np.where(valid, total_vol / np.sqrt(np.where(valid, maturities, 1.0)), np.nan)
+
+
+# Lattice names accepted by price_vanilla_lattice_batch
+LATTICE_TYPES = ('crr', 'jr', 'trinomial')
+
+
+def _lattice_rollback(is_call, spot, strike, maturity, volatility, dividend_rate, risk_free_rate,
+                      lattice: str, steps: int, american: bool):
+    """
+    Backward induction on a (contracts x nodes) matrix. Every contract gets its own tree
+    (its own dt, up/down moves and probabilities) but all trees share the same number of
+    steps, so each rollback step is a single vectorized NumPy operation.
+
+    The binomial trees follow QuantLib's parametrisation in log-space:
+    CRR moves +/- sigma*sqrt(dt) with pu = 0.5 + 0.5*nu*dt/dx; JR has pu = 0.5 and puts the
+    drift nu*dt into the node positions. The trinomial tree uses dx = sigma*sqrt(3*dt).
+
+    Returns the price together with delta and gamma read off the first three nodes of the
+    lattice (step 2 of a binomial tree, step 1 of a trinomial one), as QuantLib does.
+    """
+    # Column vectors so that per-contract parameters broadcast against node offsets
+    is_call, spot, strike, maturity, volatility, dividend_rate, risk_free_rate = (
+        np.asarray(a)[:, None] for a in (is_call, spot, strike, maturity, volatility, dividend_rate, risk_free_rate)
+    )
+    w = np.where(is_call, 1.0, -1.0)
+    dt = maturity / steps
+    nu = risk_free_rate - dividend_rate - 0.5 * volatility**2
+    discount = np.exp(-risk_free_rate * dt)
+    log_spot = np.log(spot)
+
+    if lattice == 'trinomial':
+        dx = volatility * np.sqrt(3.0 * dt)
+        second_moment = (volatility**2 * dt + (nu * dt)**2) / dx**2
+        p_up = 0.5 * (second_moment + nu * dt / dx)
+        p_down = 0.5 * (second_moment - nu * dt / dx)
+        p_mid = 1.0 - p_up - p_down
+        drift_per_step = 0.0
+        offsets = lambda i: np.arange(-i, i + 1)
+    elif lattice in ('crr', 'jr'):
+        dx = volatility * np.sqrt(dt)
+        if lattice == 'crr':
+            p_up = 0.5 + 0.5 * nu * dt / dx
+            drift_per_step = 0.0
+        else:
+            p_up = np.full_like(dx, 0.5)
+            drift_per_step = nu * dt
+        p_down = 1.0 - p_up
+        offsets = lambda i: np.arange(-i, i + 1, 2)
+    else:
+        raise ValueError(f"Unknown lattice type: {lattice}")
+
+    def spots_at(i):
+        return np.exp(log_spot + i * drift_per_step + offsets(i) * dx)
+
+    def payoff_at(i):
+        return np.maximum(w * (spots_at(i) - strike), 0.0)
+
+    # Delta and gamma come from the first step of the tree having three nodes
+    greeks_step = 1 if lattice == 'trinomial' else 2
+    greeks_values = None
+
+    values = payoff_at(steps)
+    for i in range(steps - 1, -1, -1):
+        if lattice == 'trinomial':
+            values = discount * (p_down * values[:, :-2] + p_mid * values[:, 1:-1] + p_up * values[:, 2:])
+        else:
+            values = discount * (p_down * values[:, :-1] + p_up * values[:, 1:])
+        if american:
+            values = np.maximum(values, payoff_at(i))
+        if i == greeks_step:
+            greeks_values = values
+
+    if greeks_values is None:
+        # Trees too short to hold three nodes at a later step carry no gamma information
+        return values[:, 0], np.full(len(values), np.nan), np.full(len(values), np.nan)
+
+    node_spots = spots_at(greeks_step)
+    f_down, f_mid, f_up = greeks_values[:, 0], greeks_values[:, 1], greeks_values[:, 2]
+    s_down, s_mid, s_up = node_spots[:, 0], node_spots[:, 1], node_spots[:, 2]
+    delta = (f_up - f_down) / (s_up - s_down)
+    gamma = ((f_up - f_mid) / (s_up - s_mid) - (f_mid - f_down) / (s_mid - s_down)) / (0.5 * (s_up - s_down))
+
+    return values[:, 0], delta, gamma
+
+
+def price_vanilla_lattice_batch(
+    option_types,
+    spot_prices,
+    strike_prices,
+    maturities_years,
+    volatilities_pct,
+    dividend_rates_pct,
+    risk_free_rates_pct,
+    lattice: str = 'crr',
+    steps: int = 200,
+    american: bool = False,
+    greeks: bool = False
+) -> dict:
+    """
+    Prices a batch of European or American vanilla options on a vectorized NumPy lattice,
+    e.g. a whole strike ladder in a single backward induction.
+
+    Args:
+        option_types: 'Call'/'Put' string(s).
+        spot_prices, strike_prices: Spot and strike price(s).
+        maturities_years: Time(s) to maturity in years (Actual/365 Fixed).
+        volatilities_pct, dividend_rates_pct, risk_free_rates_pct: Market data in percent.
+        lattice (str): One of LATTICE_TYPES ('crr', 'jr' or 'trinomial').
+        steps (int): Number of time steps of every tree.
+        american (bool): Whether early exercise is allowed at every node.
+        greeks (bool): Also return delta, gamma, vega and theta (per day). Delta and gamma
+            come from the lattice nodes; vega and theta from bumped copies of every contract
+            (volatility +/- 1% and maturity - 1 day) rolled back in the same batch.
+
+    Returns:
+        dict: NumPy arrays of prices under 'price' (and of the Greeks if requested).
+    """
+    is_call = np.asarray(option_types) == 'Call'
+    arrays = np.broadcast_arrays(
+        is_call,
+        np.asarray(spot_prices, dtype=float),
+        np.asarray(strike_prices, dtype=float),
+        np.asarray(maturities_years, dtype=float),
+        np.asarray(volatilities_pct, dtype=float) / 100,
+        np.asarray(dividend_rates_pct, dtype=float) / 100,
+        np.asarray(risk_free_rates_pct, dtype=float) / 100,
+    )
+    shape = arrays[0].shape
+    is_call, spot, strike, maturity, volatility, dividend_rate, risk_free_rate = (a.ravel() for a in arrays)
+
+    if not greeks:
+        price, _, _ = _lattice_rollback(
+            is_call, spot, strike, maturity, volatility, dividend_rate, risk_free_rate,
+            lattice=lattice, steps=steps, american=american
+        )
+        return {'price': price.reshape(shape)}
+
+    # One rollback over [base, vol up, vol down, one day later] copies of every contract
+    n = len(spot)
+    one_day = 1.0 / 365.0
+    vol_bump = 0.01
+    price, delta, gamma = _lattice_rollback(
+        np.tile(is_call, 4), np.tile(spot, 4), np.tile(strike, 4),
+        np.concatenate([maturity, maturity, maturity, np.maximum(maturity - one_day, 0.5 * maturity)]),
+        np.concatenate([volatility, volatility + vol_bump, volatility - vol_bump, volatility]),
+        np.tile(dividend_rate, 4), np.tile(risk_free_rate, 4),
+        lattice=lattice, steps=steps, american=american
+    )
+    base, vol_up, vol_down, day_later = (price[k * n:(k + 1) * n] for k in range(4))
+    elapsed_days = (maturity - np.maximum(maturity - one_day, 0.5 * maturity)) / one_day
+
+    return {
+        'price': base.reshape(shape),
+        'delta': delta[:n].reshape(shape),
+        'gamma': gamma[:n].reshape(shape),
+        'vega': ((vol_up - vol_down) / (2 * vol_bump)).reshape(shape),
+        'theta': ((day_later - base) / elapsed_days).reshape(shape),
+    }
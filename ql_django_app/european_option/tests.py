@@ -1,3 +1,25 @@
-from django.test import TestCase
+import numpy as np
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from .services import calculate_european_option_metrics_batch, cross_check_batch_against_analytic_engine
+
+
+class BatchBlackScholesTests(SimpleTestCase):
+    """The vectorized BSM kernel matches QuantLib's AnalyticEuropeanEngine."""
+
+    def test_option_chain_matches_analytic_engine(self):
+        option_types = np.array(['Call', 'Put'])[:, None, None]
+        strikes = np.array([80.0, 95.0, 100.0, 105.0, 130.0])[None, :, None]
+        maturity_days = np.array([7, 91, 365, 1095])[None, None, :]
+        differences = cross_check_batch_against_analytic_engine(option_types, 100.0, strikes, maturity_days, 25.0, 1.5, 3.0)
+        tolerances = {'price': 1e-10, 'delta': 1e-10, 'gamma': 1e-10, 'vega': 1e-8, 'theta': 1e-10}
+        for metric, tolerance in tolerances.items():
+            with self.subTest(metric=metric):
+                self.assertLess(differences[metric], tolerance)
+
+    def test_put_call_parity(self):
+        strikes = np.linspace(60.0, 140.0, 9)
+        calls = calculate_european_option_metrics_batch('Call', 100.0, strikes, 0.75, 30.0, 2.0, 4.0)
+        puts = calculate_european_option_metrics_batch('Put', 100.0, strikes, 0.75, 30.0, 2.0, 4.0)
+        forward_value = 100.0 * np.exp(-0.02 * 0.75) - strikes * np.exp(-0.04 * 0.75)
+        np.testing.assert_allclose(calls['price'] - puts['price'], forward_value, atol=1e-10)
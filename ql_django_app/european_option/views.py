@@ -2,6 +2,7 @@ from django.shortcuts import render
 from django.contrib import messages
 from .forms import EuropeanOptionForm
 from . import services
+from compute.pool import ComputePoolBusy, ComputeTimeout, run_in_pool
 
 def price_european_option(request):
     """
@@ -15,7 +16,7 @@ def price_european_option(request):
         if form.is_valid():
             try:
                 # Call the service with the cleaned data from the form
-                results = services.calculate_european_option_metrics(
+                results = run_in_pool('fast', services.calculate_european_option_metrics,
                     option_type_str=form.cleaned_data['option_type'],
                     maturity_dt=form.cleaned_data['maturity_date'],
                     spot_price=form.cleaned_data['spot_price'],
@@ -26,6 +27,9 @@ def price_european_option(request):
                     pricing_engine_name=form.cleaned_data['pricing_engine'],
                     binomial_steps=form.cleaned_data.get('binomial_steps', 200)
                 )
+            except (ComputePoolBusy, ComputeTimeout):
+                # Left to ComputePoolErrorMiddleware (503 / 504)
+                raise
             except Exception as e:
                 # Display a user-friendly error message if the calculation fails
                 messages.error(request, f"QuantLib Calculation Error: {e}")
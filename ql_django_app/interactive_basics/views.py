@@ -1,6 +1,7 @@
 from django.shortcuts import render
 from .forms import DateForm, PeriodForm, CalendarForm
 from . import services
+from compute.pool import ComputePoolBusy, ComputeTimeout, run_in_pool
 
 def interactive_lab_view(request):
     context = {}
@@ -17,19 +18,22 @@ def interactive_lab_view(request):
                 date_form = DateForm(request.POST)
                 if date_form.is_valid():
                     d = date_form.cleaned_data
-                    context['date_result'] = services.create_date_from_form(d['day'], d['month'], d['year'])
+                    context['date_result'] = run_in_pool('fast', services.create_date_from_form, d['day'], d['month'], d['year'])
             
             elif 'add_period_btn' in request.POST:
                 period_form = PeriodForm(request.POST)
                 if period_form.is_valid():
                     p = period_form.cleaned_data
-                    context['period_result'] = services.add_period_from_form(p['start_date_str'], p['quantity'], p['unit'])
+                    context['period_result'] = run_in_pool('fast', services.add_period_from_form, p['start_date_str'], p['quantity'], p['unit'])
 
             elif 'advance_calendar_btn' in request.POST:
                 calendar_form = CalendarForm(request.POST)
                 if calendar_form.is_valid():
                     c = calendar_form.cleaned_data
-                    context['calendar_result'] = services.advance_with_calendar_from_form(c['start_date_str'], c['period_days'], c['calendar'])
+                    context['calendar_result'] = run_in_pool('fast', services.advance_with_calendar_from_form, c['start_date_str'], c['period_days'], c['calendar'])
+    except (ComputePoolBusy, ComputeTimeout):
+        # Left to ComputePoolErrorMiddleware (503 / 504)
+        raise
     except Exception as e:
         context['error'] = f"QuantLib Error: {e}"
 
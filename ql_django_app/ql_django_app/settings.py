@@ -24,6 +24,9 @@ INSTALLED_APPS = [
     'interest_rate_curves',
     'interest_rate_models',
     'equity_models',
+
+    # --- Infrastructure de calcul partagée ---
+    'compute',
       
     # --- Applications de Chapitres Actives ---
     
@@ -59,6 +62,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "compute.middleware.ComputePoolErrorMiddleware",
 ]
 
 ROOT_URLCONF = "ql_django_app.urls"
@@ -101,4 +105,31 @@ STATICFILES_DIRS = [BASE_DIR / "static"]
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap4"
-CRISPY_TEMPLATE_PACK = "bootstrap4"
\ No newline at end of file
+CRISPY_TEMPLATE_PACK = "bootstrap4"
+
+# --- Calcul QuantLib (application 'compute') ---
+# Processus de calcul dédiés par date d'évaluation (0 = calcul dans le thread de la requête)
+QL_DATE_PINNED_WORKERS = 0
+# Nombre maximal de dates d'évaluation ayant leur propre pool de processus
+QL_DATE_PINNED_POOLS = 4
+# Pool de processus partagé par tous les labs (compute.pool) :
+#  - 'fast' pour les pricers interactifs, 'slow' pour les calibrations et grosses simulations,
+#    afin qu'une calibration longue ne bloque jamais un pricing rapide ;
+#  - workers = nombre de processus (0 = calcul dans le thread de la requête),
+#    queue_depth = tâches en attente acceptées au-delà des workers, timeout en secondes.
+QL_COMPUTE_POOLS = {
+    'fast': {'workers': 2, 'queue_depth': 16, 'timeout': 30},
+    'slow': {'workers': 2, 'queue_depth': 4, 'timeout': 300},
+}
+# Tâches de fond (compute.jobs) : un lab lance son calcul en arrière-plan quand le coût
+# estimé dépasse ce seuil (en ms) ; une tâche restée en cours plus de QL_JOBS_STALE_AFTER
+# secondes (p. ex. après un redémarrage) n'est plus réutilisée pour la déduplication.
+QL_JOB_COST_THRESHOLD_MS = 500
+QL_JOBS_STALE_AFTER = 3600
+# Table du proxy de Chebyshev du modèle de Heston (construite hors ligne par
+# « python manage.py build_heston_proxy », projetée en mémoire au démarrage)
+QL_HESTON_PROXY_PATH = BASE_DIR / "proxy_tables" / "heston_chebyshev.npy"
+# Cache disque des trajectoires simulées (compute.path_cache) : fichiers .npy projetés en
+# mémoire, les moins récemment utilisés sont supprimés au-delà du quota. None le désactive.
+QL_PATH_CACHE_DIR = BASE_DIR / "path_cache"
+QL_PATH_CACHE_QUOTA_MB = 1024
@@ -11,4 +11,7 @@ urlpatterns = [
     path('interest-rate-curves/', include('interest_rate_curves.urls')),
     path('interest-rate-models/', include('interest_rate_models.urls')),
     path('equity-models/', include('equity_models.urls')),
+
+    # Suivi des tâches de calcul en arrière-plan
+    path('compute/', include('compute.urls')),
 ]
\ No newline at end of file
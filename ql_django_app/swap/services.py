@@ -1,7 +1,9 @@
 import QuantLib as ql
 import numpy as np
 from datetime import date 
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
 
+@isolated_evaluation_date
 def calculate_vanilla_swap_metrics(
     notional: float,
     maturity_years: int,
@@ -13,7 +15,7 @@ def calculate_vanilla_swap_metrics(
     # 1. Setup and parameter conversion
     
     evaluation_date = ql.Date(15, 1, 2015) 
-    ql.Settings.instance().evaluationDate = evaluation_date
+    set_evaluation_date(evaluation_date)
     
     fixed_rate = fixed_rate_pct / 100.0
     floating_spread = floating_spread_bps / 10000.0
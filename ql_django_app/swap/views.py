@@ -1,6 +1,7 @@
 from django.shortcuts import render
 from .forms import VanillaSwapForm
 from . import services
+from compute.pool import run_in_pool
 
 def pricer_view(request):
     form = VanillaSwapForm(request.POST or None)
@@ -18,7 +19,7 @@ def pricer_view(request):
             'discount_curve_rate_pct': form.fields['discount_curve_rate_pct'].initial,
         }
             
-    results = services.calculate_vanilla_swap_metrics(**params)
+    results = run_in_pool('fast', services.calculate_vanilla_swap_metrics, **params)
     
     context = {'form': form, 'results': results}
     return render(request, 'swap/pricer.html', context)
\ No newline at end of file
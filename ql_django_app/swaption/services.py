@@ -1,6 +1,9 @@
 import QuantLib as ql
 import numpy as np
+from compute.evaluation import isolated_evaluation_date, set_evaluation_date
+from european_option.services import implied_volatility_batch
 
+@isolated_evaluation_date
 def calculate_swaption_metrics(
     # --- Paramètres du formulaire ---
     option_type_str: str,
@@ -25,7 +28,7 @@ def calculate_swaption_metrics(
 
     # 2. Définition des conventions et de la date de calcul
     calculation_date = ql.Date(15, 1, 2016)
-    ql.Settings.instance().evaluationDate = calculation_date
+    set_evaluation_date(calculation_date)
     calendar = ql.UnitedStates(ql.UnitedStates.GovernmentBond)
     day_count = ql.Actual365Fixed()
 
@@ -62,8 +65,15 @@ def calculate_swaption_metrics(
     swaption.setPricingEngine(swaption_engine)
 
     # 6. Calcul et retour des résultats
+    # Volatilité implicite par inversion vectorisée de Black-76 : forward = taux de swap forward,
+    # facteur d'actualisation = annuité (notionnel inclus), le payer étant un call sur le taux
+    npv = swaption.NPV()
+    underlying_swap.setPricingEngine(ql.DiscountingSwapEngine(term_structure))
+    expiry = day_count.yearFraction(calculation_date, option_maturity_date)
+    implied_vol = implied_volatility_batch(npv, underlying_swap.fairRate(), strike_rate, expiry, swaption.annuity(), is_call=True)
     results = {
-        'npv': np.round(swaption.NPV(), 4),
-        'implied_volatility': np.round(swaption.impliedVolatility(swaption.NPV(), term_structure, 0.1) * 100, 4) # En %
+        'npv': np.round(npv, 4),
+        # En % ; 'N/A' si la prime n'a pas de valeur temps (volatilité non identifiable)
+        'implied_volatility': np.round(float(implied_vol) * 100, 4) if np.isfinite(implied_vol) else 'N/A'
     }
     return results
\ No newline at end of file
@@ -2,6 +2,7 @@ from django.shortcuts import render
 from django.contrib import messages
 from .forms import SwaptionForm 
 from . import services
+from compute.pool import ComputePoolBusy, ComputeTimeout, run_in_pool
 
 def pricer_view(request): # On standardise le nom
     form = SwaptionForm()
@@ -11,7 +12,7 @@ def pricer_view(request): # On standardise le nom
         form = SwaptionForm(request.POST)
         if form.is_valid():
             try:
-                results = services.calculate_swaption_metrics(
+                results = run_in_pool('fast', services.calculate_swaption_metrics,
                     option_type_str=form.cleaned_data['option_type'],
                     maturity_years=form.cleaned_data['maturity_years'],
                     swap_tenor_years=form.cleaned_data['swap_tenor_years'],
@@ -20,6 +21,9 @@ def pricer_view(request): # On standardise le nom
                     volatility_pct=form.cleaned_data['volatility_pct'],
                     curve_rate_pct=form.cleaned_data['curve_rate_pct']
                 )
+            except (ComputePoolBusy, ComputeTimeout):
+                # Left to ComputePoolErrorMiddleware (503 / 504)
+                raise
             except Exception as e:
                 messages.error(request, f"Erreur lors du calcul QuantLib : {e}")
         else: